@@ -0,0 +1,295 @@
+import json
+import math
+import operator
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+
+OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+}
+
+# короткие имена метрик такта мониторинга
+METRIC_ALIASES = {
+    'cpu': 'cpu_percent',
+    'ram': 'ram_percent',
+    'swap': 'swap_percent',
+    'disk': 'disks',
+    'gpu': 'gpu_load',
+    'temperature': 'temperatures',
+    'fan': 'fans',
+    'net_rx': 'net_rx_rate',
+    'net_tx': 'net_tx_rate',
+    'psi': 'pressure',
+    'major_faults': 'major_fault_rate',
+    'swap_in': 'swap_in_rate',
+    'swap_out': 'swap_out_rate',
+}
+
+
+# метрики-записи: значения под разными ключами - разные величины, сводить их нельзя, нужен key
+KEYED_METRICS = frozenset({'container', 'pressure', 'top_processes'})
+
+
+def is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class Window:
+    # deque фиксированной длины с бегущими суммой и числом нарушений: на такт O(1) независимо от длины окна
+    def __init__(self, size: int):
+        self.values = deque(maxlen=size)
+        self.breaches = 0
+        self.total = 0.0
+        self.firing = False
+
+
+class Rule:
+    def __init__(self, name: str, metric: str, op: str, threshold: float, duration: float = 0.0,
+                 interval: float = 1.0, mode: str = 'all', aggregate: Optional[str] = None, key: Optional[str] = None):
+        if op not in OPERATORS:
+            raise ValueError(f"правило {name}: неизвестный оператор {op}")
+        if mode not in ('all', 'avg'):
+            raise ValueError(f"правило {name}: режим должен быть all или avg")
+        if aggregate not in (None, 'max', 'min', 'avg'):
+            raise ValueError(f"правило {name}: агрегат должен быть max, min или avg")
+        self.name = name
+        self.metric = METRIC_ALIASES.get(metric, metric)
+        if self.metric in KEYED_METRICS and key is None:
+            raise ValueError(f"правило {name}: для метрики {metric} нужно указать key")
+        self.op = op
+        self.compare = OPERATORS[op]
+        self.threshold = threshold
+        self.duration = duration
+        self.mode = mode
+        # без aggregate у каждой точки монтирования/датчика свое окно: "любой диск >90% 5 минут"
+        # значит один и тот же диск; с aggregate значения сводятся в одно и окно общее
+        self.aggregate = aggregate
+        self.key = key
+        self.size = max(1, math.ceil(duration / interval)) if duration > 0 else 1
+        # окна только для ключей последнего такта: их не больше, чем точек монтирования
+        self.windows: Dict[Optional[str], Window] = {}
+
+    def extract(self, sample: Dict[str, object]) -> Dict[Optional[str], float]:
+        value = sample.get(self.metric)
+        if isinstance(value, list):
+            value = {str(index): item for index, item in enumerate(value)}
+        if not isinstance(value, dict):
+            return {None: float(value)} if is_number(value) else {}
+
+        if self.key is not None:
+            item = value.get(self.key)
+            return {self.key: float(item)} if is_number(item) else {}
+        # None (cgroup без лимита, датчик без показаний) и вложенные записи пропускаются
+        values = {str(key): float(item) for key, item in value.items() if is_number(item)}
+        if self.aggregate is None or not values:
+            return values
+        if self.aggregate == 'avg':
+            return {None: sum(values.values()) / len(values)}
+        pick = max if self.aggregate == 'max' else min
+        return {None: pick(values.values())}
+
+    def update(self, window: Window, value: float) -> bool:
+        values = window.values
+        if len(values) == values.maxlen:
+            old = values[0]
+            window.total -= old
+            window.breaches -= self.compare(old, self.threshold)
+        values.append(value)
+        window.total += value
+        window.breaches += self.compare(value, self.threshold)
+
+        if len(values) < values.maxlen:
+            return False
+        if self.mode == 'avg':
+            return self.compare(window.total / len(values), self.threshold)
+        return window.breaches == len(values)
+
+    def evaluate(self, sample: Dict[str, object]) -> List[Tuple[Optional[str], Optional[float], bool]]:
+        # (ключ, значение, сработало) для каждого ключа, у которого поменялось состояние
+        values = self.extract(sample)
+        changes = []
+        # пропуск метрики (точка монтирования пропала) удаляет окно: "5 минут подряд" начинается заново
+        for key in [key for key in self.windows if key not in values]:
+            if self.windows.pop(key).firing:
+                changes.append((key, None, False))
+        for key, value in values.items():
+            window = self.windows.get(key)
+            if window is None:
+                window = self.windows[key] = Window(self.size)
+            active = self.update(window, value)
+            if active != window.firing:
+                window.firing = active
+                changes.append((key, value, active))
+        return changes
+
+
+class StdoutSink:
+    def __init__(self, output_format: str = 'text'):
+        self.output_format = output_format
+
+    def emit(self, event: Dict[str, object]):
+        if self.output_format == 'text':
+            print(format_event(event), flush=True)
+        else:
+            print(json.dumps(event, ensure_ascii=False), flush=True)
+
+    def close(self):
+        pass
+
+
+class FileSink:
+    def __init__(self, path: str):
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def emit(self, event: Dict[str, object]):
+        self.file.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class WebhookSink:
+    # отправка в фоновом потоке: медленный приемник не должен задерживать такт мониторинга;
+    # при переполнении очереди события отбрасываются
+    def __init__(self, url: str, timeout: float = 5.0, max_pending: int = 100):
+        self.url = url
+        self.timeout = timeout
+        self.dropped = 0
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.thread = threading.Thread(target=self._run, name="alert-webhook", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        import urllib.request
+
+        while True:
+            event = self.queue.get()
+            if event is None:
+                return
+            request = urllib.request.Request(
+                self.url,
+                data=json.dumps(event, ensure_ascii=False).encode('utf-8'),
+                headers={'Content-Type': 'application/json'},
+                method='POST',
+            )
+            try:
+                urllib.request.urlopen(request, timeout=self.timeout).close()
+            except Exception as e:
+                print(f"Ошибка отправки оповещения на {self.url}: {str(e)}", file=sys.stderr)
+
+    def emit(self, event: Dict[str, object]):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        try:
+            self.queue.put(None, timeout=self.timeout)
+        except queue.Full:
+            return
+        self.thread.join(self.timeout)
+
+
+def format_event(event: Dict[str, object]) -> str:
+    where = f" [{event['key']}]" if event.get('key') is not None else ""
+    state = "СРАБОТАЛО" if event['state'] == 'firing' else "НОРМА"
+    value = f"{event['value']:.1f}" if event['value'] is not None else "нет данных"
+    return (f"[ALERT {state}] {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(event['timestamp']))} "
+            f"{event['rule']}: {event['metric']}{where} = {value} "
+            f"({event['op']} {event['threshold']:g}, окно {event['for']:g} с)")
+
+
+class AlertEngine:
+    def __init__(self, rules: List[Rule], sinks: list):
+        self.rules = rules
+        self.sinks = sinks
+
+    def evaluate(self, sample: Dict[str, object]) -> List[Dict[str, object]]:
+        events = []
+        for rule in self.rules:
+            # ошибка одного правила или получателя не должна останавливать мониторинг
+            try:
+                changes = rule.evaluate(sample)
+            except Exception as e:
+                print(f"Ошибка проверки правила {rule.name}: {str(e)}", file=sys.stderr)
+                continue
+            for key, value, active in changes:
+                event = {
+                    'rule': rule.name,
+                    'state': 'firing' if active else 'resolved',
+                    'timestamp': sample['timestamp'],
+                    'metric': rule.metric,
+                    'key': key,
+                    'value': value,
+                    'op': rule.op,
+                    'threshold': rule.threshold,
+                    'for': rule.duration,
+                }
+                events.append(event)
+                for sink in self.sinks:
+                    try:
+                        sink.emit(event)
+                    except Exception as e:
+                        print(f"Ошибка отправки оповещения {rule.name}: {str(e)}", file=sys.stderr)
+        return events
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def make_sink(config: Dict[str, object], output_format: str):
+    kind = config.get('type')
+    if kind == 'stdout':
+        return StdoutSink(config.get('format', output_format))
+    if kind == 'file':
+        return FileSink(config['path'])
+    if kind == 'webhook':
+        return WebhookSink(config['url'], timeout=float(config.get('timeout', 5.0)))
+    raise ValueError(f"неизвестный тип получателя оповещений: {kind}")
+
+
+def load_engine(path: str, interval: float, output_format: str = 'text') -> AlertEngine:
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    rules = []
+    try:
+        for index, item in enumerate(config.get('rules', [])):
+            rules.append(Rule(
+                name=item.get('name') or f"rule{index + 1}",
+                metric=item['metric'],
+                op=item.get('op', '>'),
+                threshold=float(item['threshold']),
+                duration=float(item.get('for', 0)),
+                interval=interval,
+                mode=item.get('mode', 'all'),
+                aggregate=item.get('aggregate'),
+                key=item.get('key'),
+            ))
+    except KeyError as e:
+        raise ValueError(f"в правиле не указано поле {e}")
+    if not rules:
+        raise ValueError("в файле нет ни одного правила")
+
+    sinks = []
+    try:
+        for item in config.get('sinks') or [{'type': 'stdout'}]:
+            sinks.append(make_sink(item, output_format))
+    except Exception as e:
+        for sink in sinks:
+            sink.close()
+        if isinstance(e, KeyError):
+            raise ValueError(f"для получателя оповещений не указано поле {e}") from None
+        raise
+    return AlertEngine(rules, sinks)
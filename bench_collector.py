@@ -0,0 +1,240 @@
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+import fake_backend
+import main
+
+
+BACKENDS = ('real', 'fake')
+DEFAULT_RUNS = 10
+DEFAULT_TICKS = 20
+DEFAULT_OUTPUT = "bench_results.json"
+# фейковый сервер держит NFS-точки монтирования зависшими по секунде,
+# тайм-аут поменьше, чтобы они не растягивали каждый прогон
+DISK_TIMEOUT = 0.25
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        'runs': len(ordered),
+        'min': ordered[0],
+        'median': statistics.median(ordered),
+        'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        'max': ordered[-1],
+        'mean': statistics.fmean(ordered),
+    }
+
+
+def cpu_seconds() -> float:
+    # вместе с дочерними процессами: cpuinfo и nvidia-smi считаются в стоимость сбора;
+    # свой CPU - через process_time, у os.times шаг 10 мс
+    times = os.times()
+    return time.process_time() + times.children_user + times.children_system
+
+
+def measure(func: Callable[[], None], runs: int) -> Dict[str, Dict[str, float]]:
+    wall, cpu = [], []
+    for _ in range(runs):
+        cpu_before = cpu_seconds()
+        started = time.perf_counter()
+        func()
+        wall.append(time.perf_counter() - started)
+        cpu.append(cpu_seconds() - cpu_before)
+    return {'wall': summarize(wall), 'cpu': summarize(cpu)}
+
+
+def use_backend(backend: str) -> Optional[Callable[[], None]]:
+    if backend == 'fake':
+        return fake_backend.install(main)
+    return None
+
+
+def bench_cold_start(backend: str, runs: int, cache_path: str) -> Dict[str, Dict[str, float]]:
+    # холодный старт - отдельный интерпретатор: импорт, создание сборщика и краткий отчет;
+    # первый запуск прогревает кэш, как это происходит на машине после первого отчета
+    command = [sys.executable, os.path.abspath(__file__), '--cold', backend, cache_path]
+    run = lambda: subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+    run()
+    return measure(run, runs)
+
+
+def bench_report(backend: str, runs: int, cache_path: str, verbose: bool) -> Dict[str, Dict[str, float]]:
+    # каждый прогон - новый сборщик, как при запуске из cron; кэш статических данных прогрет
+    def run():
+        collector = main.SystemInfoCollector(verbose=verbose, cache_path=cache_path,
+                                             output_format='json', disk_timeout=DISK_TIMEOUT)
+        if verbose:
+            collector.collect_verbose()
+        else:
+            collector.collect_basic()
+        collector.render(io.StringIO())
+
+    restore = use_backend(backend)
+    try:
+        run()
+        return measure(run, runs)
+    finally:
+        if restore is not None:
+            restore()
+
+
+def bench_watch(backend: str, ticks: int, cache_path: str) -> Dict[str, Dict[str, float]]:
+    # стоимость одного такта без паузы между тактами; окно CPU остается, поэтому
+    # показательна прежде всего строка cpu
+    restore = use_backend(backend)
+    try:
+        collector = main.SystemInfoCollector(cache_path=cache_path, output_format='json',
+                                             disk_timeout=DISK_TIMEOUT, watch_processes=True)
+        collector.collect_sample()
+        return measure(lambda: json.dumps(collector.collect_sample()), ticks)
+    finally:
+        if restore is not None:
+            restore()
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_benchmarks(backends: List[str], runs: int, ticks: int) -> Dict[str, object]:
+    results = {
+        'timestamp': time.time(),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'fake_scale': fake_backend.FakeScale()._asdict(),
+        'benchmarks': {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix="sic-bench-") as directory:
+        for backend in backends:
+            cache_path = os.path.join(directory, f"{backend}.json")
+            for name, func in (
+                ('cold_start', lambda: bench_cold_start(backend, runs, cache_path)),
+                ('brief', lambda: bench_report(backend, runs, cache_path, verbose=False)),
+                ('verbose', lambda: bench_report(backend, runs, cache_path, verbose=True)),
+                ('watch_tick', lambda: bench_watch(backend, ticks, cache_path)),
+            ):
+                print(f"  {backend:<5} {name:<11}", end="", flush=True)
+                result = func()
+                results['benchmarks'][f"{backend}.{name}"] = result
+                print(f"  медиана {result['wall']['median'] * 1000:9.1f} мс, "
+                      f"CPU {result['cpu']['median'] * 1000:8.1f} мс, p95 {result['wall']['p95'] * 1000:9.1f} мс")
+    return results
+
+
+def compare(old_path: str, new_path: str):
+    with open(old_path, 'r', encoding='utf-8') as f:
+        old = json.load(f)
+    with open(new_path, 'r', encoding='utf-8') as f:
+        new = json.load(f)
+
+    print(f"  {old.get('revision') or old_path} -> {new.get('revision') or new_path}")
+    print(f"  {'Бенчмарк':<20}{'Было, мс':>11}{'Стало, мс':>11}{'Изм.':>9}{'CPU было':>11}{'CPU стало':>11}")
+    for name, result in new['benchmarks'].items():
+        before = old['benchmarks'].get(name)
+        wall = result['wall']['median'] * 1000
+        cpu = result['cpu']['median'] * 1000
+        if before is None:
+            print(f"  {name:<20}{'-':>11}{wall:>11.1f}{'':>9}{'-':>11}{cpu:>11.1f}")
+            continue
+        old_wall = before['wall']['median'] * 1000
+        change = f"{(wall - old_wall) / old_wall * 100:+.1f}%" if old_wall > 0 else "-"
+        print(f"  {name:<20}{old_wall:>11.1f}{wall:>11.1f}{change:>9}{before['cpu']['median'] * 1000:>11.1f}{cpu:>11.1f}")
+
+
+def print_help():
+    print("""
+
+ИСПОЛЬЗОВАНИЕ:
+  python bench_collector.py [ПАРАМЕТРЫ]
+  python bench_collector.py --compare СТАРЫЙ.json НОВЫЙ.json
+
+ПАРАМЕТРЫ:
+  -h, --help            Показать эту справку
+  -n N, --runs N        Число прогонов каждого бенчмарка (по умолчанию: 10)
+  --ticks N             Число тактов мониторинга (по умолчанию: 20)
+  --backend ИМЯ         real, fake или all (по умолчанию: all)
+  -o ФАЙЛ, --output ФАЙЛ
+                        Файл результатов JSON (по умолчанию: bench_results.json)
+  --compare СТАРЫЙ НОВЫЙ
+                        Сравнить два файла результатов по медианам
+    """)
+    sys.exit(0)
+
+
+def main_bench():
+    runs = DEFAULT_RUNS
+    ticks = DEFAULT_TICKS
+    backends = list(BACKENDS)
+    output_file = DEFAULT_OUTPUT
+
+    args = sys.argv[1:]
+
+    i = 0
+    while i < len(args):
+        arg = args[i]
+
+        try:
+            if arg in ('-h', '--help'):
+                print_help()
+            elif arg == '--cold':
+                # дочерний процесс бенчмарка холодного старта
+                restore = use_backend(args[i + 1])
+                try:
+                    main.SystemInfoCollector(cache_path=args[i + 2], output_format='json',
+                                             disk_timeout=DISK_TIMEOUT).collect_basic()
+                finally:
+                    if restore is not None:
+                        restore()
+                return
+            elif arg == '--compare':
+                compare(args[i + 1], args[i + 2])
+                return
+            elif arg in ('-n', '--runs'):
+                runs = max(1, int(args[i + 1]))
+                i += 1
+            elif arg == '--ticks':
+                ticks = max(1, int(args[i + 1]))
+                i += 1
+            elif arg == '--backend':
+                if args[i + 1] not in BACKENDS + ('all',):
+                    print(f"Ошибка: неизвестный бэкенд {args[i + 1]}, доступны: {', '.join(BACKENDS)}, all")
+                    sys.exit(1)
+                backends = list(BACKENDS) if args[i + 1] == 'all' else [args[i + 1]]
+                i += 1
+            elif arg in ('-o', '--output'):
+                output_file = args[i + 1]
+                i += 1
+            else:
+                print(f"Неизвестный параметр: {arg}")
+                print_help()
+        except (IndexError, ValueError):
+            print(f"Ошибка: неверное значение параметра {arg}")
+            sys.exit(1)
+
+        i += 1
+
+    results = run_benchmarks(backends, runs, ticks)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    print(f"Результаты сохранены в файл: {output_file}")
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,66 @@
+import copy
+import sys
+import timeit
+from typing import Dict, Tuple
+
+import snapshot
+
+
+def make_snapshots(mounts: int, interfaces: int) -> Tuple[Dict[str, object], Dict[str, object]]:
+    # большой сервер: тысячи точек монтирования и интерфейсов; во втором снимке шум в каждой записи
+    # (заполнение в пределах допуска, скорости), плюс одна настоящая перемена
+    disks = [
+        {'mountpoint': f"/mnt/vol{index}", 'device': f"/dev/sd{index}", 'fstype': 'ext4', 'status': 'ok',
+         'total': 1 << 40, 'used': (1 << 39) + index, 'free': (1 << 39) - index, 'percent': 50.0,
+         'latency': 0.001, 'io': {'read_bytes': 100.0, 'write_bytes': 200.0}}
+        for index in range(mounts)
+    ]
+    nics = [
+        {'name': f"veth{index}", 'isup': True, 'speed': 10000, 'mtu': 1500,
+         'addresses': [{'family': 'AF_INET', 'address': f"10.{index // 65536}.{index // 256 % 256}.{index % 256}"}],
+         'rates': {'bytes_recv': 1000.0, 'bytes_sent': 500.0}, 'utilization': 0.1}
+        for index in range(interfaces)
+    ]
+    old = {'timestamp': 0.0, 'sections': {
+        'disks': {'disks': disks},
+        'network': {'interfaces': nics},
+        'memory': {'total': 1 << 38, 'used': 1 << 37, 'percent': 50.0},
+    }}
+    new = copy.deepcopy(old)
+    new['timestamp'] = 60.0
+    for disk in new['sections']['disks']['disks']:
+        disk['used'] += 4096
+        disk['free'] -= 4096
+        disk['percent'] += 0.2
+        disk['latency'] = 0.002
+        disk['io']['write_bytes'] += 50.0
+    for nic in new['sections']['network']['interfaces']:
+        nic['rates']['bytes_recv'] += 10.0
+        nic['utilization'] = 0.2
+    new['sections']['network']['interfaces'][0]['isup'] = False
+    return old, new
+
+
+def bench(old, new, number: int) -> float:
+    return min(timeit.repeat(lambda: snapshot.diff_snapshots(old, new), number=number, repeat=3)) / number
+
+
+def main_bench():
+    mounts = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    number = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    old, new = make_snapshots(mounts, mounts)
+    changes = snapshot.diff_snapshots(old, new)['changes']
+    if len(changes) != 1:
+        print(f"Внимание: ожидалось одно изменение, найдено {len(changes)}")
+
+    noisy_time = bench(old, new, number)
+    same_time = bench(old, copy.deepcopy(old), number)
+
+    print(f"точек монтирования и интерфейсов: {mounts} + {mounts}")
+    print(f"шум в каждой записи:   {noisy_time * 1000:8.2f} мс")
+    print(f"одинаковые снимки:     {same_time * 1000:8.2f} мс")
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,48 @@
+import platform
+import subprocess
+import sys
+import timeit
+
+import main
+
+
+# старый путь: shell + cat + grep + head ради одной строки /proc/cpuinfo
+def shell_cpuinfo_model() -> str:
+    result = subprocess.check_output(
+        "cat /proc/cpuinfo | grep 'model name' | head -1",
+        shell=True,
+        encoding="utf-8"
+    )
+    return result.split(":")[-1].strip()
+
+
+def direct_cpuinfo_model() -> str:
+    return main.parse_cpuinfo(main.read_text_file('/proc/cpuinfo')).get('model name', '')
+
+
+def bench(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def main_bench():
+    if platform.system() != "Linux":
+        print("Микробенчмарк сравнивает чтение /proc/cpuinfo и доступен только на Linux")
+        sys.exit(0)
+
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    if shell_cpuinfo_model() != direct_cpuinfo_model():
+        print("Внимание: результаты shell и прямого чтения различаются")
+
+    shell_time = bench(shell_cpuinfo_model, number)
+    direct_time = bench(direct_cpuinfo_model, number)
+    model_time = bench(main.probe_system_model_linux, number)
+
+    print(f"shell (cat | grep | head):       {shell_time * 1000:8.3f} мс")
+    print(f"прямое чтение /proc/cpuinfo:     {direct_time * 1000:8.3f} мс")
+    print(f"probe_system_model_linux():      {model_time * 1000:8.3f} мс")
+    print(f"Ускорение: {shell_time / direct_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,254 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+# лимит памяти v1 без ограничения - почти 2^63, округленное до страницы
+UNLIMITED_V1 = 1 << 62
+
+
+def parse_proc_cgroup(content: str) -> Dict[str, str]:
+    # "4:memory:/docker/abc" -> {'memory': '/docker/abc'}, для v2 "0::/user.slice" -> {'': '/user.slice'}
+    paths = {}
+    for line in content.splitlines():
+        parts = line.split(':', 2)
+        if len(parts) != 3:
+            continue
+        for controller in parts[1].split(','):
+            paths[controller] = parts[2]
+    return paths
+
+
+def parse_cpuset(value: str) -> List[int]:
+    cpus = []
+    for part in value.strip().split(','):
+        if not part:
+            continue
+        first, _, last = part.partition('-')
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def parse_flat_keyed(content: str) -> Dict[str, int]:
+    values = {}
+    for line in content.splitlines():
+        key, _, value = line.partition(' ')
+        if value.strip().lstrip('-').isdigit():
+            values[key] = int(value)
+    return values
+
+
+class CgroupReader:
+    # файлы cgroup открываются один раз и перечитываются через pread с нулевого смещения;
+    # лимиты берутся минимальными по всей цепочке предков, как их применяет ядро
+    def __init__(self, root: str = '/sys/fs/cgroup', proc_cgroup: str = '/proc/self/cgroup', window: float = 0.05):
+        self.root = root
+        self.window = window
+        self._fds: Dict[str, Optional[int]] = {}
+        self._lock = threading.Lock()
+
+        with open(proc_cgroup, 'r') as f:
+            paths = parse_proc_cgroup(f.read())
+        self.version = 2 if os.path.exists(os.path.join(root, 'cgroup.controllers')) else 1
+        if self.version == 2:
+            directory = self._resolve(root, paths.get('', '/'))
+            self.dirs = {name: directory for name in ('memory', 'cpu', 'cpuset')}
+        else:
+            self.dirs = {
+                name: self._resolve(self._controller_root(name, paths), paths.get(name, '/'))
+                for name in ('memory', 'cpu', 'cpuacct', 'cpuset')
+            }
+        self._chains = {name: self._ancestors(name) for name in ('memory', 'cpu')}
+        self.prime()
+
+    def _controller_root(self, controller: str, paths: Dict[str, str]) -> str:
+        # cpu и cpuacct часто смонтированы вместе как cpu,cpuacct
+        direct = os.path.join(self.root, controller)
+        if os.path.isdir(direct):
+            return direct
+        for name in os.listdir(self.root):
+            if controller in name.split(','):
+                return os.path.join(self.root, name)
+        return direct
+
+    @staticmethod
+    def _resolve(base: str, path: str) -> str:
+        # в контейнере со своим cgroup namespace или bind-монтированием путь из /proc/self/cgroup
+        # не существует внутри /sys/fs/cgroup - тогда корень иерархии и есть группа контейнера
+        candidate = os.path.join(base, path.lstrip('/'))
+        return candidate if os.path.isdir(candidate) else base
+
+    def _ancestors(self, controller: str) -> List[str]:
+        directory = self.dirs[controller]
+        top = self.root if self.version == 2 else self._controller_top(directory)
+        chain = [directory]
+        while directory != top and os.path.dirname(directory) != directory:
+            directory = os.path.dirname(directory)
+            chain.append(directory)
+        return chain
+
+    def _controller_top(self, directory: str) -> str:
+        relative = os.path.relpath(directory, self.root).split(os.sep)
+        return os.path.join(self.root, relative[0])
+
+    def _read(self, path: str, size: int = 4096) -> Optional[str]:
+        if path not in self._fds:
+            try:
+                self._fds[path] = os.open(path, os.O_RDONLY)
+            except OSError:
+                # файла нет в этой версии cgroup - больше не пытаемся
+                self._fds[path] = None
+        fd = self._fds[path]
+        if fd is None:
+            return None
+        try:
+            return os.pread(fd, size, 0).decode('ascii', 'replace')
+        except OSError:
+            return None
+
+    def _read_int(self, path: str) -> Optional[int]:
+        value = self._read(path)
+        if value is None:
+            return None
+        value = value.strip()
+        return int(value) if value.lstrip('-').isdigit() else None
+
+    def memory_limit(self) -> Optional[int]:
+        name = 'memory.max' if self.version == 2 else 'memory.limit_in_bytes'
+        limits = [self._read_int(os.path.join(directory, name)) for directory in self._chains['memory']]
+        limits = [limit for limit in limits if limit is not None and 0 < limit < UNLIMITED_V1]
+        return min(limits) if limits else None
+
+    def cpu_quota(self) -> Tuple[Optional[int], Optional[int]]:
+        best = (None, None)
+        for directory in self._chains['cpu']:
+            if self.version == 2:
+                content = self._read(os.path.join(directory, 'cpu.max'))
+                if content is None:
+                    continue
+                quota, _, period = content.strip().partition(' ')
+                if quota == 'max' or not period.isdigit():
+                    continue
+                quota, period = int(quota), int(period)
+            else:
+                quota = self._read_int(os.path.join(directory, 'cpu.cfs_quota_us'))
+                period = self._read_int(os.path.join(directory, 'cpu.cfs_period_us'))
+                if not quota or quota < 0 or not period:
+                    continue
+            if best[0] is None or quota / period < best[0] / best[1]:
+                best = (quota, period)
+        return best
+
+    def cpuset(self) -> Optional[List[int]]:
+        name = 'cpuset.cpus.effective' if self.version == 2 else 'cpuset.effective_cpus'
+        content = self._read(os.path.join(self.dirs['cpuset'], name))
+        if content is None and self.version == 1:
+            content = self._read(os.path.join(self.dirs['cpuset'], 'cpuset.cpus'))
+        try:
+            return parse_cpuset(content) if content and content.strip() else None
+        except ValueError:
+            return None
+
+    def counters(self) -> Dict[str, Optional[float]]:
+        # накопительные счетчики: время CPU и троттлинг в секундах
+        if self.version == 2:
+            stat = parse_flat_keyed(self._read(os.path.join(self.dirs['cpu'], 'cpu.stat')) or '')
+            usage = stat.get('usage_usec')
+            return {
+                'usage': usage / 1e6 if usage is not None else None,
+                'periods': stat.get('nr_periods'),
+                'throttled': stat.get('nr_throttled'),
+                'throttled_time': stat['throttled_usec'] / 1e6 if 'throttled_usec' in stat else None,
+            }
+        stat = parse_flat_keyed(self._read(os.path.join(self.dirs['cpu'], 'cpu.stat')) or '')
+        usage = self._read_int(os.path.join(self.dirs['cpuacct'], 'cpuacct.usage'))
+        return {
+            'usage': usage / 1e9 if usage is not None else None,
+            'periods': stat.get('nr_periods'),
+            'throttled': stat.get('nr_throttled'),
+            'throttled_time': stat['throttled_time'] / 1e9 if 'throttled_time' in stat else None,
+        }
+
+    def memory_usage(self) -> Tuple[Optional[int], Optional[int]]:
+        # рабочий набор = использование без неактивного файлового кэша, как считают kubelet и docker stats
+        directory = self.dirs['memory']
+        if self.version == 2:
+            usage = self._read_int(os.path.join(directory, 'memory.current'))
+            inactive = parse_flat_keyed(self._read(os.path.join(directory, 'memory.stat'), 16384) or '').get('inactive_file')
+        else:
+            usage = self._read_int(os.path.join(directory, 'memory.usage_in_bytes'))
+            inactive = parse_flat_keyed(self._read(os.path.join(directory, 'memory.stat'), 16384) or '').get('total_inactive_file')
+        if usage is None:
+            return None, None
+        return usage, max(0, usage - (inactive or 0))
+
+    def prime(self):
+        counters = self.counters()
+        with self._lock:
+            self._started = time.monotonic()
+            self._counters = counters
+
+    def sample(self, host_cpus: int, host_memory: int, reset: bool = False) -> Dict[str, object]:
+        remaining = self._started + self.window - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+        with self._lock:
+            counters = self.counters()
+            now = time.monotonic()
+            before = self._counters
+            elapsed = now - self._started
+            if reset:
+                self._started = now
+                self._counters = counters
+
+            memory_limit = self.memory_limit()
+            quota, period = self.cpu_quota()
+            cpuset = self.cpuset()
+            usage, working_set = self.memory_usage()
+
+        cores = float(host_cpus)
+        if cpuset:
+            cores = min(cores, len(cpuset))
+        if quota:
+            cores = min(cores, quota / period)
+        memory = min(host_memory, memory_limit) if memory_limit else host_memory
+
+        cpu_percent = None
+        if counters['usage'] is not None and before['usage'] is not None and elapsed > 0 and cores > 0:
+            cpu_percent = min(100.0, max(0.0, counters['usage'] - before['usage']) / elapsed / cores * 100)
+        throttled_percent = None
+        if counters['periods'] is not None and before['periods'] is not None:
+            periods = counters['periods'] - before['periods']
+            if periods > 0:
+                throttled_percent = max(0, counters['throttled'] - before['throttled']) / periods * 100
+
+        return {
+            'version': self.version,
+            'path': self.dirs['memory'],
+            'limited': bool(memory_limit or quota or (cpuset and len(cpuset) < host_cpus)),
+            'host_cpus': host_cpus,
+            'host_memory': host_memory,
+            'effective_cpus': cores,
+            'effective_memory': memory,
+            'cpu_quota': quota,
+            'cpu_period': period,
+            'cpuset': cpuset,
+            'memory_limit': memory_limit,
+            'memory_usage': usage,
+            'memory_working_set': working_set,
+            'memory_percent': working_set / memory * 100 if working_set is not None and memory else None,
+            'cpu_percent': cpu_percent,
+            'nr_periods': counters['periods'],
+            'nr_throttled': counters['throttled'],
+            'throttled_time': counters['throttled_time'],
+            'throttled_percent': throttled_percent,
+        }
+
+    def close(self):
+        with self._lock:
+            for fd in self._fds.values():
+                if fd is not None:
+                    os.close(fd)
+            self._fds.clear()
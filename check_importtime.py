@@ -0,0 +1,77 @@
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+
+# модули, которые не должны загружаться при импорте main.py
+# (subprocess и socket сюда не входят: их в любом случае импортирует psutil)
+LAZY_MODULES = ('cpuinfo', 'GPUtil', 'pynvml')
+DEFAULT_BUDGET_MS = 150.0
+DEFAULT_RUNS = 5
+
+
+def measure_import(module: str = "main") -> Dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "ошибка импорта")
+
+    # строки вида "import time:       186 |        186 |     _typing"
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        cumulative[parts[2].strip()] = int(parts[1].strip())
+    return cumulative
+
+
+def main():
+    budget_ms = DEFAULT_BUDGET_MS
+    runs = DEFAULT_RUNS
+
+    args = sys.argv[1:]
+    try:
+        if args:
+            budget_ms = float(args[0])
+        if len(args) > 1:
+            runs = int(args[1])
+    except ValueError:
+        print("ИСПОЛЬЗОВАНИЕ: python check_importtime.py [БЮДЖЕТ_МС] [ЗАПУСКОВ]")
+        sys.exit(2)
+
+    # прогревочный запуск, чтобы компиляция .pyc не попала в замер
+    measure_import()
+
+    samples: List[float] = []
+    loaded = set()
+    for _ in range(runs):
+        cumulative = measure_import()
+        samples.append(cumulative.get("main", 0) / 1000)
+        loaded.update(cumulative)
+
+    median_ms = statistics.median(samples)
+    print(f"Импорт main.py: медиана {median_ms:.1f} мс (мин {min(samples):.1f}, макс {max(samples):.1f}), бюджет {budget_ms:.1f} мс")
+
+    failed = False
+    eager = [name for name in LAZY_MODULES if name in loaded]
+    if eager:
+        print(f"Ошибка: при импорте загружаются модули, которые должны загружаться лениво: {', '.join(eager)}")
+        failed = True
+    if median_ms > budget_ms:
+        print("Ошибка: превышен бюджет времени импорта")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
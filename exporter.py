@@ -0,0 +1,297 @@
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class MetricsBuilder:
+    def __init__(self, prefix: str = "sic_"):
+        self.prefix = prefix
+        self.metrics: Dict[str, Tuple[str, str, List[str]]] = {}
+
+    def add(self, name: str, help_text: str, value, labels: Optional[Dict[str, object]] = None,
+            metric_type: str = "gauge"):
+        if value is None:
+            return
+        if isinstance(value, bool):
+            value = int(value)
+        name = self.prefix + name
+        if name not in self.metrics:
+            self.metrics[name] = (help_text, metric_type, [])
+        label_text = ""
+        if labels:
+            label_text = "{" + ",".join(f'{key}="{escape_label(item)}"' for key, item in labels.items()) + "}"
+        self.metrics[name][2].append(f"{name}{label_text} {float(value)!r}")
+
+    def render(self) -> str:
+        lines = []
+        for name, (help_text, metric_type, samples) in self.metrics.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+def build_metrics(report: Dict[str, object], collection_time: float, profiles=()) -> MetricsBuilder:
+    sections = report.get("sections", {})
+    metrics = MetricsBuilder()
+
+    system = sections.get("system", {})
+    metrics.add("info", "Static host information", 1, {
+        "hostname": system.get("hostname", ""),
+        "os": system.get("os", ""),
+        "release": system.get("release", ""),
+        "model": system.get("model", ""),
+    })
+
+    cpu = sections.get("cpu", {})
+    metrics.add("cpu_usage_percent", "Overall CPU utilisation", cpu.get("percent"))
+    for index, percent in enumerate(cpu.get("per_cpu") or []):
+        metrics.add("cpu_core_usage_percent", "Per-core CPU utilisation", percent, {"cpu": index})
+    for mode, percent in (cpu.get("times") or {}).items():
+        metrics.add("cpu_time_percent", "Share of CPU time by mode", percent, {"mode": mode})
+    metrics.add("cpu_cores", "Number of CPU cores", cpu.get("physical_cores"), {"type": "physical"})
+    metrics.add("cpu_cores", "Number of CPU cores", cpu.get("logical_cores"), {"type": "logical"})
+    metrics.add("cpu_frequency_mhz", "Current CPU frequency", cpu.get("freq_current"))
+    metrics.add("cpu_frequency_max_mhz", "Maximum CPU frequency", cpu.get("freq_max"))
+
+    memory = sections.get("memory", {})
+    for kind in ("total", "available", "used"):
+        metrics.add("memory_bytes", "Physical memory", memory.get(kind), {"type": kind})
+    metrics.add("memory_usage_percent", "Physical memory utilisation", memory.get("percent"))
+    metrics.add("swap_bytes", "Swap space", memory.get("swap_total"), {"type": "total"})
+    metrics.add("swap_bytes", "Swap space", memory.get("swap_used"), {"type": "used"})
+    metrics.add("swap_usage_percent", "Swap utilisation", memory.get("swap_percent"))
+
+    for gpu in sections.get("gpu", {}).get("gpus") or []:
+        labels = {"gpu": gpu["index"], "name": gpu["name"]}
+        metrics.add("gpu_memory_bytes", "GPU memory", gpu.get("memory_total"), {**labels, "type": "total"})
+        metrics.add("gpu_memory_bytes", "GPU memory", gpu.get("memory_used"), {**labels, "type": "used"})
+        metrics.add("gpu_load_percent", "GPU utilisation", gpu.get("load"), labels)
+        metrics.add("gpu_temperature_celsius", "GPU temperature", gpu.get("temperature"), labels)
+        metrics.add("gpu_power_watts", "GPU power draw", gpu.get("power"), labels)
+        metrics.add("gpu_power_limit_watts", "GPU enforced power limit", gpu.get("power_limit"), labels)
+        metrics.add("gpu_clock_mhz", "GPU clock", gpu.get("clock_graphics"), {**labels, "domain": "graphics"})
+        metrics.add("gpu_clock_mhz", "GPU clock", gpu.get("clock_memory"), {**labels, "domain": "memory"})
+
+    sensors = sections.get("sensors", {})
+    for index, freq in enumerate(sensors.get("cpu_freq") or []):
+        metrics.add("cpu_core_frequency_mhz", "Current per-core CPU frequency", freq.get("current"), {"cpu": index})
+    for entry in sensors.get("temperatures") or []:
+        metrics.add("temperature_celsius", "Hardware temperature sensor", entry.get("current"),
+                    {"chip": entry["chip"], "sensor": entry["label"]})
+    for entry in sensors.get("fans") or []:
+        metrics.add("fan_rpm", "Fan speed", entry.get("current"), {"chip": entry["chip"], "sensor": entry["label"]})
+    throttling = sensors.get("throttling") or {}
+    if throttling:
+        metrics.add("cpu_throttling_suspected", "Loaded cores below max frequency or sensors above threshold",
+                    throttling.get("suspected"))
+    for kind, count in (throttling.get("counts") or {}).items():
+        metrics.add("cpu_throttle_events_total", "Kernel thermal throttle counters", count, {"type": kind},
+                    metric_type="counter")
+
+    pressure = sections.get("pressure", {})
+    for resource, kinds in (pressure.get("pressure") or {}).items():
+        for kind, values in kinds.items():
+            for window in ("avg10", "avg60", "avg300"):
+                metrics.add("pressure_percent", "Pressure stall information: share of time tasks stalled",
+                            values.get(window), {"resource": resource, "kind": kind, "window": window})
+            total = values.get("total")
+            metrics.add("pressure_stall_seconds_total", "Total stall time since boot",
+                        total / 1e6 if total is not None else None, {"resource": resource, "kind": kind},
+                        metric_type="counter")
+    for key, value in (pressure.get("meminfo") or {}).items():
+        if key.startswith("HugePages_"):
+            metrics.add("memory_hugepages", "Huge pages", value, {"state": key[len("HugePages_"):].lower()})
+        else:
+            metrics.add("memory_detail_bytes", "Memory breakdown from /proc/meminfo", value, {"field": key})
+    for name, rate in (pressure.get("vmstat_rates") or {}).items():
+        metrics.add("vmstat_rate", "Page fault and swap rates per second from /proc/vmstat", rate, {"counter": name})
+
+    container = sections.get("container", {})
+    if container.get("available"):
+        metrics.add("container_limited", "Whether the cgroup sets CPU or memory limits", container.get("limited"))
+        metrics.add("container_effective_cpus", "CPUs available to the cgroup", container.get("effective_cpus"))
+        metrics.add("container_effective_memory_bytes", "Memory available to the cgroup", container.get("effective_memory"))
+        metrics.add("container_memory_bytes", "Cgroup memory", container.get("memory_usage"), {"type": "usage"})
+        metrics.add("container_memory_bytes", "Cgroup memory", container.get("memory_working_set"),
+                    {"type": "working_set"})
+        metrics.add("container_cpu_percent", "Cgroup CPU usage of effective CPUs", container.get("cpu_percent"))
+        metrics.add("container_cpu_throttled_periods_total", "CFS periods throttled",
+                    container.get("nr_throttled"), metric_type="counter")
+        metrics.add("container_cpu_throttled_seconds_total", "Time throttled by CFS quota",
+                    container.get("throttled_time"), metric_type="counter")
+
+    for disk in sections.get("disks", {}).get("disks") or []:
+        labels = {"mountpoint": disk["mountpoint"], "device": disk["device"], "fstype": disk["fstype"]}
+        metrics.add("disk_up", "Whether the mount point answered statvfs in time", disk["status"] == "ok", labels)
+        metrics.add("disk_probe_seconds", "statvfs latency", disk.get("latency"), labels)
+        for kind in ("total", "used", "free"):
+            metrics.add("disk_bytes", "Filesystem capacity", disk.get(kind), {**labels, "type": kind})
+        metrics.add("disk_usage_percent", "Filesystem fill", disk.get("percent"), labels)
+        io = disk.get("io") or {}
+        for direction in ("read", "write"):
+            metrics.add("disk_io_bytes_per_second", "Disk throughput",
+                        io.get(f"{direction}_bytes"), {**labels, "direction": direction})
+            metrics.add("disk_io_ops_per_second", "Disk IOPS",
+                        io.get(f"{direction}_count"), {**labels, "direction": direction})
+        metrics.add("disk_io_await_milliseconds", "Average I/O wait", io.get("await"), labels)
+        metrics.add("disk_io_busy_percent", "Device busy time", io.get("busy_percent"), labels)
+
+    network = sections.get("network", {})
+    interfaces = list(network.get("interfaces") or [])
+    interfaces += [
+        {"name": f"{group['prefix']}*", "isup": group["up"] > 0, "rates": group["rates"]}
+        for group in network.get("aggregated") or []
+    ]
+    for interface in interfaces:
+        labels = {"interface": interface["name"]}
+        metrics.add("network_up", "Interface link state", interface.get("isup"), labels)
+        metrics.add("network_speed_mbps", "Interface link speed", interface.get("speed") or None, labels)
+        metrics.add("network_utilization_percent", "Link utilisation", interface.get("utilization"), labels)
+        rates = interface.get("rates") or {}
+        for counter, direction, kind in (
+            ("bytes_recv", "receive", "bytes"), ("bytes_sent", "transmit", "bytes"),
+            ("packets_recv", "receive", "packets"), ("packets_sent", "transmit", "packets"),
+            ("errin", "receive", "errors"), ("errout", "transmit", "errors"),
+            ("dropin", "receive", "drops"), ("dropout", "transmit", "drops"),
+        ):
+            metrics.add(f"network_{kind}_per_second", f"Interface {kind} rate",
+                        rates.get(counter), {**labels, "direction": direction})
+
+    battery = sections.get("battery", {})
+    if battery.get("present"):
+        metrics.add("battery_percent", "Battery charge", battery.get("percent"))
+        metrics.add("battery_power_plugged", "Whether AC power is connected", battery.get("power_plugged"))
+        metrics.add("battery_seconds_left", "Estimated battery time left", battery.get("secsleft"))
+
+    uptime = sections.get("uptime", {})
+    metrics.add("boot_time_seconds", "System boot time (unix time)", uptime.get("boot_time"))
+    metrics.add("uptime_seconds", "System uptime", uptime.get("uptime"))
+
+    metrics.add("collection_seconds", "Time spent collecting the snapshot", collection_time)
+    for profile in profiles:
+        labels = {"probe": profile.key}
+        metrics.add("probe_duration_seconds", "Wall time of a report section probe", profile.wall, labels)
+        metrics.add("probe_cpu_seconds", "CPU time of a report section probe thread", profile.cpu, labels)
+        metrics.add("probe_errors", "Errors swallowed by a report section probe", len(profile.errors), labels)
+        metrics.add("probe_timed_out", "Whether a report section probe hit its timeout", profile.status == "timeout", labels)
+    return metrics
+
+
+class SnapshotExporter:
+    # сбор идет в одном фоновом потоке, запросы /metrics отдают готовый снимок:
+    # сколько бы ни было параллельных скрейперов, дорогие пробы выполняются один раз за max_age
+    def __init__(self, collector, max_age: float = 15.0):
+        self.collector = collector
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._metrics: Optional[MetricsBuilder] = None
+        self._collected_at = 0.0
+        self.refresh_failures = 0
+        self.last_refresh_ok = False
+
+    def refresh(self):
+        started = time.monotonic()
+        # окна загрузки CPU, скоростей дисков/сети и vmstat - от прошлого обновления до этого
+        report = self.collector.collect_verbose(reset=True)
+        metrics = build_metrics(report.to_dict(), time.monotonic() - started, report.profile)
+        with self._lock:
+            self._metrics = metrics
+            self._collected_at = time.monotonic()
+        self._ready.set()
+
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.refresh()
+                self.last_refresh_ok = True
+            except Exception as e:
+                # старый снимок продолжает отдаваться, но это видно по метрикам и в журнале
+                self.refresh_failures += 1
+                self.last_refresh_ok = False
+                print(f"Ошибка обновления метрик: {type(e).__name__}: {e}", file=sys.stderr)
+            self._stop.wait(max(0.0, self.max_age - (time.monotonic() - started)))
+
+    def start(self):
+        threading.Thread(target=self._refresh_loop, name="exporter-refresh", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def render(self, wait: float = 30.0) -> Optional[str]:
+        self._ready.wait(wait)
+        with self._lock:
+            if self._metrics is None:
+                return None
+            age = time.monotonic() - self._collected_at
+            text = self._metrics.render()
+        return text + (
+            "# HELP sic_snapshot_age_seconds Age of the served snapshot\n"
+            "# TYPE sic_snapshot_age_seconds gauge\n"
+            f"sic_snapshot_age_seconds {age!r}\n"
+            "# HELP sic_refresh_success Whether the last snapshot refresh succeeded\n"
+            "# TYPE sic_refresh_success gauge\n"
+            f"sic_refresh_success {int(self.last_refresh_ok)}\n"
+            "# HELP sic_refresh_failures_total Snapshot refreshes that raised an error\n"
+            "# TYPE sic_refresh_failures_total counter\n"
+            f"sic_refresh_failures_total {self.refresh_failures}\n"
+        )
+
+
+def make_handler(exporter: SnapshotExporter):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+
+            body = exporter.render()
+            if body is None:
+                self.send_error(503, "Снимок метрик еще не готов")
+                return
+
+            payload = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+def make_server(collector, host: str = "0.0.0.0", port: int = 9100,
+                max_age: float = 15.0) -> Tuple[ThreadingHTTPServer, SnapshotExporter]:
+    exporter = SnapshotExporter(collector, max_age=max_age)
+    server = ThreadingHTTPServer((host, port), make_handler(exporter))
+    server.daemon_threads = True
+    exporter.start()
+    return server, exporter
+
+
+def serve(collector, host: str = "0.0.0.0", port: int = 9100, max_age: float = 15.0):
+    server, exporter = make_server(collector, host, port, max_age)
+    print(f"Экспортер метрик: http://{host}:{port}/metrics (обновление раз в {max_age:g} с)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        exporter.stop()
+        server.server_close()
+        collector.close_gpu_backend()
@@ -0,0 +1,446 @@
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import types
+from collections import namedtuple
+from typing import Callable, Dict, List, NamedTuple
+
+
+# детерминированная замена psutil/cpuinfo/GPUtil для бенчмарков: большой "сервер"
+# с медленными точками монтирования, сотнями интерфейсов и тысячами процессов
+
+scputimes = namedtuple('scputimes', 'user nice system idle iowait irq softirq steal guest guest_nice')
+scpufreq = namedtuple('scpufreq', 'current min max')
+svmem = namedtuple('svmem', 'total available percent used free')
+sswap = namedtuple('sswap', 'total used free percent sin sout')
+sdiskpart = namedtuple('sdiskpart', 'device mountpoint fstype opts')
+sdiskusage = namedtuple('sdiskusage', 'total used free percent')
+sdiskio = namedtuple('sdiskio', 'read_count write_count read_bytes write_bytes read_time write_time busy_time')
+snetio = namedtuple('snetio', 'bytes_sent bytes_recv packets_sent packets_recv errin errout dropin dropout')
+snicaddr = namedtuple('snicaddr', 'family address netmask broadcast ptp')
+snicstats = namedtuple('snicstats', 'isup duplex speed mtu flags')
+pmem = namedtuple('pmem', 'rss vms')
+pio = namedtuple('pio', 'read_count write_count read_bytes write_bytes')
+shwtemp = namedtuple('shwtemp', 'label current high critical')
+sfan = namedtuple('sfan', 'label current')
+
+GIB = 1024 ** 3
+
+
+class FakeScale(NamedTuple):
+    cpus: int = 64
+    partitions: int = 400
+    slow_mounts: int = 20
+    slow_latency: float = 0.05
+    hung_mounts: int = 2
+    hung_latency: float = 1.0
+    nics: int = 300
+    processes: int = 3000
+    gpus: int = 2
+    nvml: bool = True
+    gputil_latency: float = 0.15
+    # версия cgroup контейнера с лимитами (1 или 2), 0 - без cgroup
+    cgroup: int = 2
+
+
+class FakeProcess:
+    __slots__ = ('info',)
+
+    def __init__(self, info: Dict[str, object]):
+        self.info = info
+
+
+class FakePsutil(types.ModuleType):
+    AF_LINK = -1
+    POWER_TIME_UNLIMITED = -2
+    POWER_TIME_UNKNOWN = -1
+
+    def __init__(self, scale: FakeScale = FakeScale()):
+        super().__init__('psutil')
+        self.scale = scale
+        self._lock = threading.Lock()
+        self._calls: Dict[str, int] = {}
+        self._partitions = self._build_partitions()
+        local = [part.mountpoint for part in self._partitions[1:] if part.fstype == 'xfs']
+        remote = [part.mountpoint for part in self._partitions if part.fstype == 'nfs4']
+        self._slow = set(local[:scale.slow_mounts])
+        # зависают, как и в жизни, сетевые файловые системы
+        self._hung = set(remote[:scale.hung_mounts])
+        self._nics = ['lo', 'eth0', 'eth1'] + [
+            f"{'veth' if index % 3 else 'cali'}{index:05x}" for index in range(max(0, scale.nics - 3))
+        ]
+
+    def _tick(self, name: str) -> int:
+        # счетчики растут на фиксированный шаг с каждым вызовом: данные одинаковы от запуска к запуску
+        with self._lock:
+            self._calls[name] = count = self._calls.get(name, 0) + 1
+        return count
+
+    def _build_partitions(self) -> List[sdiskpart]:
+        partitions = [sdiskpart('/dev/fake0', '/', 'ext4', 'rw,relatime')]
+        for index in range(1, self.scale.partitions):
+            kind = index % 10
+            if kind < 4:
+                partitions.append(sdiskpart(f'/dev/fake{index}', f'/data/{index}', 'xfs', 'rw'))
+            elif kind < 6:
+                partitions.append(sdiskpart(f'server:/export/{index}', f'/mnt/nfs/{index}', 'nfs4', 'rw'))
+            elif kind < 8:
+                partitions.append(sdiskpart('overlay', f'/var/lib/docker/overlay2/{index}/merged', 'overlay', 'rw'))
+            else:
+                partitions.append(sdiskpart('tmpfs', f'/run/user/{index}', 'tmpfs', 'rw'))
+        return partitions
+
+    def cpu_count(self, logical: bool = True) -> int:
+        return self.scale.cpus if logical else self.scale.cpus // 2
+
+    def cpu_times(self, percpu: bool = False):
+        tick = self._tick('cpu_times_percpu' if percpu else 'cpu_times')
+        if percpu:
+            return [
+                scputimes(tick * (2 + core % 8), 0.0, tick, tick * 7, core % 2 * tick * 0.1, 0.0, 0.0, 0.0, 0.0, 0.0)
+                for core in range(self.scale.cpus)
+            ]
+        cpus = self.scale.cpus
+        return scputimes(tick * 4 * cpus, 0.0, tick * cpus, tick * 7 * cpus, tick * 0.05 * cpus, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+    def cpu_freq(self, percpu: bool = False):
+        if percpu:
+            # каждое восьмое ядро нагружено и сброшено до 1200 MHz - детектор троттлинга должен его найти
+            return [scpufreq(1200.0 if core % 8 == 7 else 3400.0, 800.0, 3500.0) for core in range(self.scale.cpus)]
+        return scpufreq(2400.0, 800.0, 3500.0)
+
+    def sensors_temperatures(self):
+        return {
+            'coretemp': [shwtemp('Package id 0', 92.0, 90.0, 100.0)] + [
+                shwtemp(f'Core {core}', 60.0 + core % 10, 90.0, 100.0) for core in range(self.scale.cpus // 2)
+            ],
+            'nvme': [shwtemp('Composite', 41.0, 80.0, 85.0)],
+        }
+
+    def sensors_fans(self):
+        return {'nct6775': [sfan(f'fan{index}', 1200 + index * 100) for index in range(1, 5)]}
+
+    def virtual_memory(self):
+        total = 512 * GIB
+        return svmem(total, total * 3 // 4, 25.0, total // 4, total // 2)
+
+    def swap_memory(self):
+        return sswap(8 * GIB, GIB, 7 * GIB, 12.5, 0, 0)
+
+    def boot_time(self) -> float:
+        return 1_700_000_000.0
+
+    def sensors_battery(self):
+        return None
+
+    def disk_partitions(self, all: bool = False) -> List[sdiskpart]:
+        if all:
+            return list(self._partitions)
+        return [part for part in self._partitions if part.fstype not in ('overlay', 'tmpfs')]
+
+    def disk_usage(self, path: str):
+        if path in self._hung:
+            time.sleep(self.scale.hung_latency)
+        elif path in self._slow:
+            time.sleep(self.scale.slow_latency)
+        total = 4 * 1024 * GIB
+        used = total * (len(path) % 90 + 5) // 100
+        return sdiskusage(total, used, total - used, round(used / total * 100, 1))
+
+    def disk_io_counters(self, perdisk: bool = False):
+        tick = self._tick('disk_io_counters')
+        return {
+            f'fake{index}': sdiskio(tick * 10, tick * 20, tick * 4096 * 10, tick * 4096 * 20, tick * 5, tick * 8, tick * 6)
+            for index in range(self.scale.partitions)
+        }
+
+    def net_io_counters(self, pernic: bool = False):
+        tick = self._tick('net_io_counters')
+        return {
+            name: snetio(tick * 1500 * (index + 1), tick * 3000 * (index + 1), tick * (index + 1), tick * 2 * (index + 1), 0, 0, 0, 0)
+            for index, name in enumerate(self._nics)
+        }
+
+    def net_if_addrs(self):
+        addresses = {}
+        for index, name in enumerate(self._nics):
+            addresses[name] = [
+                snicaddr(self.AF_LINK, f"02:00:00:{index >> 16 & 0xff:02x}:{index >> 8 & 0xff:02x}:{index & 0xff:02x}", None, None, None),
+                snicaddr(socket.AF_INET, f"10.{index >> 16 & 0xff}.{index >> 8 & 0xff}.{index & 0xff}", '255.255.0.0', None, None),
+            ]
+        return addresses
+
+    def net_if_stats(self):
+        return {
+            name: snicstats(index % 7 != 0, 2, 10000 if name.startswith('eth') else 0, 1500, 'up')
+            for index, name in enumerate(self._nics)
+        }
+
+    def process_iter(self, attrs=None, ad_value=None):
+        tick = self._tick('process_iter')
+        attrs = set(attrs or ())
+        for pid in range(1, self.scale.processes + 1):
+            info = {'pid': pid}
+            if 'name' in attrs:
+                info['name'] = f"worker-{pid % 97}"
+            if 'cpu_percent' in attrs:
+                info['cpu_percent'] = pid * 7 % 1000 / 10
+            if 'memory_info' in attrs:
+                info['memory_info'] = pmem(pid * 4096 * (pid % 50 + 1), pid * 8192)
+            if 'io_counters' in attrs:
+                info['io_counters'] = pio(tick, tick, tick * pid * 512, tick * pid * 256)
+            if 'num_fds' in attrs:
+                info['num_fds'] = pid % 300
+            if 'num_handles' in attrs:
+                info['num_handles'] = pid % 300
+            yield FakeProcess(info)
+
+
+def make_cpuinfo() -> types.ModuleType:
+    module = types.ModuleType('cpuinfo')
+    module.get_cpu_info = lambda: {
+        'brand_raw': 'Fake CPU @ 2.40GHz',
+        'vendor_id_raw': 'FakeVendor',
+        'l3_cache_size': 64 * 1024 * 1024,
+    }
+    return module
+
+
+class FakeGPU:
+    def __init__(self, index: int):
+        self.id = index
+        self.name = f"Fake GPU {index}"
+        self.memoryTotal = 81920.0
+        self.memoryUsed = 1024.0 * (index + 1)
+        self.load = 0.25 * (index + 1) % 1.0
+        self.temperature = 40.0 + index
+        self.driver = "0.0.fake"
+
+
+def make_gputil(count: int, latency: float = 0.0) -> types.ModuleType:
+    # настоящий getGPUs каждый раз запускает nvidia-smi, задержка это имитирует
+    def get_gpus():
+        time.sleep(latency)
+        return [FakeGPU(index) for index in range(count)]
+
+    module = types.ModuleType('GPUtil')
+    module.getGPUs = get_gpus
+    return module
+
+
+class FakeNvmlError(Exception):
+    pass
+
+
+class FakeNvml(types.ModuleType):
+    # то подмножество pynvml, которым пользуется gpu.NvmlBackend
+    NVMLError = FakeNvmlError
+    NVML_TEMPERATURE_GPU = 0
+    NVML_CLOCK_GRAPHICS = 0
+    NVML_CLOCK_MEM = 2
+
+    def __init__(self, count: int):
+        super().__init__('pynvml')
+        self.count = count
+        self.initialized = 0
+        self._reads = 0
+
+    def _check(self):
+        if self.initialized <= 0:
+            raise FakeNvmlError("NVML not initialized")
+
+    def nvmlInit(self):
+        self.initialized += 1
+
+    def nvmlShutdown(self):
+        self._check()
+        self.initialized -= 1
+
+    def nvmlSystemGetDriverVersion(self) -> bytes:
+        self._check()
+        return b"0.0.fake"
+
+    def nvmlDeviceGetCount(self) -> int:
+        self._check()
+        return self.count
+
+    def nvmlDeviceGetHandleByIndex(self, index: int) -> int:
+        self._check()
+        if not 0 <= index < self.count:
+            raise FakeNvmlError("invalid argument")
+        return index
+
+    def nvmlDeviceGetName(self, handle: int) -> str:
+        return f"Fake GPU {handle}"
+
+    def nvmlDeviceGetMemoryInfo(self, handle: int):
+        self._check()
+        total = 80 * GIB
+        return types.SimpleNamespace(total=total, used=GIB * (handle + 1), free=total - GIB * (handle + 1))
+
+    def nvmlDeviceGetUtilizationRates(self, handle: int):
+        self._check()
+        self._reads += 1
+        return types.SimpleNamespace(gpu=(handle * 25 + self._reads) % 101, memory=handle * 10)
+
+    def nvmlDeviceGetTemperature(self, handle: int, sensor: int) -> int:
+        return 40 + handle
+
+    def nvmlDeviceGetPowerUsage(self, handle: int) -> int:
+        return 150_000 + handle * 1000
+
+    def nvmlDeviceGetEnforcedPowerLimit(self, handle: int) -> int:
+        if handle % 2:
+            # как на картах без управления питанием
+            raise FakeNvmlError("not supported")
+        return 300_000
+
+    def nvmlDeviceGetClockInfo(self, handle: int, clock_type: int) -> int:
+        return 1410 if clock_type == self.NVML_CLOCK_GRAPHICS else 1593
+
+
+def build_sysfs(root: str, scale: FakeScale = FakeScale()):
+    # минимальное дерево /sys для модели системы, SensorPoller и read_throttle_counts
+    def write(path: str, content: str):
+        path = os.path.join(root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content + '\n')
+
+    write('class/dmi/id/product_name', 'Fake Server 9000')
+    write('class/hwmon/hwmon0/name', 'coretemp')
+    write('class/hwmon/hwmon0/temp1_label', 'Package id 0')
+    write('class/hwmon/hwmon0/temp1_input', '92000')
+    for core in range(scale.cpus // 2):
+        write(f'class/hwmon/hwmon0/temp{core + 2}_label', f'Core {core}')
+        write(f'class/hwmon/hwmon0/temp{core + 2}_input', str((60 + core % 10) * 1000))
+    write('class/hwmon/hwmon1/name', 'nct6775')
+    for index in range(1, 5):
+        write(f'class/hwmon/hwmon1/fan{index}_input', str(1200 + index * 100))
+    for core in range(scale.cpus):
+        write(f'devices/system/cpu/cpu{core}/cpufreq/scaling_cur_freq', '1200000' if core % 8 == 7 else '3400000')
+        write(f'devices/system/cpu/cpu{core}/topology/physical_package_id', str(core * 2 // scale.cpus))
+        write(f'devices/system/cpu/cpu{core}/thermal_throttle/core_throttle_count', str(core % 3))
+        write(f'devices/system/cpu/cpu{core}/thermal_throttle/package_throttle_count', '7')
+
+
+def build_procfs(procfs: str):
+    # PSI, meminfo и vmstat в формате ядра; значения под нагрузкой по памяти
+    def write(name: str, content: str):
+        path = os.path.join(procfs, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content + '\n')
+
+    write('pressure/cpu', 'some avg10=12.50 avg60=8.10 avg300=4.02 total=912345678\n'
+                          'full avg10=0.00 avg60=0.00 avg300=0.00 total=0')
+    write('pressure/memory', 'some avg10=35.20 avg60=20.75 avg300=9.11 total=45678901\n'
+                             'full avg10=18.40 avg60=10.02 avg300=4.50 total=23456789')
+    write('pressure/io', 'some avg10=5.00 avg60=3.00 avg300=1.00 total=3456789\n'
+                         'full avg10=2.00 avg60=1.00 avg300=0.50 total=1234567')
+    meminfo = {
+        'MemTotal': 512 * GIB // 1024, 'MemFree': 8 * GIB // 1024, 'Buffers': 1048576, 'Cached': 96 * GIB // 1024,
+        'SwapCached': 65536, 'Dirty': 524288, 'Writeback': 16384, 'Slab': 12582912, 'SReclaimable': 10485760,
+        'SUnreclaim': 2097152, 'CommitLimit': 280 * GIB // 1024, 'Committed_AS': 600 * GIB // 1024,
+    }
+    lines = [f"{key + ':':<16}{value:>10} kB" for key, value in meminfo.items()]
+    lines += ['HugePages_Total:    1024', 'HugePages_Free:      256', 'Hugepagesize:       2048 kB']
+    write('meminfo', '\n'.join(lines))
+    write('vmstat', '\n'.join(['nr_free_pages 2097152', 'pswpin 1200345', 'pswpout 3400567',
+                               'pgfault 987654321', 'pgmajfault 123456', 'pgsteal_kswapd 5555']))
+
+
+def build_mountinfo(procfs: str, partitions: List[sdiskpart]):
+    # /proc/self/mountinfo для тех же разделов, что отдает FakePsutil: MountFilter берет номера устройств
+    # отсюда, а не stat() на каждую точку монтирования
+    lines = []
+    for index, part in enumerate(partitions):
+        major = 0 if part.fstype in ('nfs4', 'tmpfs', 'overlay') else 8
+        mountpoint = part.mountpoint.replace(' ', '\\040')
+        lines.append(f"{index + 22} 1 {major}:{index} / {mountpoint} {part.opts} shared:{index} - "
+                     f"{part.fstype} {part.device} rw")
+    path = os.path.join(procfs, 'self', 'mountinfo')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def build_cgroup(sysfs: str, procfs: str, scale: FakeScale = FakeScale()):
+    # контейнер на 8 ядер из cpus (квота 4 ядра) и 16 ГиБ памяти, как его видит CgroupReader
+    def write(path: str, content: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content + '\n')
+
+    root = os.path.join(sysfs, 'fs', 'cgroup')
+    group = '/kubepods/pod-fake/container'
+    cpuset = f"0-{min(scale.cpus, 8) - 1}"
+    stat = ['inactive_file 2147483648']
+    if scale.cgroup == 2:
+        write(os.path.join(procfs, 'self', 'cgroup'), f"0::{group}")
+        directory = os.path.join(root, group.lstrip('/'))
+        write(os.path.join(root, 'cgroup.controllers'), 'cpuset cpu io memory pids')
+        write(os.path.join(directory, 'memory.max'), str(16 * GIB))
+        write(os.path.join(directory, 'memory.current'), str(10 * GIB))
+        write(os.path.join(directory, 'memory.stat'), '\n'.join(['anon 8589934592'] + stat))
+        write(os.path.join(directory, 'cpu.max'), '400000 100000')
+        write(os.path.join(directory, 'cpu.stat'), 'usage_usec 123456789\nnr_periods 1000\n'
+                                                    'nr_throttled 250\nthrottled_usec 4500000')
+        write(os.path.join(directory, 'cpuset.cpus.effective'), cpuset)
+        return
+
+    write(os.path.join(procfs, 'self', 'cgroup'),
+          f"5:memory:{group}\n4:cpu,cpuacct:{group}\n3:cpuset:{group}")
+    memory = os.path.join(root, 'memory', group.lstrip('/'))
+    cpu = os.path.join(root, 'cpu,cpuacct', group.lstrip('/'))
+    write(os.path.join(root, 'memory', 'memory.limit_in_bytes'), '9223372036854771712')
+    write(os.path.join(memory, 'memory.limit_in_bytes'), str(16 * GIB))
+    write(os.path.join(memory, 'memory.usage_in_bytes'), str(10 * GIB))
+    write(os.path.join(memory, 'memory.stat'), '\n'.join(['cache 4294967296'] + ['total_' + line for line in stat]))
+    write(os.path.join(cpu, 'cpu.cfs_quota_us'), '400000')
+    write(os.path.join(cpu, 'cpu.cfs_period_us'), '100000')
+    write(os.path.join(cpu, 'cpu.stat'), 'nr_periods 1000\nnr_throttled 250\nthrottled_time 4500000000')
+    write(os.path.join(cpu, 'cpuacct.usage'), '123456789000')
+    write(os.path.join(root, 'cpuset', group.lstrip('/'), 'cpuset.cpus'), cpuset)
+
+
+def install(target, scale: FakeScale = FakeScale()) -> Callable[[], None]:
+    # подменяет psutil, корни /sys и /proc в модуле target и ленивые cpuinfo/GPUtil/pynvml в sys.modules,
+    # возвращает функцию, которая все возвращает на место
+    original_psutil = target.psutil
+    original_sysfs = target.SYSFS_ROOT
+    original_procfs = target.PROCFS_ROOT
+    original_modules = {name: sys.modules.get(name) for name in ('cpuinfo', 'GPUtil', 'pynvml')}
+
+    sysfs = tempfile.mkdtemp(prefix="sic-fake-sysfs-")
+    procfs = tempfile.mkdtemp(prefix="sic-fake-procfs-")
+    build_sysfs(sysfs, scale)
+    build_procfs(procfs)
+    if scale.cgroup:
+        build_cgroup(sysfs, procfs, scale)
+    fake_psutil = FakePsutil(scale)
+    build_mountinfo(procfs, fake_psutil._partitions)
+    target.SYSFS_ROOT = sysfs
+    target.PROCFS_ROOT = procfs
+    target.psutil = fake_psutil
+    sys.modules['cpuinfo'] = make_cpuinfo()
+    sys.modules['GPUtil'] = make_gputil(scale.gpus, scale.gputil_latency)
+    # None в sys.modules - ImportError при импорте: так проверяется запасной путь через GPUtil
+    sys.modules['pynvml'] = FakeNvml(scale.gpus) if scale.nvml else None
+
+    def restore():
+        target.psutil = original_psutil
+        target.SYSFS_ROOT = original_sysfs
+        target.PROCFS_ROOT = original_procfs
+        shutil.rmtree(sysfs, ignore_errors=True)
+        shutil.rmtree(procfs, ignore_errors=True)
+        for name, module in original_modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+    return restore
@@ -0,0 +1,291 @@
+import abc
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+
+MAIN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+# загрузка CPU идет в сводку по парку: точность окна 0.5 с важнее 450 мс на хост
+FLEET_CPU_WINDOW = "0.5"
+DEFAULT_REMOTE_COMMAND = f"python3 main.py -f json --cpu-window {FLEET_CPU_WINDOW}"
+
+
+class HostResult(NamedTuple):
+    host: str
+    ok: bool
+    elapsed: float
+    report: Optional[Dict[str, object]] = None
+    error: Optional[str] = None
+
+
+class Transport(abc.ABC):
+    @abc.abstractmethod
+    async def run(self, host: str, timeout: float) -> Dict[str, object]:
+        ...
+
+
+class CommandTransport(Transport):
+    # {host} в аргументах заменяется на имя цели из инвентаря
+    def __init__(self, command: List[str]):
+        self.command = command
+
+    def build(self, host: str) -> List[str]:
+        return [part.replace("{host}", host) for part in self.command]
+
+    async def run(self, host: str, timeout: float) -> Dict[str, object]:
+        process = await asyncio.create_subprocess_exec(
+            *self.build(host),
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+
+        if process.returncode != 0:
+            lines = stderr.decode("utf-8", "replace").strip().splitlines()
+            raise RuntimeError(lines[-1] if lines else f"код завершения {process.returncode}")
+        return json.loads(stdout)
+
+
+class LocalTransport(CommandTransport):
+    # запускает сборщик на этой же машине: для проверки и отладки fleet-режима
+    def __init__(self, extra_args: List[str] = ()):
+        super().__init__([sys.executable, MAIN_PATH, "-f", "json", "--cpu-window", FLEET_CPU_WINDOW, *extra_args])
+
+
+class SSHTransport(CommandTransport):
+    def __init__(self, remote_command: str = DEFAULT_REMOTE_COMMAND, ssh_options: List[str] = ()):
+        super().__init__(["ssh", "-o", "BatchMode=yes", *ssh_options, "{host}", remote_command])
+
+
+TRANSPORTS = {
+    "local": LocalTransport,
+    "ssh": SSHTransport,
+}
+
+
+def read_inventory(path: str) -> List[str]:
+    hosts = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            host = line.split("#", 1)[0].strip()
+            if host:
+                hosts.append(host)
+    return hosts
+
+
+async def collect_fleet(hosts: List[str], transport: Transport, concurrency: int = 16, timeout: float = 30.0,
+                        on_result: Optional[Callable[[HostResult], None]] = None) -> List[HostResult]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def collect(host: str) -> HostResult:
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                report = await transport.run(host, timeout)
+                result = HostResult(host, True, time.monotonic() - started, report=report)
+            except asyncio.TimeoutError:
+                result = HostResult(host, False, time.monotonic() - started, error=f"тайм-аут {timeout:g} с")
+            except Exception as e:
+                result = HostResult(host, False, time.monotonic() - started, error=str(e) or type(e).__name__)
+
+        if on_result is not None:
+            on_result(result)
+        return result
+
+    tasks = [asyncio.create_task(collect(host)) for host in hosts]
+    results = []
+    for task in asyncio.as_completed(tasks):
+        results.append(await task)
+    return results
+
+
+def extract_metrics(report: Dict[str, object]) -> Dict[str, Optional[float]]:
+    sections = report.get("sections", {})
+    disks = sections.get("disks", {})
+    # в кратком отчете точки монтирования в mounts, в полном - в disks
+    mounts = disks.get("mounts") or disks.get("disks") or []
+    fills = [mount["percent"] for mount in mounts if mount.get("percent") is not None]
+    return {
+        "ram": sections.get("memory", {}).get("percent"),
+        "disk": max(fills) if fills else None,
+        "cpu": sections.get("cpu", {}).get("percent"),
+    }
+
+
+METRIC_TITLES = {
+    "ram": "Загрузка RAM, %",
+    "disk": "Заполнение диска, %",
+    "cpu": "Загрузка CPU, %",
+}
+
+
+class FleetSummary:
+    def __init__(self):
+        self.values: Dict[str, List[float]] = {name: [] for name in METRIC_TITLES}
+        self.failed: List[HostResult] = []
+        self.total = 0
+
+    def add(self, result: HostResult):
+        self.total += 1
+        if not result.ok:
+            self.failed.append(result)
+            return
+        for name, value in extract_metrics(result.report).items():
+            if value is not None:
+                self.values[name].append(value)
+
+    def print_table(self, stream=None):
+        stream = stream or sys.stdout
+        stream.write("\n" + "=" * 60 + "\n")
+        stream.write(f"{' СВОДКА ПО ХОСТАМ ':=^60}\n")
+        stream.write("=" * 60 + "\n")
+        stream.write(f"  Хостов: {self.total}, успешно: {self.total - len(self.failed)}, ошибок: {len(self.failed)}\n\n")
+        stream.write(f"  {'Метрика':<24}{'Мин':>10}{'Медиана':>12}{'Макс':>10}\n")
+        for name, title in METRIC_TITLES.items():
+            values = self.values[name]
+            if values:
+                stream.write(f"  {title:<24}{min(values):>10.1f}{statistics.median(values):>12.1f}{max(values):>10.1f}\n")
+            else:
+                stream.write(f"  {title:<24}{'-':>10}{'-':>12}{'-':>10}\n")
+
+        if self.failed:
+            stream.write("\n  [ОШИБКИ]\n")
+            for result in sorted(self.failed, key=lambda item: item.host):
+                stream.write(f"    • {result.host}: {result.error}\n")
+
+
+def format_result(result: HostResult) -> str:
+    if not result.ok:
+        return f"  [ОШИБКА] {result.host}: {result.error} ({result.elapsed:.1f} с)"
+    metrics = extract_metrics(result.report)
+    parts = [
+        f"{label} {metrics[name]:.1f}%" if metrics[name] is not None else f"{label} -"
+        for name, label in (("cpu", "CPU"), ("ram", "RAM"), ("disk", "DISK"))
+    ]
+    return f"  [OK] {result.host}: {' '.join(parts)} ({result.elapsed:.1f} с)"
+
+
+def print_help():
+    print("""
+
+ИСПОЛЬЗОВАНИЕ:
+  python fleet.py ИНВЕНТАРЬ [ПАРАМЕТРЫ]
+
+ИНВЕНТАРЬ - файл со списком хостов, по одному на строку (# - комментарий)
+
+ПАРАМЕТРЫ:
+  -h, --help            Показать эту справку
+  -j N, --jobs N        Число одновременно опрашиваемых хостов (по умолчанию: 16)
+  -t СЕК, --timeout СЕК Тайм-аут опроса одного хоста (по умолчанию: 30)
+  --transport ИМЯ       Транспорт: local, ssh (по умолчанию: ssh)
+  --remote-cmd КОМАНДА  Команда сборщика на удаленном хосте
+                        (по умолчанию: python3 main.py -f json --cpu-window 0.5)
+  -v, --verbose         Собирать полный отчет
+  -o ФАЙЛ, --output ФАЙЛ
+                        Сохранить отчеты всех хостов в файл NDJSON
+
+ПРИМЕРЫ:
+  python fleet.py hosts.txt                          # Опрос по ssh
+  python fleet.py hosts.txt --transport local -j 4   # Локальный прогон для проверки
+    """)
+    sys.exit(0)
+
+
+def main():
+    inventory = None
+    concurrency = 16
+    timeout = 30.0
+    transport_name = "ssh"
+    remote_command = DEFAULT_REMOTE_COMMAND
+    verbose = False
+    output_file = None
+
+    args = sys.argv[1:]
+
+    i = 0
+    while i < len(args):
+        arg = args[i]
+
+        try:
+            if arg in ('-h', '--help'):
+                print_help()
+            elif arg in ('-j', '--jobs'):
+                concurrency = max(1, int(args[i + 1]))
+                i += 1
+            elif arg in ('-t', '--timeout'):
+                timeout = float(args[i + 1])
+                i += 1
+            elif arg == '--transport':
+                transport_name = args[i + 1]
+                i += 1
+                if transport_name not in TRANSPORTS:
+                    print(f"Ошибка: неизвестный транспорт {transport_name}, доступны: {', '.join(TRANSPORTS)}")
+                    sys.exit(1)
+            elif arg == '--remote-cmd':
+                remote_command = args[i + 1]
+                i += 1
+            elif arg in ('-v', '--verbose'):
+                verbose = True
+            elif arg in ('-o', '--output'):
+                output_file = args[i + 1]
+                i += 1
+            elif inventory is None and not arg.startswith('-'):
+                inventory = arg
+            else:
+                print(f"Неизвестный параметр: {arg}")
+                print_help()
+        except (IndexError, ValueError):
+            print(f"Ошибка: неверное значение параметра {arg}")
+            sys.exit(1)
+
+        i += 1
+
+    if inventory is None:
+        print("Ошибка: необходимо указать файл инвентаря")
+        sys.exit(1)
+
+    try:
+        hosts = read_inventory(inventory)
+    except OSError as e:
+        print(f"Ошибка чтения инвентаря: {str(e)}")
+        sys.exit(1)
+
+    if transport_name == "local":
+        transport = LocalTransport(["-v"] if verbose else [])
+    else:
+        transport = SSHTransport(remote_command + (" -v" if verbose else ""))
+
+    summary = FleetSummary()
+    output = open(output_file, 'w', encoding='utf-8') if output_file else None
+
+    def on_result(result: HostResult):
+        summary.add(result)
+        print(format_result(result), flush=True)
+        if output is not None:
+            output.write(json.dumps(result._asdict(), ensure_ascii=False) + "\n")
+
+    print(f"Опрос {len(hosts)} хостов (одновременно: {concurrency}, тайм-аут: {timeout:g} с)")
+    try:
+        asyncio.run(collect_fleet(hosts, transport, concurrency, timeout, on_result))
+    except KeyboardInterrupt:
+        print("\n\nОперация прервана пользователем")
+    finally:
+        if output is not None:
+            output.close()
+
+    summary.print_table()
+    sys.exit(1 if summary.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
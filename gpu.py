@@ -0,0 +1,147 @@
+import abc
+import threading
+from typing import Callable, List, NamedTuple, Optional
+
+
+class GpuReading(NamedTuple):
+    index: int
+    name: str
+    memory_total: Optional[int] = None
+    memory_used: Optional[int] = None
+    load: Optional[float] = None
+    temperature: Optional[float] = None
+    power: Optional[float] = None
+    power_limit: Optional[float] = None
+    clock_graphics: Optional[int] = None
+    clock_memory: Optional[int] = None
+    driver: Optional[str] = None
+
+
+class GpuBackend(abc.ABC):
+    name = "none"
+
+    @abc.abstractmethod
+    def read(self) -> List[GpuReading]:
+        ...
+
+    def loads(self) -> List[float]:
+        return [reading.load for reading in self.read() if reading.load is not None]
+
+    def close(self):
+        pass
+
+
+class NvmlBackend(GpuBackend):
+    # NVML инициализируется один раз, дескрипторы устройств и статические поля
+    # запоминаются: каждый такт - только чтения из драйвера, без запуска nvidia-smi
+    name = "nvml"
+
+    def __init__(self, nvml=None):
+        if nvml is None:
+            import pynvml as nvml
+        self.nvml = nvml
+        self._lock = threading.Lock()
+        nvml.nvmlInit()
+        try:
+            self.driver = self._text(nvml.nvmlSystemGetDriverVersion())
+            self.handles = [nvml.nvmlDeviceGetHandleByIndex(index) for index in range(nvml.nvmlDeviceGetCount())]
+            self.names = [self._text(nvml.nvmlDeviceGetName(handle)) for handle in self.handles]
+            self.power_limits = [self._call(nvml.nvmlDeviceGetEnforcedPowerLimit, handle) for handle in self.handles]
+        except Exception:
+            nvml.nvmlShutdown()
+            raise
+        self._closed = False
+
+    @staticmethod
+    def _text(value) -> str:
+        # старые pynvml возвращают bytes
+        return value.decode('utf-8', 'replace') if isinstance(value, bytes) else value
+
+    def _call(self, func, *args):
+        # часть полей не поддерживается на конкретной модели (NVML_ERROR_NOT_SUPPORTED)
+        try:
+            return func(*args)
+        except self.nvml.NVMLError:
+            return None
+
+    def read(self) -> List[GpuReading]:
+        nvml = self.nvml
+        readings = []
+        with self._lock:
+            if self._closed:
+                return readings
+            for index, handle in enumerate(self.handles):
+                memory = self._call(nvml.nvmlDeviceGetMemoryInfo, handle)
+                utilization = self._call(nvml.nvmlDeviceGetUtilizationRates, handle)
+                power = self._call(nvml.nvmlDeviceGetPowerUsage, handle)
+                power_limit = self.power_limits[index]
+                readings.append(GpuReading(
+                    index=index,
+                    name=self.names[index],
+                    memory_total=memory.total if memory is not None else None,
+                    memory_used=memory.used if memory is not None else None,
+                    load=float(utilization.gpu) if utilization is not None else None,
+                    temperature=self._call(nvml.nvmlDeviceGetTemperature, handle, nvml.NVML_TEMPERATURE_GPU),
+                    # NVML отдает мощность в милливаттах
+                    power=power / 1000 if power is not None else None,
+                    power_limit=power_limit / 1000 if power_limit is not None else None,
+                    clock_graphics=self._call(nvml.nvmlDeviceGetClockInfo, handle, nvml.NVML_CLOCK_GRAPHICS),
+                    clock_memory=self._call(nvml.nvmlDeviceGetClockInfo, handle, nvml.NVML_CLOCK_MEM),
+                    driver=self.driver,
+                ))
+        return readings
+
+    def loads(self) -> List[float]:
+        nvml = self.nvml
+        with self._lock:
+            if self._closed:
+                return []
+            rates = [self._call(nvml.nvmlDeviceGetUtilizationRates, handle) for handle in self.handles]
+        return [float(rate.gpu) for rate in rates if rate is not None]
+
+    def close(self):
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self.nvml.nvmlShutdown()
+
+
+class GPUtilBackend(GpuBackend):
+    # каждый вызов getGPUs запускает nvidia-smi: 100-300 мс, поэтому только запасной вариант
+    name = "gputil"
+
+    def __init__(self, gputil=None):
+        if gputil is None:
+            import GPUtil as gputil
+        self.gputil = gputil
+
+    def read(self) -> List[GpuReading]:
+        return [
+            GpuReading(
+                index=index,
+                name=gpu.name,
+                memory_total=int(gpu.memoryTotal * 1024 * 1024),
+                memory_used=int(gpu.memoryUsed * 1024 * 1024),
+                load=gpu.load * 100,
+                temperature=gpu.temperature,
+                driver=getattr(gpu, 'driver', None),
+            )
+            for index, gpu in enumerate(self.gputil.getGPUs())
+        ]
+
+
+def open_backend(nvml=None, gputil=None,
+                 on_error: Optional[Callable[[BaseException], None]] = None) -> Optional[GpuBackend]:
+    # сначала NVML, при его отсутствии (нет pynvml или драйвера) - GPUtil;
+    # отсутствие pynvml - обычная ситуация, прочие ошибки NVML отдаются в on_error
+    try:
+        return NvmlBackend(nvml)
+    except ImportError:
+        pass
+    except Exception as e:
+        if on_error is not None:
+            on_error(e)
+    try:
+        return GPUtilBackend(gputil)
+    except ImportError:
+        return None
@@ -0,0 +1,228 @@
+import mmap
+import os
+import struct
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+
+# одна запись фиксированной ширины на такт: время + метрики
+RECORD = struct.Struct('<dffffff')
+FIELDS = ('timestamp', 'cpu', 'ram', 'swap', 'disk', 'net_rx', 'net_tx')
+
+MAGIC = b'SICHIST1'
+VERSION = 1
+HEADER = struct.Struct('<8sII')
+TIER_HEADER = struct.Struct('<IIQQ')
+HEADER_SIZE = 128
+
+
+class Tier(NamedTuple):
+    name: str
+    step: int
+    capacity: int
+
+
+# 1 с - сутки, 1 мин - неделя, 1 ч - год: файл ~3.3 МБ и больше не растет
+DEFAULT_TIERS = (
+    Tier('1s', 1, 86400),
+    Tier('1m', 60, 7 * 24 * 60),
+    Tier('1h', 3600, 365 * 24),
+)
+
+
+class Accumulator:
+    def __init__(self):
+        self.start = None
+        self.count = 0
+        self.sums = [0.0] * (len(FIELDS) - 1)
+
+    def add(self, values: Tuple[float, ...]):
+        self.count += 1
+        for i, value in enumerate(values):
+            self.sums[i] += value
+
+    def average(self) -> Tuple[float, ...]:
+        return (float(self.start),) + tuple(value / self.count for value in self.sums)
+
+
+class HistoryStore:
+    def __init__(self, path: str, tiers: Tuple[Tier, ...] = DEFAULT_TIERS):
+        self.path = path
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = open(path, 'r+b' if exists else 'w+b')
+        try:
+            if exists:
+                self.tiers = self._read_tiers()
+            else:
+                self.tiers = tiers
+                self._file.truncate(self._file_size())
+            self.mm = mmap.mmap(self._file.fileno(), self._file_size())
+        except Exception:
+            self._file.close()
+            raise
+
+        if not exists:
+            HEADER.pack_into(self.mm, 0, MAGIC, VERSION, len(self.tiers))
+            for index, tier in enumerate(self.tiers):
+                TIER_HEADER.pack_into(self.mm, self._tier_header_offset(index), tier.step, tier.capacity, 0, 0)
+
+        self._offsets = []
+        offset = HEADER_SIZE
+        for tier in self.tiers:
+            self._offsets.append(offset)
+            offset += tier.capacity * RECORD.size
+
+        self._accumulators = [Accumulator() for _ in self.tiers]
+        self._restore_accumulators()
+
+    def _file_size(self) -> int:
+        return HEADER_SIZE + sum(tier.capacity for tier in self.tiers) * RECORD.size
+
+    def _tier_header_offset(self, index: int) -> int:
+        return HEADER.size + index * TIER_HEADER.size
+
+    def _read_tiers(self) -> Tuple[Tier, ...]:
+        header = self._file.read(HEADER_SIZE)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{self.path}: файл истории поврежден")
+        magic, version, tier_count = HEADER.unpack_from(header, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path}: не является файлом истории")
+
+        tiers = []
+        for index in range(tier_count):
+            step, capacity, _, _ = TIER_HEADER.unpack_from(header, self._tier_header_offset(index))
+            name = DEFAULT_TIERS[index].name if index < len(DEFAULT_TIERS) else f"{step}s"
+            tiers.append(Tier(name, step, capacity))
+        return tuple(tiers)
+
+    def _state(self, index: int) -> Tuple[int, int]:
+        _, _, head, count = TIER_HEADER.unpack_from(self.mm, self._tier_header_offset(index))
+        return head, count
+
+    def _position(self, index: int, logical: int) -> int:
+        # logical 0 - самая старая запись кольца
+        head, count = self._state(index)
+        capacity = self.tiers[index].capacity
+        return self._offsets[index] + ((head - count + logical) % capacity) * RECORD.size
+
+    def _write(self, index: int, values: Tuple[float, ...]):
+        tier = self.tiers[index]
+        head, count = self._state(index)
+        RECORD.pack_into(self.mm, self._offsets[index] + head * RECORD.size, *values)
+        TIER_HEADER.pack_into(self.mm, self._tier_header_offset(index), tier.step, tier.capacity,
+                              (head + 1) % tier.capacity, min(count + 1, tier.capacity))
+
+    def _timestamp(self, index: int, logical: int) -> float:
+        return struct.unpack_from('<d', self.mm, self._position(index, logical))[0]
+
+    def append(self, values: Tuple[float, ...]):
+        # раз в минуту/час среднее за закрытый интервал уходит в следующий уровень
+        timestamp = values[0]
+        for index in range(1, len(self.tiers)):
+            accumulator = self._accumulators[index]
+            start = int(timestamp) - int(timestamp) % self.tiers[index].step
+            if accumulator.start != start:
+                if accumulator.count:
+                    self._write(index, accumulator.average())
+                self._accumulators[index] = accumulator = Accumulator()
+                accumulator.start = start
+            accumulator.add(values[1:])
+
+        self._write(0, values)
+
+    def append_sample(self, sample: Dict[str, object]):
+        disks = sample.get('disks') or {}
+        self.append((
+            sample['timestamp'],
+            sample['cpu_percent'],
+            sample['ram_percent'],
+            sample['swap_percent'],
+            max(disks.values()) if disks else 0.0,
+            sample['net_rx_rate'],
+            sample['net_tx_rate'],
+        ))
+
+    def _restore_accumulators(self):
+        # после перезапуска незакрытые минута и час восстанавливаются из уровня 1 с,
+        # иначе их начало потерялось бы
+        _, count = self._state(0)
+        if not count:
+            return
+        last = self._timestamp(0, count - 1)
+        for index in range(1, len(self.tiers)):
+            step = self.tiers[index].step
+            start = int(last) - int(last) % step
+            accumulator = Accumulator()
+            accumulator.start = start
+            for record in self.records('1s', start=start):
+                accumulator.add(record[1:])
+            self._accumulators[index] = accumulator
+
+    def tier_index(self, name: str) -> int:
+        for index, tier in enumerate(self.tiers):
+            if tier.name == name:
+                return index
+        raise KeyError(name)
+
+    def _bisect(self, index: int, count: int, timestamp: float) -> int:
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if self._timestamp(index, middle) < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def slices(self, tier: str = '1s', start: Optional[float] = None,
+               end: Optional[float] = None) -> List[memoryview]:
+        # возвращает срезы mmap без копирования: один или два, если диапазон переходит через конец кольца
+        index = self.tier_index(tier)
+        head, count = self._state(index)
+        first = self._bisect(index, count, start) if start is not None else 0
+        last = self._bisect(index, count, end) if end is not None else count
+        if first >= last:
+            return []
+
+        capacity = self.tiers[index].capacity
+        base = self._offsets[index]
+        physical_first = (head - count + first) % capacity
+        length = last - first
+        view = memoryview(self.mm)
+        if physical_first + length <= capacity:
+            return [view[base + physical_first * RECORD.size:base + (physical_first + length) * RECORD.size]]
+        tail = capacity - physical_first
+        return [
+            view[base + physical_first * RECORD.size:base + capacity * RECORD.size],
+            view[base:base + (length - tail) * RECORD.size],
+        ]
+
+    def records(self, tier: str = '1s', start: Optional[float] = None,
+                end: Optional[float] = None) -> Iterator[Tuple[float, ...]]:
+        views = self.slices(tier, start, end)
+        try:
+            for view in views:
+                yield from RECORD.iter_unpack(view)
+        finally:
+            for view in views:
+                view.release()
+
+    def flush(self):
+        self.mm.flush()
+
+    def close(self):
+        self.mm.flush()
+        self.mm.close()
+        self._file.close()
+
+
+def format_record(record: Tuple[float, ...], format_size) -> str:
+    timestamp, cpu, ram, swap, disk, net_rx, net_tx = record
+    return (f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))} | CPU {cpu:5.1f}% | "
+            f"RAM {ram:5.1f}% | SWAP {swap:5.1f}% | DISK {disk:5.1f}% | "
+            f"NET rx {format_size(net_rx)}/s tx {format_size(net_tx)}/s")
+
+
+def record_to_dict(record: Tuple[float, ...]) -> Dict[str, float]:
+    return dict(zip(FIELDS, record))
@@ -1,209 +1,1470 @@
 import psutil
 import platform
-import cpuinfo
-import GPUtil
-import subprocess
-import socket
 import os
 import sys
-import argparse
+import json
+import re
+import fnmatch
+import heapq
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Dict, List, NamedTuple, Optional
 
 
-class SystemInfoCollector:
-    def __init__(self, verbose: bool = False):
-        self.verbose = verbose
-        self.output_lines = []
+class Probe(NamedTuple):
+    key: str
+    title: str
+    func: Callable[[], None]
+    timeout: Optional[float] = None
+
+
+@dataclass
+class ReportSection:
+    key: str
+    title: str
+    data: Dict[str, object] = field(default_factory=dict)
+    lines: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ProbeProfile:
+    key: str
+    status: str = 'ok'
+    wall: float = 0.0
+    cpu: float = 0.0
+    subprocesses: int = 0
+    errors: List[str] = field(default_factory=list)
+    steps: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'key': self.key,
+            'status': self.status,
+            'wall': self.wall,
+            'cpu': self.cpu,
+            'subprocesses': self.subprocesses,
+            'errors': self.errors,
+            'steps': self.steps,
+        }
+
+
+# профиль пробы, которая выполняется в текущем потоке; модульный, а не поле сборщика,
+# потому что ошибки и запуски процессов случаются и в свободных функциях
+_profile_context = threading.local()
+SUBPROCESS_AUDIT_EVENTS = frozenset(('subprocess.Popen', 'os.system', 'os.startfile'))
+_audit_installed = False
+
+
+def current_profile() -> Optional[ProbeProfile]:
+    return getattr(_profile_context, 'profile', None)
+
+
+def note_exception(exc: BaseException):
+    # для исключений, которые проба глушит, чтобы они были видны хотя бы в профиле
+    profile = current_profile()
+    if profile is not None:
+        profile.errors.append(f"{type(exc).__name__}: {exc}")
+
+
+class profile_step:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        profile = current_profile()
+        if profile is not None:
+            profile.steps[self.name] = profile.steps.get(self.name, 0.0) + time.perf_counter() - self.started
+        return False
+
+
+def _audit_subprocess(event: str, args):
+    if event in SUBPROCESS_AUDIT_EVENTS:
+        profile = current_profile()
+        if profile is not None:
+            profile.subprocesses += 1
+
+
+def enable_subprocess_accounting():
+    # audit-хук нельзя снять, поэтому ставится только при профилировании
+    global _audit_installed
+    if not _audit_installed:
+        sys.addaudithook(_audit_subprocess)
+        _audit_installed = True
+
+
+@dataclass
+class Report:
+    mode: str
+    title: str
+    timestamp: float
+    sections: List[ReportSection] = field(default_factory=list)
+    profile: List[ProbeProfile] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'mode': self.mode,
+            'timestamp': self.timestamp,
+            'sections': {section.key: section.data for section in self.sections},
+        }
+
+
+def render_text(report: Report, stream):
+    stream.write("\n" + "="*60 + "\n")
+    stream.write(f"{report.title:=^60}\n")
+    stream.write(f"  Дата и время: {datetime.fromtimestamp(report.timestamp).strftime('%Y-%m-%d %H:%M:%S')}\n")
+    stream.write("="*60 + "\n")
+    
+    for section in report.sections:
+        for line in section.lines:
+            stream.write(line + "\n")
+    
+    stream.write("\n" + "="*60 + "\n")
+    stream.write(f"{' КОНЕЦ ОТЧЕТА ':=^60}\n")
+    stream.write("="*60 + "\n")
+
+
+def render_json(report: Report, stream):
+    json.dump(report.to_dict(), stream, ensure_ascii=False, indent=2, default=str)
+    stream.write("\n")
+
+
+def render_ndjson(report: Report, stream):
+    stream.write(json.dumps(report.to_dict(), ensure_ascii=False, default=str) + "\n")
+
+
+RENDERERS = {
+    'text': render_text,
+    'json': render_json,
+    'ndjson': render_ndjson,
+}
+
+
+def render_profile(report: Report, stream, total_wall: float, total_cpu: float):
+    stream.write("\n" + "="*72 + "\n")
+    stream.write(f"{' ПРОФИЛЬ СБОРА ':=^72}\n")
+    stream.write("="*72 + "\n")
+    stream.write(f"  {'Проба':<22}{'Время, мс':>11}{'CPU, мс':>10}{'Процессов':>11}{'Ошибок':>8}  Статус\n")
+    for profile in sorted(report.profile, key=lambda item: item.wall, reverse=True):
+        stream.write(f"  {profile.key:<22}{profile.wall * 1000:>11.1f}{profile.cpu * 1000:>10.1f}"
+                     f"{profile.subprocesses:>11}{len(profile.errors):>8}  {profile.status}\n")
+        for name, elapsed in sorted(profile.steps.items(), key=lambda item: item[1], reverse=True):
+            stream.write(f"    {name:<20}{elapsed * 1000:>11.1f}\n")
+        for error in profile.errors:
+            stream.write(f"    ! {error}\n")
+    stream.write(f"\n  Всего: {total_wall * 1000:.1f} мс, CPU процесса: {total_cpu * 1000:.1f} мс\n")
+
+
+def save_profile(report: Report, path: str, total_wall: float, total_cpu: float):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'mode': report.mode,
+            'timestamp': report.timestamp,
+            'wall': total_wall,
+            'cpu': total_cpu,
+            'probes': [
+                profile.to_dict()
+                for profile in sorted(report.profile, key=lambda item: item.wall, reverse=True)
+            ],
+        }, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def disk_io_stats(before, after, elapsed: float) -> Optional[Dict[str, float]]:
+    if before is None or after is None or elapsed <= 0:
+        return None
+    stats = counter_rates(before, after, elapsed, DISK_IO_RATE_FIELDS)
+    ops = max(0, after.read_count - before.read_count) + max(0, after.write_count - before.write_count)
+    io_time = max(0, after.read_time - before.read_time) + max(0, after.write_time - before.write_time)
+    stats['iops'] = stats['read_count'] + stats['write_count']
+    stats['await'] = io_time / ops if ops else 0.0
+    # busy_time есть только на Linux и BSD
+    if hasattr(after, 'busy_time'):
+        stats['busy_percent'] = min(100.0, max(0, after.busy_time - before.busy_time) / (elapsed * 1000) * 100)
+    else:
+        stats['busy_percent'] = None
+    return stats
+
+
+def io_device_name(device: str) -> str:
+    # /dev/sda1 -> sda1, /dev/mapper/root -> dm-0: так устройства называет disk_io_counters
+    try:
+        device = os.path.realpath(device)
+    except OSError:
+        pass
+    return os.path.basename(device)
+
+
+class CpuUsage(NamedTuple):
+    percent: float
+    per_cpu: List[float]
+    times: Dict[str, float]
+
+
+class CpuSampler:
+    # guest-время уже учтено в user/nice, поэтому в сумму его не включаем
+    EXCLUDED_FIELDS = ('guest', 'guest_nice')
+    IDLE_FIELDS = ('idle', 'iowait')
+    
+    def __init__(self, window: float = 0.05):
+        self.window = window
+        self._lock = threading.Lock()
+        self.prime()
+    
+    def prime(self):
+        with self._lock:
+            self._started = time.monotonic()
+            self._total = psutil.cpu_times()
+            self._per_cpu = psutil.cpu_times(percpu=True)
+    
+    def _delta(self, before, after) -> Dict[str, float]:
+        return {
+            field: max(0.0, getattr(after, field) - getattr(before, field))
+            for field in after._fields
+            if field not in self.EXCLUDED_FIELDS
+        }
+    
+    def _busy_percent(self, delta: Dict[str, float]) -> float:
+        total = sum(delta.values())
+        if total <= 0:
+            return 0.0
+        idle = sum(delta.get(field, 0.0) for field in self.IDLE_FIELDS)
+        return min(100.0, max(0.0, (total - idle) / total * 100))
+    
+    def sample(self, reset: bool = False) -> CpuUsage:
+        # ждем только остаток окна: остальные пробы к этому моменту уже отработали
+        remaining = self._started + self.window - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
         
-    def print_and_capture(self, text: str):
-        print(text)
-        self.output_lines.append(text)
+        total = psutil.cpu_times()
+        per_cpu = psutil.cpu_times(percpu=True)
+        
+        with self._lock:
+            delta = self._delta(self._total, total)
+            delta_sum = sum(delta.values())
+            times = {
+                field: (value / delta_sum * 100 if delta_sum > 0 else 0.0)
+                for field, value in delta.items()
+            }
+            usage = CpuUsage(
+                percent=self._busy_percent(delta),
+                per_cpu=[
+                    self._busy_percent(self._delta(before, after))
+                    for before, after in zip(self._per_cpu, per_cpu)
+                ],
+                times=times,
+            )
+            if reset:
+                self._started = time.monotonic()
+                self._total = total
+                self._per_cpu = per_cpu
+        
+        return usage
+
+
+class CounterSampler:
+    # как и CpuSampler: первый снимок счетчиков при создании, второй - когда секция
+    # до него дошла, так что окно измерения перекрывается с остальными пробами
+    def __init__(self, read: Callable[[], Dict[str, object]], window: float = 0.05):
+        self.read = read
+        self.window = window
+        self._lock = threading.Lock()
+        self.prime()
     
-    def format_size(self, bytes_size: float) -> str:
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if bytes_size < 1024:
-                return f"{bytes_size:.2f} {unit}"
-            bytes_size /= 1024
-        return f"{bytes_size:.2f} PB"
+    def _read(self) -> Dict[str, object]:
+        try:
+            return self.read() or {}
+        except Exception as e:
+            note_exception(e)
+            return {}
     
-    def get_system_model(self) -> str:
+    def prime(self):
+        counters = self._read()
+        with self._lock:
+            self._started = time.monotonic()
+            self._counters = counters
+    
+    def sample(self, reset: bool = False):
+        remaining = self._started + self.window - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+        
+        counters = self._read()
+        now = time.monotonic()
+        with self._lock:
+            before = self._counters
+            elapsed = now - self._started
+            if reset:
+                self._started = now
+                self._counters = counters
+        
+        return before, counters, elapsed
+
+
+def counter_rates(before, after, elapsed: float, fields) -> Dict[str, float]:
+    if before is None or after is None or elapsed <= 0:
+        return {name: 0.0 for name in fields}
+    # счетчики могут сброситься (переподключение интерфейса), отрицательные дельты отбрасываем
+    return {
+        name: max(0.0, getattr(after, name) - getattr(before, name)) / elapsed
+        for name in fields
+    }
+
+
+def read_text_file(path: str, limit: int = 1 << 20) -> Optional[str]:
+    # один небуферизованный read() вместо построчного чтения: для sysfs/procfs это один системный вызов
+    try:
+        with open(path, 'rb', buffering=0) as f:
+            return f.read(limit).decode('utf-8', 'replace')
+    except OSError:
+        return None
+
+
+def parse_cpuinfo(content: str) -> Dict[str, str]:
+    # берем поля только первого процессора, повторяющиеся блоки остальных ядер не нужны
+    fields = {}
+    for line in content.splitlines():
+        if not line.strip():
+            if fields:
+                break
+            continue
+        key, sep, value = line.partition(':')
+        if sep:
+            fields.setdefault(key.strip(), value.strip())
+    
+    # на ARM модель платы указана в конце файла, после блоков процессоров
+    for key in ('Hardware', 'Model'):
+        if key not in fields:
+            marker = f"\n{key}"
+            position = content.find(marker)
+            if position != -1:
+                line = content[position + 1:].split('\n', 1)[0]
+                fields[key] = line.partition(':')[2].strip()
+    return fields
+
+
+def race_commands(commands: List[tuple], timeout: float = 10.0) -> Optional[str]:
+    # все медленные источники запускаются одновременно, побеждает первый давший ответ,
+    # остальные процессы завершаются
+    import queue
+    import subprocess
+    
+    results = queue.Queue()
+    processes = []
+    lock = threading.Lock()
+    profile = current_profile()
+    
+    def run(args, parse):
+        _profile_context.profile = profile
+        try:
+            process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                       stdin=subprocess.DEVNULL, encoding="utf-8", errors="replace")
+        except OSError:
+            results.put(None)
+            return
+        with lock:
+            processes.append(process)
         try:
-            system = platform.system()
+            output, _ = process.communicate()
+            value = parse(output) if process.returncode == 0 else None
+        except Exception as e:
+            note_exception(e)
+            value = None
+        results.put(value)
+    
+    for args, parse in commands:
+        threading.Thread(target=run, args=(args, parse), name="model-probe", daemon=True).start()
+    
+    deadline = time.monotonic() + timeout
+    try:
+        for _ in commands:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                value = results.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if value:
+                return value
+        return None
+    finally:
+        with lock:
+            for process in processes:
+                if process.poll() is None:
+                    process.kill()
+
+
+def parse_wmic_name(output: str) -> Optional[str]:
+    lines = [line.strip() for line in output.splitlines() if line.strip()]
+    if len(lines) > 1 and lines[1].lower() != "name":
+        return lines[1]
+    return None
+
+
+def parse_systeminfo_model(output: str) -> Optional[str]:
+    for line in output.splitlines():
+        if line.startswith(("System Model", "Модель системы")):
+            return line.split(":", 1)[1].strip() or None
+    return None
+
+
+def probe_system_model_linux() -> Optional[str]:
+    for path in (os.path.join(SYSFS_ROOT, 'class', 'dmi', 'id', 'product_name'),
+                 os.path.join(PROCFS_ROOT, 'device-tree', 'model')):
+        model = read_text_file(path, 4096)
+        if model and (model := model.strip('\x00 \n')):
+            return model
+    
+    content = read_text_file(os.path.join(PROCFS_ROOT, 'cpuinfo'))
+    if content:
+        fields = parse_cpuinfo(content)
+        for key in ('Model', 'Hardware', 'model name'):
+            if fields.get(key):
+                return fields[key]
+    return None
+
+
+def probe_system_model_windows() -> Optional[str]:
+    try:
+        import winreg
+        key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"HARDWARE\DESCRIPTION\System\BIOS")
+        try:
+            model = winreg.QueryValueEx(key, "SystemProductName")[0]
+        finally:
+            winreg.CloseKey(key)
+        if model:
+            return model.strip()
+    except Exception as e:
+        note_exception(e)
+    
+    # systeminfo работает несколько секунд, поэтому запускается параллельно с wmic, а не после него
+    return race_commands([
+        (["wmic", "csproduct", "get", "name"], parse_wmic_name),
+        (["systeminfo"], parse_systeminfo_model),
+    ])
+
+
+def probe_system_model_darwin() -> Optional[str]:
+    return race_commands([(["sysctl", "-n", "hw.model"], lambda output: output.strip() or None)])
+
+
+SYSTEM_MODEL_PROBES = {
+    "Linux": probe_system_model_linux,
+    "Windows": probe_system_model_windows,
+    "Darwin": probe_system_model_darwin,
+}
+
+
+class ProcessSampler:
+    # psutil.process_iter сам кэширует объекты Process между вызовами, поэтому
+    # cpu_percent на втором проходе - дельта с прошлого прохода, без sleep на каждый процесс
+    def __init__(self, window: float = 0.5):
+        self.window = window
+        self._lock = threading.Lock()
+        self._sampled_at = None
+        self._io: Dict[int, int] = {}
+        self.attrs = ['pid', 'name', 'cpu_percent', 'memory_info', 'io_counters',
+                      'num_handles' if platform.system() == "Windows" else 'num_fds']
+    
+    def _io_pass(self, attrs: List[str]):
+        io_now = {}
+        for proc in psutil.process_iter(attrs, ad_value=None):
+            io = proc.info.get('io_counters')
+            if io is not None:
+                io_now[proc.info['pid']] = io.read_bytes + io.write_bytes
+            yield proc.info, io_now
+    
+    def prime(self):
+        with self._lock:
+            io_now = {}
+            for _, io_now in self._io_pass(['pid', 'cpu_percent', 'io_counters']):
+                pass
+            self._io = io_now
+            self._sampled_at = time.monotonic()
+    
+    def sample(self) -> List[Dict[str, object]]:
+        if self._sampled_at is None:
+            self.prime()
+        
+        with self._lock:
+            remaining = self._sampled_at + self.window - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+            now = time.monotonic()
+            elapsed = now - self._sampled_at
+            fd_attr = self.attrs[-1]
             
-            if system == "Windows":
-                # через wmic
+            rows = []
+            io_now = {}
+            for info, io_now in self._io_pass(self.attrs):
+                pid = info['pid']
+                io_rate = None
+                if pid in io_now and pid in self._io and elapsed > 0:
+                    io_rate = max(0, io_now[pid] - self._io[pid]) / elapsed
+                memory = info.get('memory_info')
+                rows.append({
+                    'pid': pid,
+                    'name': info.get('name') or '?',
+                    'cpu_percent': info.get('cpu_percent') or 0.0,
+                    'rss': memory.rss if memory is not None else 0,
+                    'io_rate': io_rate,
+                    'fds': info.get(fd_attr),
+                })
+            
+            self._io = io_now
+            self._sampled_at = now
+            return rows
+
+
+def top_processes(rows: List[Dict[str, object]], key: str, count: int) -> List[Dict[str, object]]:
+    # nlargest - O(n log N), полная сортировка 20k+ процессов не нужна
+    return heapq.nlargest(count, (row for row in rows if row[key]), key=lambda row: row[key])
+
+
+def get_cache_dir() -> str:
+    if platform.system() == "Windows":
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'system-info-collector')
+
+
+def get_machine_id() -> str:
+    for path in ('/etc/machine-id', '/var/lib/dbus/machine-id'):
+        try:
+            with open(path, 'r') as f:
+                machine_id = f.read().strip()
+                if machine_id:
+                    return machine_id
+        except OSError:
+            pass
+    
+    if platform.system() == "Windows":
+        try:
+            import winreg
+            key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Cryptography")
+            machine_id = winreg.QueryValueEx(key, "MachineGuid")[0]
+            winreg.CloseKey(key)
+            return machine_id
+        except Exception as e:
+            note_exception(e)
+    
+    return platform.node()
+
+
+class StaticInfoCache:
+    # статические характеристики не меняются до перезагрузки, поэтому ключ - время загрузки + ID машины
+    VERSION = 1
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(get_cache_dir(), 'static.json')
+        self.key = f"{get_machine_id()}:{int(psutil.boot_time())}"
+        self.data: Dict[str, object] = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        self.load()
+    
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                content = json.load(f)
+            if content.get('version') == self.VERSION and content.get('key') == self.key:
+                self.data = content.get('data', {})
+        except (OSError, ValueError, AttributeError):
+            self.data = {}
+    
+    def get(self, name: str, loader: Callable[[], object]):
+        with self._lock:
+            if name in self.data:
+                return self.data[name]
+        
+        value = loader()
+        self.set(name, value)
+        return value
+    
+    def set(self, name: str, value):
+        with self._lock:
+            if self.data.get(name) != value:
+                self.data[name] = value
+                self.dirty = True
+    
+    def discard(self, name: str):
+        with self._lock:
+            if self.data.pop(name, None) is not None:
+                self.dirty = True
+    
+    def save(self) -> bool:
+        with self._lock:
+            if not self.dirty:
+                return True
+            content = {'version': self.VERSION, 'key': self.key, 'data': self.data}
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(content, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+                self.dirty = False
+                return True
+            except OSError:
                 try:
-                    result = subprocess.check_output(
-                        "wmic csproduct get name",
-                        shell=True,
-                        encoding="utf-8",
-                        stderr=subprocess.DEVNULL
-                    ).strip()
-                    lines = result.split('\n')
-                    if len(lines) > 1:
-                        model = lines[1].strip()
-                        if model and model.lower() != "name":
-                            return model
-                except:
+                    os.remove(tmp_path)
+                except OSError:
                     pass
+                return False
+
+
+class DiskUsageResult(NamedTuple):
+    status: str
+    usage: Optional[object] = None
+    latency: float = 0.0
+    error: Optional[str] = None
+
+
+class DiskUsageProber:
+    # statvfs на зависшем NFS/CIFS блокируется навсегда, поэтому рабочие потоки - daemon,
+    # а зависшая точка монтирования не опрашивается повторно, пока прошлый вызов не вернется
+    def __init__(self, timeout: float = 2.0, max_workers: int = 32):
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self._hung = set()
+        self._hung_lock = threading.Lock()
+    
+    def probe(self, mountpoints: List[str]) -> Dict[str, DiskUsageResult]:
+        results: Dict[str, DiskUsageResult] = {}
+        pending = []
+        with self._hung_lock:
+            for mountpoint in dict.fromkeys(mountpoints):
+                if mountpoint in self._hung:
+                    results[mountpoint] = DiskUsageResult('unreachable', latency=self.timeout)
+                else:
+                    pending.append(mountpoint)
+        if not pending:
+            return results
+        
+        expected = len(results) + len(pending)
+        condition = threading.Condition()
+        queue = list(reversed(pending))
+        in_flight: Dict[str, float] = {}
+        
+        def worker():
+            while True:
+                with condition:
+                    if not queue:
+                        return
+                    mountpoint = queue.pop()
+                    started = time.monotonic()
+                    in_flight[mountpoint] = started
                 
-                # через systeminfo
                 try:
-                    result = subprocess.check_output(
-                        "systeminfo | findstr /C:\"System Model\"",
-                        shell=True,
-                        encoding="utf-8",
-                        stderr=subprocess.DEVNULL
-                    ).strip()
-                    if result:
-                        return result.split(":")[1].strip()
-                except:
-                    pass
+                    result = DiskUsageResult('ok', psutil.disk_usage(mountpoint), time.monotonic() - started)
+                except Exception as e:
+                    result = DiskUsageResult('error', latency=time.monotonic() - started, error=str(e))
                 
-                # через реестр
-                try:
-                    result = subprocess.check_output(
-                        "reg query HKEY_LOCAL_MACHINE\\HARDWARE\\DESCRIPTION\\System\\BIOS /v SystemProductName",
-                        shell=True,
-                        encoding="utf-8",
-                        stderr=subprocess.DEVNULL
-                    ).strip()
-                    if result:
-                        lines = result.split('\n')
-                        if len(lines) > 1:
-                            return lines[-1].split("REG_SZ")[-1].strip()
-                except:
-                    pass
-                    
-            elif system == "Linux":
+                with condition:
+                    with self._hung_lock:
+                        self._hung.discard(mountpoint)
+                    if in_flight.pop(mountpoint, None) is None:
+                        # ответ пришел после тайм-аута: на место этого потока уже запущен другой
+                        return
+                    results[mountpoint] = result
+                    condition.notify()
+        
+        def start_worker():
+            threading.Thread(target=worker, name="disk-probe", daemon=True).start()
+        
+        with condition:
+            for _ in range(min(self.max_workers, len(pending))):
+                start_worker()
+            
+            while len(results) < expected:
+                now = time.monotonic()
+                for mountpoint, started in list(in_flight.items()):
+                    if now - started < self.timeout:
+                        continue
+                    del in_flight[mountpoint]
+                    results[mountpoint] = DiskUsageResult('unreachable', latency=now - started)
+                    with self._hung_lock:
+                        self._hung.add(mountpoint)
+                    if queue:
+                        start_worker()
+                
+                deadlines = [started + self.timeout for started in in_flight.values()]
+                condition.wait(max(0.001, min(deadlines) - now) if deadlines else self.timeout)
+        
+        return results
+
+
+DISK_IO_RATE_FIELDS = ('read_bytes', 'write_bytes', 'read_count', 'write_count')
+NET_RATE_FIELDS = ('bytes_recv', 'bytes_sent', 'packets_recv', 'packets_sent',
+                   'errin', 'errout', 'dropin', 'dropout')
+DEFAULT_NET_AGGREGATE = ('veth', 'cali')
+
+
+def is_loopback(name: str, stat=None) -> bool:
+    # флаги интерфейса есть в psutil 5.9.3+ и не на всех платформах, поэтому еще и по имени:
+    # lo/lo0 на Linux/macOS, "Loopback Pseudo-Interface 1" на Windows
+    if 'loopback' in (getattr(stat, 'flags', '') or '').split(','):
+        return True
+    return name in ('lo', 'lo0') or name.startswith('Loopback')
+
+NETWORK_FSTYPES = frozenset({'cifs', 'nfs', 'nfs4', 'smbfs', 'smb3', 'fuse.sshfs'})
+
+
+def read_mount_devices() -> Dict[str, str]:
+    # на Linux номер устройства каждой точки монтирования есть в mountinfo:
+    # одно чтение файла вместо stat() на каждую точку (и без риска зависнуть на NFS)
+    devices = {}
+    try:
+        with open(os.path.join(PROCFS_ROOT, 'self', 'mountinfo'), 'rb') as f:
+            content = f.read().decode('utf-8', 'replace')
+    except OSError:
+        return devices
+    
+    for line in content.splitlines():
+        fields = line.split(' ', 5)
+        if len(fields) < 5:
+            continue
+        mountpoint = fields[4]
+        if '\\' in mountpoint:
+            mountpoint = mountpoint.encode('latin-1', 'backslashreplace').decode('unicode_escape')
+        devices[mountpoint] = fields[2]
+    return devices
+
+
+class MountFilter:
+    DEFAULT_EXCLUDE_FS = frozenset({'tmpfs', 'devtmpfs', 'squashfs', 'overlay', 'efivarfs'})
+    
+    def __init__(self, include_fs: Optional[List[str]] = None, exclude_fs: Optional[List[str]] = None,
+                 include_mounts: Optional[List[str]] = None, exclude_mounts: Optional[List[str]] = None,
+                 exclude_devices: Optional[List[str]] = None, dedupe: bool = True):
+        self.include_fs = frozenset(include_fs) if include_fs else None
+        self.exclude_fs = self.DEFAULT_EXCLUDE_FS if exclude_fs is None else frozenset(exclude_fs)
+        self.include_mounts = self._compile(include_mounts)
+        self.exclude_mounts = self._compile(exclude_mounts)
+        self.exclude_devices = self._compile(exclude_devices)
+        self.dedupe = dedupe
+    
+    @staticmethod
+    def _compile(patterns: Optional[List[str]]):
+        # все шаблоны склеиваются в одно регулярное выражение - одна проверка на раздел
+        if not patterns:
+            return None
+        return re.compile("|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns))
+    
+    def accepts(self, part) -> bool:
+        if self.include_fs is not None and part.fstype not in self.include_fs:
+            return False
+        if part.fstype in self.exclude_fs:
+            return False
+        if self.include_mounts is not None and not self.include_mounts.match(part.mountpoint):
+            return False
+        if self.exclude_mounts is not None and self.exclude_mounts.match(part.mountpoint):
+            return False
+        if self.exclude_devices is not None and self.exclude_devices.match(part.device):
+            return False
+        return True
+    
+    def _get_device_id(self, part, devices: Dict[str, str]) -> Optional[str]:
+        if part.mountpoint in devices:
+            return devices[part.mountpoint]
+        if devices or part.fstype in NETWORK_FSTYPES or 'remote' in part.opts:
+            return None
+        try:
+            return str(os.stat(part.mountpoint).st_dev)
+        except OSError:
+            return None
+    
+    def select(self, partitions) -> List[tuple]:
+        # привязки (bind mount) одной файловой системы опрашиваются один раз,
+        # остальные точки монтирования возвращаются как псевдонимы первой
+        devices = read_mount_devices() if self.dedupe and platform.system() == "Linux" else {}
+        selected = []
+        by_device = {}
+        
+        for part in partitions:
+            if not self.accepts(part):
+                continue
+            
+            device_id = self._get_device_id(part, devices) if self.dedupe and part.fstype else None
+            if device_id is not None:
+                first = by_device.get(device_id)
+                if first is not None:
+                    first[1].append(part.mountpoint)
+                    continue
+                entry = (part, [])
+                by_device[device_id] = entry
+            else:
+                entry = (part, [])
+            selected.append(entry)
+        
+        return selected
+
+
+SYSFS_ROOT = '/sys'
+PROCFS_ROOT = '/proc'
+# простаивающие ядра сбрасывают частоту штатно, поэтому троттлингом считаем
+# только нагруженное ядро, работающее заметно ниже максимальной частоты
+THROTTLE_FREQ_RATIO = 0.8
+THROTTLE_BUSY_PERCENT = 50.0
+
+
+def detect_throttling(freqs, per_cpu: List[float], temperatures) -> Dict[str, object]:
+    cores = [
+        index for index, (freq, busy) in enumerate(zip(freqs, per_cpu))
+        if freq.max and busy >= THROTTLE_BUSY_PERCENT and freq.current < freq.max * THROTTLE_FREQ_RATIO
+    ]
+    hot = [
+        f"{chip}/{entry.label or chip}"
+        for chip, entries in temperatures.items()
+        for entry in entries
+        if entry.current is not None and entry.high and entry.current >= entry.high
+    ]
+    return {'cores': cores, 'hot_sensors': hot, 'suspected': bool(cores or hot)}
+
+
+def read_throttle_counts(root: Optional[str] = None) -> Optional[Dict[str, int]]:
+    # счетчики thermal_throttle есть только на Linux/x86; package-счетчик общий для ядер сокета
+    cpu_dir = os.path.join(root or SYSFS_ROOT, 'devices', 'system', 'cpu')
+    try:
+        cpus = [name for name in os.listdir(cpu_dir) if name[3:].isdigit() and name.startswith('cpu')]
+    except OSError:
+        return None
+
+    counts = {'core': 0, 'package': 0}
+    packages = set()
+    found = False
+    for cpu in cpus:
+        base = os.path.join(cpu_dir, cpu, 'thermal_throttle')
+        core = read_text_file(os.path.join(base, 'core_throttle_count'), 64)
+        if core is None:
+            continue
+        found = True
+        counts['core'] += int(core.strip() or 0)
+        package_id = (read_text_file(os.path.join(cpu_dir, cpu, 'topology', 'physical_package_id'), 64) or cpu).strip()
+        package = read_text_file(os.path.join(base, 'package_throttle_count'), 64)
+        if package is not None and package_id not in packages:
+            packages.add(package_id)
+            counts['package'] += int(package.strip() or 0)
+    return counts if found else None
+
+
+class SensorPoller:
+    # файлы hwmon и cpufreq открываются один раз, на каждом такте мониторинга - pread
+    # с нулевого смещения: без open/close и обхода каталогов sysfs
+    def __init__(self, root: Optional[str] = None):
+        self.root = root
+        self._temps = None
+        self._fans = []
+        self._freqs = []
+
+    @property
+    def available(self) -> bool:
+        return hasattr(os, 'pread') and platform.system() == "Linux"
+
+    @staticmethod
+    def _open(path: str) -> Optional[int]:
+        try:
+            return os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+
+    def open(self):
+        temps, fans, freqs = [], [], []
+        root = self.root or SYSFS_ROOT
+        hwmon = os.path.join(root, 'class', 'hwmon')
+        labels = set()
+        try:
+            chips = sorted(os.listdir(hwmon))
+        except OSError:
+            chips = []
+        for chip in chips:
+            base = os.path.join(hwmon, chip)
+            name = (read_text_file(os.path.join(base, 'name'), 256) or chip).strip()
+            try:
+                entries = sorted(os.listdir(base))
+            except OSError:
+                continue
+            for entry in entries:
+                prefix = entry[:-len('_input')]
+                if not entry.endswith('_input') or not prefix.startswith(('temp', 'fan')):
+                    continue
+                label = f"{name}/{(read_text_file(os.path.join(base, prefix + '_label'), 256) or prefix).strip()}"
+                if label in labels:
+                    # два одинаковых чипа (coretemp на двух сокетах)
+                    label = f"{chip}:{label}"
+                fd = self._open(os.path.join(base, entry))
+                if fd is not None:
+                    labels.add(label)
+                    (temps if prefix.startswith('temp') else fans).append((label, fd))
+
+        cpu_dir = os.path.join(root, 'devices', 'system', 'cpu')
+        try:
+            cpus = sorted((name for name in os.listdir(cpu_dir) if name.startswith('cpu') and name[3:].isdigit()),
+                          key=lambda name: int(name[3:]))
+        except OSError:
+            cpus = []
+        for cpu in cpus:
+            fd = self._open(os.path.join(cpu_dir, cpu, 'cpufreq', 'scaling_cur_freq'))
+            if fd is not None:
+                freqs.append((cpu, fd))
+
+        self._temps, self._fans, self._freqs = temps, fans, freqs
+
+    @staticmethod
+    def _read(entries, scale: float) -> List[tuple]:
+        values = []
+        for label, fd in entries:
+            try:
+                values.append((label, int(os.pread(fd, 32, 0)) / scale))
+            except (OSError, ValueError):
+                # датчик может временно не отдавать значение (ENODATA)
+                continue
+        return values
+
+    def sample(self) -> Dict[str, object]:
+        if not self.available:
+            return {'temperatures': {}, 'fans': {}, 'cpu_freq': []}
+        if self._temps is None:
+            self.open()
+        return {
+            # температуры в миллиградусах, частоты в кГц
+            'temperatures': dict(self._read(self._temps, 1000)),
+            'fans': dict(self._read(self._fans, 1)),
+            'cpu_freq': [value for _, value in self._read(self._freqs, 1000)],
+        }
+
+    def close(self):
+        for _, fd in (self._temps or []) + self._fans + self._freqs:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._temps = None
+        self._fans = []
+        self._freqs = []
+
+
+PSI_RESOURCES = ('cpu', 'memory', 'io')
+# поля /proc/meminfo для подробного отчета; HugePages_* - количество страниц, остальные в кБ
+MEMINFO_FIELDS = (
+    ('Cached', "Файловый кэш"),
+    ('Buffers', "Буферы"),
+    ('Dirty', "Грязные страницы"),
+    ('Writeback', "Запись на диск"),
+    ('Slab', "Slab"),
+    ('SReclaimable', "  освобождаемый"),
+    ('SUnreclaim', "  неосвобождаемый"),
+    ('Committed_AS', "Выделено (Committed_AS)"),
+    ('CommitLimit', "Предел выделения (CommitLimit)"),
+)
+
+
+class VmstatCounters(NamedTuple):
+    pgfault: int = 0
+    pgmajfault: int = 0
+    pswpin: int = 0
+    pswpout: int = 0
+
+
+def parse_pressure(content: str) -> Dict[str, Dict[str, float]]:
+    # "some avg10=2.29 avg60=1.62 avg300=1.38 total=23916564", total - микросекунды простоя
+    result = {}
+    for line in content.splitlines():
+        kind, _, rest = line.partition(' ')
+        values = {}
+        for item in rest.split():
+            key, _, value = item.partition('=')
+            try:
+                values[key] = float(value)
+            except ValueError:
+                continue
+        if kind in ('some', 'full') and values:
+            result[kind] = values
+    return result
+
+
+def parse_meminfo(content: str) -> Dict[str, int]:
+    # "Dirty:              1234 kB" -> байты; строки без единиц (HugePages_Total) - как есть
+    result = {}
+    for line in content.splitlines():
+        key, _, rest = line.partition(':')
+        parts = rest.split()
+        if not parts or not parts[0].isdigit():
+            continue
+        result[key] = int(parts[0]) * 1024 if len(parts) > 1 and parts[1] == 'kB' else int(parts[0])
+    return result
+
+
+def parse_vmstat(content: str) -> VmstatCounters:
+    wanted = set(VmstatCounters._fields)
+    values = {}
+    for line in content.splitlines():
+        key, _, value = line.partition(' ')
+        if key in wanted and value.strip().isdigit():
+            values[key] = int(value)
+    return VmstatCounters(**values)
+
+
+class ProcfsPoller:
+    # как SensorPoller: /proc/pressure/* и /proc/vmstat открываются один раз,
+    # каждое чтение - один pread с нулевого смещения
+    def __init__(self, root: Optional[str] = None):
+        self.root = root
+        self._fds: Dict[str, Optional[int]] = {}
+        self._lock = threading.Lock()
+
+    def _read(self, name: str, size: int = 4096) -> Optional[str]:
+        if not hasattr(os, 'pread'):
+            return None
+        with self._lock:
+            if name not in self._fds:
                 try:
-                    with open('/sys/class/dmi/id/product_name', 'r') as f:
-                        model = f.read().strip()
-                        if model:
-                            return model
-                except:
-                    pass
-                    
+                    self._fds[name] = os.open(os.path.join(self.root or PROCFS_ROOT, name), os.O_RDONLY)
+                except OSError:
+                    # PSI появился в ядре 4.20 и может быть выключен (psi=0)
+                    self._fds[name] = None
+            fd = self._fds[name]
+        if fd is None:
+            return None
+        try:
+            return os.pread(fd, size, 0).decode('ascii', 'replace')
+        except OSError:
+            return None
+
+    def pressure(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        result = {}
+        for resource in PSI_RESOURCES:
+            content = self._read(os.path.join('pressure', resource))
+            if content is not None:
+                result[resource] = parse_pressure(content)
+        return result
+
+    def vmstat(self) -> Optional[VmstatCounters]:
+        # в /proc/vmstat около 180 строк, 5-8 кБ
+        content = self._read('vmstat', 65536)
+        return parse_vmstat(content) if content is not None else None
+
+    def close(self):
+        with self._lock:
+            for fd in self._fds.values():
+                if fd is not None:
+                    os.close(fd)
+            self._fds.clear()
+
+
+def vmstat_rates(sampler: 'CounterSampler', reset: bool = False) -> Optional[Dict[str, float]]:
+    before, after, elapsed = sampler.sample(reset=reset)
+    if 'vmstat' not in after:
+        return None
+    # страниц в секунду; pgfault включает и major-ошибки
+    return counter_rates(before.get('vmstat'), after['vmstat'], elapsed, VmstatCounters._fields)
+
+
+# пауза перед повторным опросом видеокарты после пустого или неудачного чтения в режиме наблюдения
+GPU_RETRY_MAX_DELAY = 60.0
+
+# cpu_times считаются тиками по 10 мс: окно 0.05 с дает шаг загрузки ядра около 20%,
+# 0.5 с - около 2%, как у прежнего cpu_percent(interval=0.5). Краткий отчет ради скорости
+# довольствуется коротким окном, в подробном окно перекрывается с замером процессов
+BRIEF_CPU_WINDOW = 0.05
+VERBOSE_CPU_WINDOW = 0.5
+
+
+class SystemInfoCollector:
+    def __init__(self, verbose: bool = False, probe_timeout: float = 10.0, max_workers: Optional[int] = None,
+                 cpu_window: Optional[float] = None, use_cache: bool = True, cache_path: Optional[str] = None,
+                 output_format: str = 'text', disk_timeout: float = 2.0,
+                 mount_filter: Optional[MountFilter] = None, net_aggregate=DEFAULT_NET_AGGREGATE,
+                 top_count: int = 5, process_window: float = 0.5, watch_processes: bool = False,
+                 profile: bool = False):
+        self.verbose = verbose
+        if cpu_window is None:
+            cpu_window = VERBOSE_CPU_WINDOW if verbose else BRIEF_CPU_WINDOW
+        self.report: Optional[Report] = None
+        self.output_format = output_format
+        self.probe_timeout = probe_timeout
+        self.max_workers = max_workers
+        self._local = threading.local()
+        self.cpu_sampler = CpuSampler(window=cpu_window)
+        self.static_cache = StaticInfoCache(cache_path) if use_cache else None
+        self.disk_prober = DiskUsageProber(timeout=disk_timeout)
+        self.mount_filter = mount_filter or MountFilter()
+        self._watch_mounts = None
+        self._loopback_names = None
+        self._watch_gpus = None
+        self._gpu_failures = 0
+        self._gpu_retry_at = 0.0
+        self._gpu_backend = None
+        self._gpu_lock = threading.Lock()
+        self.sensor_poller = SensorPoller()
+        self.cgroup = self._open_cgroup(cpu_window)
+        self.procfs_poller = ProcfsPoller()
+        self.vmstat_sampler = CounterSampler(self._read_vmstat, window=cpu_window)
+        self.disk_io_sampler = CounterSampler(lambda: psutil.disk_io_counters(perdisk=True), window=cpu_window)
+        self.net_sampler = CounterSampler(lambda: psutil.net_io_counters(pernic=True), window=cpu_window)
+        self.net_aggregate = tuple(net_aggregate)
+        self.top_count = top_count
+        self.watch_processes = watch_processes
+        self.process_sampler = ProcessSampler(window=process_window)
+        if (verbose and top_count > 0) or watch_processes:
+            # как CpuSampler: первый проход при создании, чтобы окно замера шло параллельно с остальными пробами
+            self.process_sampler.prime()
+        self.profile = profile
+        if profile:
+            enable_subprocess_accounting()
+        
+    def print_and_capture(self, text: str):
+        # внутри пробы строки попадают в секцию отчета, чтобы печататься в исходном порядке
+        section = getattr(self._local, 'section', None)
+        if section is not None:
+            section.lines.append(text)
+            return
+        print(text)
+    
+    def set_data(self, key: str, value):
+        section = getattr(self._local, 'section', None)
+        if section is not None:
+            section.data[key] = value
+    
+    def _run_probe(self, probe: Probe, profile: ProbeProfile) -> ReportSection:
+        section = ReportSection(probe.key, probe.title)
+        self._local.section = section
+        _profile_context.profile = profile
+        wall_started = time.perf_counter()
+        cpu_started = time.thread_time()
+        try:
+            probe.func()
+            if 'error' in section.data:
+                profile.errors.append(str(section.data['error']))
+            return section
+        finally:
+            profile.cpu = time.thread_time() - cpu_started
+            profile.wall = time.perf_counter() - wall_started
+            self._local.section = None
+            _profile_context.profile = None
+    
+    def run_probes(self, probes: List[Probe], profiles: Optional[List[ProbeProfile]] = None) -> List[ReportSection]:
+        # замеры пишутся всегда: это два вызова часов на пробу, а --profile только их показывает
+        if profiles is None:
+            profiles = []
+        profiles.extend(ProbeProfile(probe.key) for probe in probes)
+        workers = self.max_workers or len(probes)
+        started = time.monotonic()
+        futures = [Future() for _ in probes]
+        # как у DiskUsageProber: потоки daemon, иначе зависшая проба (nvidia-smi, WMI)
+        # держит выход процесса - потоки ThreadPoolExecutor ждутся при завершении интерпретатора
+        jobs = list(reversed(list(zip(probes, profiles, futures))))
+        jobs_lock = threading.Lock()
+        
+        def worker():
+            while True:
+                with jobs_lock:
+                    if not jobs:
+                        return
+                    probe, profile, future = jobs.pop()
+                if not future.set_running_or_notify_cancel():
+                    continue
                 try:
-                    result = subprocess.check_output(
-                        "cat /proc/cpuinfo | grep 'model name' | head -1",
-                        shell=True,
-                        encoding="utf-8"
-                    )
-                    return result.split(":")[-1].strip()
-                except:
-                    pass
-                    
-            elif system == "Darwin":
+                    future.set_result(self._run_probe(probe, profile))
+                except BaseException as e:
+                    future.set_exception(e)
+        
+        for _ in range(min(workers, len(probes))):
+            threading.Thread(target=worker, name="probe", daemon=True).start()
+        sections = []
+        
+        try:
+            for probe, profile, future in zip(probes, profiles, futures):
+                timeout = probe.timeout if probe.timeout is not None else self.probe_timeout
+                remaining = max(0.0, started + timeout - time.monotonic())
                 try:
-                    result = subprocess.check_output(
-                        "sysctl -n hw.model",
-                        shell=True,
-                        encoding="utf-8"
-                    )
-                    return result.strip()
-                except:
-                    pass
-                    
-            return "Неизвестно"
+                    sections.append(future.result(timeout=remaining))
+                except FutureTimeoutError:
+                    profile.status = 'timeout'
+                    # зависшая проба свои замеры еще не записала
+                    profile.wall = time.monotonic() - started
+                    sections.append(ReportSection(
+                        probe.key, probe.title,
+                        data={'error': 'timeout', 'timeout': timeout},
+                        lines=[f"\n{' ' + probe.title + ' ':-^60}", f"  Превышено время ожидания ({timeout:.1f} с)"],
+                    ))
+                except Exception as e:
+                    profile.status = 'error'
+                    profile.errors.append(f"{type(e).__name__}: {e}")
+                    sections.append(ReportSection(
+                        probe.key, probe.title,
+                        data={'error': str(e)},
+                        lines=[f"\n{' ' + probe.title + ' ':-^60}", f"  Ошибка выполнения: {str(e)}"],
+                    ))
+        finally:
+            # еще не начатые пробы не запускаем
+            for future in futures:
+                future.cancel()
+        
+        return sections
+    
+    def render(self, stream=None, output_format: Optional[str] = None):
+        if self.report is None:
+            return
+        RENDERERS[output_format or self.output_format](self.report, stream or sys.stdout)
+    
+    @staticmethod
+    def format_size(bytes_size: float) -> str:
+        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+            if bytes_size < 1024:
+                return f"{bytes_size:.2f} {unit}"
+            bytes_size /= 1024
+        return f"{bytes_size:.2f} PB"
+    
+    def get_static(self, name: str, loader: Callable[[], object]):
+        if self.static_cache is None:
+            return loader()
+        return self.static_cache.get(name, loader)
+    
+    def save_static_cache(self):
+        if self.static_cache is not None:
+            self.static_cache.save()
+    
+    def get_cpu_static_info(self) -> Dict[str, object]:
+        def load():
+            try:
+                import cpuinfo
+            except ImportError:
+                return {'brand': platform.processor() or 'Неизвестно', 'vendor': 'Неизвестно', 'l3_cache_size': None}
             
-        except Exception:
+            cpu_info = cpuinfo.get_cpu_info()
+            return {
+                'brand': cpu_info.get('brand_raw', 'Неизвестно'),
+                'vendor': cpu_info.get('vendor_id_raw', 'Неизвестно'),
+                'l3_cache_size': cpu_info.get('l3_cache_size'),
+            }
+        with profile_step('cpuinfo'):
+            return self.get_static('cpu', load)
+    
+    def get_system_model(self) -> str:
+        with profile_step('system_model'):
+            model = self.get_static('system_model', self._probe_system_model)
+        if model == "Неизвестно" and self.static_cache is not None:
+            # не кэшируем неудачный результат, чтобы повторить попытку при следующем запуске
+            self.static_cache.discard('system_model')
+        return model
+    
+    def _probe_system_model(self) -> str:
+        probe = SYSTEM_MODEL_PROBES.get(platform.system())
+        try:
+            return (probe() if probe else None) or "Неизвестно"
+        except Exception as e:
+            note_exception(e)
             return "Неизвестно"
     
-    def get_basic_info(self):
-        self.print_and_capture("\n" + "="*60)
-        self.print_and_capture(f"{' СИСТЕМНАЯ ИНФОРМАЦИЯ (КРАТКО) ':=^60}")
-        self.print_and_capture(f"  Дата и время: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        self.print_and_capture("="*60)
+    def get_os_info_basic(self):
+        model = self.get_system_model()
+        self.set_data('model', model)
+        self.set_data('hostname', platform.node())
+        self.set_data('os', platform.system())
+        self.set_data('release', platform.release())
+        self.set_data('machine', platform.machine())
         
         self.print_and_capture(f"\n{' ОСНОВНЫЕ ДАННЫЕ ':-^60}")
-        self.print_and_capture(f"  Модель системы: {self.get_system_model()}")
+        self.print_and_capture(f"  Модель системы: {model}")
         self.print_and_capture(f"  Имя компьютера: {platform.node()}")
         self.print_and_capture(f"  ОС: {platform.system()} {platform.release()}")
         self.print_and_capture(f"  Архитектура: {platform.machine()}")
-        
+    
+    def get_cpu_info_basic(self):
         try:
-            cpu_info = cpuinfo.get_cpu_info()
+            cpu_info = self.get_cpu_static_info()
+            physical_cores = psutil.cpu_count(logical=False)
+            logical_cores = psutil.cpu_count(logical=True)
+            with profile_step('cpu_percent'):
+                cpu_load = self.cpu_sampler.sample()
+            self.set_data('brand', cpu_info['brand'])
+            self.set_data('physical_cores', physical_cores)
+            self.set_data('logical_cores', logical_cores)
+            self.set_data('percent', cpu_load.percent)
+            
             self.print_and_capture(f"\n{' ПРОЦЕССОР ':-^60}")
-            self.print_and_capture(f"  Модель: {cpu_info.get('brand_raw', 'Неизвестно')}")
-            self.print_and_capture(f"  Ядер/потоков: {psutil.cpu_count(logical=False)}/{psutil.cpu_count(logical=True)}")
-            self.print_and_capture(f"  Загрузка: {psutil.cpu_percent(interval=0.5):.1f}%")
-        except Exception:
-            pass
-        
+            self.print_and_capture(f"  Модель: {cpu_info['brand']}")
+            self.print_and_capture(f"  Ядер/потоков: {physical_cores}/{logical_cores}")
+            self.print_and_capture(f"  Загрузка: {cpu_load.percent:.1f}%")
+        except Exception as e:
+            self.set_data('error', str(e))
+    
+    def get_memory_info_basic(self):
         try:
             mem = psutil.virtual_memory()
+            self.set_data('total', mem.total)
+            self.set_data('used', mem.used)
+            self.set_data('percent', mem.percent)
+            
             self.print_and_capture(f"\n{' ОПЕРАТИВНАЯ ПАМЯТЬ ':-^60}")
             self.print_and_capture(f"  Всего: {self.format_size(mem.total)}")
             self.print_and_capture(f"  Используется: {self.format_size(mem.used)}")
             self.print_and_capture(f"  Загрузка: {mem.percent:.1f}%")
-        except Exception:
-            pass
+        except Exception as e:
+            self.set_data('error', str(e))
+    
+    def get_disk_io(self) -> Callable[[str], Optional[Dict[str, float]]]:
+        with profile_step('disk_io'):
+            before, after, elapsed = self.disk_io_sampler.sample()
         
+        def lookup(device: str) -> Optional[Dict[str, float]]:
+            name = io_device_name(device)
+            return disk_io_stats(before.get(name), after.get(name), elapsed)
+        return lookup
+    
+    def print_disk_io(self, io: Optional[Dict[str, float]], indent: str):
+        if io is None:
+            return
+        self.print_and_capture(f"{indent}Ввод-вывод: чтение {self.format_size(io['read_bytes'])}/s ({io['read_count']:.1f} оп/s), "
+                               f"запись {self.format_size(io['write_bytes'])}/s ({io['write_count']:.1f} оп/s)")
+        busy = f", занятость {io['busy_percent']:.1f}%" if io['busy_percent'] is not None else ""
+        self.print_and_capture(f"{indent}Среднее ожидание: {io['await']:.2f} мс{busy}")
+    
+    def get_disk_info_basic(self):
+        mounts = []
+        self.set_data('mounts', mounts)
         try:
             self.print_and_capture(f"\n{' ДИСКИ ':-^60}")
             partitions = psutil.disk_partitions(all=False)
-            for part in partitions:
-                if part.fstype and len(part.mountpoint) <= 3:
-                    try:
-                        usage = psutil.disk_usage(part.mountpoint)
-                        self.print_and_capture(f"  {part.mountpoint}: {self.format_size(usage.total)} свободно {self.format_size(usage.free)} ({usage.percent:.1f}% заполнено)")
-                    except Exception:
-                        pass
-        except Exception:
-            pass
-        
-        self.print_and_capture("\n" + "="*60)
-        self.print_and_capture(f"{' КОНЕЦ ОТЧЕТА ':=^60}")
-        self.print_and_capture("="*60)
+            devices = {part.mountpoint: part.device for part in partitions if part.fstype and len(part.mountpoint) <= 3}
+            with profile_step('statvfs'):
+                probed = self.disk_prober.probe(list(devices))
+            disk_io = self.get_disk_io()
+            for mountpoint, device in devices.items():
+                result = probed[mountpoint]
+                io = disk_io(device)
+                if result.status == 'unreachable':
+                    mounts.append({'mountpoint': mountpoint, 'status': result.status, 'latency': result.latency})
+                    self.print_and_capture(f"  {mountpoint}: нет ответа за {result.latency:.1f} с")
+                elif usage := result.usage:
+                    mounts.append({
+                        'mountpoint': mountpoint,
+                        'total': usage.total,
+                        'free': usage.free,
+                        'percent': usage.percent,
+                        'status': result.status,
+                        'io': io,
+                    })
+                    self.print_and_capture(f"  {mountpoint}: {self.format_size(usage.total)} свободно {self.format_size(usage.free)} ({usage.percent:.1f}% заполнено)")
+                    self.print_disk_io(io, "    ")
+        except Exception as e:
+            self.set_data('error', str(e))
     
-    def get_verbose_info(self):
-        self.print_and_capture("\n" + "="*60)
-        self.print_and_capture(f"{' СИСТЕМНАЯ ИНФОРМАЦИЯ (ПОЛНОСТЬЮ) ':=^60}")
-        self.print_and_capture(f"  Дата и время: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        self.print_and_capture("="*60)
+    def reset_samplers(self):
+        # новое окно всех дельта-замеров начинается сейчас: при повторных отчетах (экспортер)
+        # следующий отчет покажет среднее с прошлого, а не с создания сборщика
+        self.cpu_sampler.prime()
+        self.disk_io_sampler.prime()
+        self.net_sampler.prime()
+        self.vmstat_sampler.prime()
+        if self.cgroup is not None:
+            self.cgroup.prime()
+    
+    def collect_basic(self, reset: bool = False) -> Report:
+        report = Report('brief', ' СИСТЕМНАЯ ИНФОРМАЦИЯ (КРАТКО) ', time.time())
+        report.sections = self.run_probes([
+            Probe('system', "ОСНОВНЫЕ ДАННЫЕ", self.get_os_info_basic),
+            Probe('cpu', "ПРОЦЕССОР", self.get_cpu_info_basic),
+            Probe('memory', "ОПЕРАТИВНАЯ ПАМЯТЬ", self.get_memory_info_basic),
+            Probe('disks', "ДИСКИ", self.get_disk_info_basic),
+            Probe('container', "КОНТЕЙНЕР", self.get_container_info),
+        ], report.profile)
+        if reset:
+            self.reset_samplers()
+        self.save_static_cache()
+        self.report = report
+        return report
+    
+    def get_basic_info(self):
+        self.collect_basic()
+        self.render()
+    
+    def get_os_info_verbose(self):
+        model = self.get_system_model()
+        self.set_data('model', model)
+        self.set_data('hostname', platform.node())
+        self.set_data('os', platform.system())
+        self.set_data('release', platform.release())
+        self.set_data('version', platform.version())
+        self.set_data('machine', platform.machine())
+        self.set_data('processor', platform.processor())
         
         self.print_and_capture(f"\n{' ОСНОВНЫЕ ДАННЫЕ ':-^60}")
-        self.print_and_capture(f"  Модель системы: {self.get_system_model()}")
+        self.print_and_capture(f"  Модель системы: {model}")
         self.print_and_capture(f"  Имя компьютера: {platform.node()}")
         self.print_and_capture(f"  ОС: {platform.system()} {platform.release()}")
         self.print_and_capture(f"  Версия ОС: {platform.version()}")
         self.print_and_capture(f"  Архитектура: {platform.machine()}")
         self.print_and_capture(f"  Процессор: {platform.processor()}")
-        
+    
+    def get_cpu_info_verbose(self):
         self.print_and_capture(f"\n{' ПРОЦЕССОР ':-^60}")
         try:
-            cpu_info = cpuinfo.get_cpu_info()
-            self.print_and_capture(f"  Производитель: {cpu_info.get('vendor_id_raw', 'Неизвестно')}")
-            self.print_and_capture(f"  Модель: {cpu_info.get('brand_raw', 'Неизвестно')}")
+            cpu_info = self.get_cpu_static_info()
+            self.set_data('vendor', cpu_info['vendor'])
+            self.set_data('brand', cpu_info['brand'])
+            self.print_and_capture(f"  Производитель: {cpu_info['vendor']}")
+            self.print_and_capture(f"  Модель: {cpu_info['brand']}")
             
             physical_cores = psutil.cpu_count(logical=False)
             logical_cores = psutil.cpu_count(logical=True)
+            self.set_data('physical_cores', physical_cores)
+            self.set_data('logical_cores', logical_cores)
             self.print_and_capture(f"  Ядер/потоков: {physical_cores}/{logical_cores}")
             
             if (freq := psutil.cpu_freq()):
+                self.set_data('freq_current', freq.current)
+                self.set_data('freq_max', freq.max or None)
                 self.print_and_capture(f"  Текущая частота: {freq.current:.2f} MHz")
                 if freq.max:
                     self.print_and_capture(f"  Максимальная частота: {freq.max:.2f} MHz")
             else:
                 self.print_and_capture(f"  Частота: Неизвестна")
             
-            cpu_load = psutil.cpu_percent(interval=0.5)
-            self.print_and_capture(f"  Общая загрузка: {cpu_load:.1f}%")
+            with profile_step('cpu_percent'):
+                cpu_load = self.cpu_sampler.sample()
+            self.set_data('percent', cpu_load.percent)
+            self.set_data('per_cpu', cpu_load.per_cpu)
+            self.set_data('times', cpu_load.times)
+            self.print_and_capture(f"  Общая загрузка: {cpu_load.percent:.1f}%")
+            if cpu_load.per_cpu:
+                per_cpu = ", ".join(f"{percent:.1f}%" for percent in cpu_load.per_cpu)
+                self.print_and_capture(f"  Загрузка по ядрам: {per_cpu}")
+            self.print_and_capture(
+                f"  Пользователь/система/ожидание I/O: {cpu_load.times.get('user', 0.0):.1f}% / "
+                f"{cpu_load.times.get('system', 0.0):.1f}% / {cpu_load.times.get('iowait', 0.0):.1f}%"
+            )
             
-            if 'l3_cache_size' in cpu_info:
-                cache_size = cpu_info['l3_cache_size']
-                if cache_size:
-                    self.print_and_capture(f"  Кэш L3: {self.format_size(cache_size)}")
+            if cache_size := cpu_info.get('l3_cache_size'):
+                self.set_data('l3_cache_size', cache_size)
+                self.print_and_capture(f"  Кэш L3: {self.format_size(cache_size)}")
                     
         except Exception as e:
+            self.set_data('error', str(e))
             self.print_and_capture(f"  Ошибка получения данных о процессоре: {str(e)}")
-        
+    
+    def get_memory_info_verbose(self):
         self.print_and_capture(f"\n{' ОПЕРАТИВНАЯ ПАМЯТЬ ':-^60}")
         try:
             mem = psutil.virtual_memory()
             swap = psutil.swap_memory()
+            self.set_data('total', mem.total)
+            self.set_data('available', mem.available)
+            self.set_data('used', mem.used)
+            self.set_data('percent', mem.percent)
+            self.set_data('swap_total', swap.total)
+            self.set_data('swap_used', swap.used)
+            self.set_data('swap_percent', swap.percent)
             
             self.print_and_capture(f"  Всего RAM: {self.format_size(mem.total)}")
             self.print_and_capture(f"  Доступно RAM: {self.format_size(mem.available)}")
@@ -216,38 +1477,237 @@ class SystemInfoCollector:
                 self.print_and_capture(f"  Загрузка Swap: {swap.percent:.1f}%")
             
         except Exception as e:
+            self.set_data('error', str(e))
             self.print_and_capture(f"  Ошибка получения данных о памяти: {str(e)}")
-        
+    
+    def _read_vmstat(self) -> Dict[str, VmstatCounters]:
+        counters = self.procfs_poller.vmstat()
+        return {'vmstat': counters} if counters is not None else {}
+    
+    def get_pressure_info(self):
+        self.print_and_capture(f"\n{' ДАВЛЕНИЕ РЕСУРСОВ ':-^60}")
+        try:
+            pressure = self.procfs_poller.pressure()
+            self.set_data('pressure', pressure)
+            if pressure:
+                self.print_and_capture("  [PSI] доля времени простоя задач, % (10 с / 60 с / 300 с)")
+                for resource in PSI_RESOURCES:
+                    for kind, values in pressure.get(resource, {}).items():
+                        self.print_and_capture(f"    {resource:<7}{kind:<5} {values.get('avg10', 0):6.2f} "
+                                               f"{values.get('avg60', 0):6.2f} {values.get('avg300', 0):6.2f}")
+            else:
+                self.print_and_capture("  PSI недоступен (ядро старше 4.20 или psi=0)")
+            
+            meminfo = parse_meminfo(read_text_file(os.path.join(PROCFS_ROOT, 'meminfo'), 16384) or '')
+            details = {key: meminfo[key] for key, _ in MEMINFO_FIELDS if key in meminfo}
+            hugepages = {key: meminfo[key] for key in ('HugePages_Total', 'HugePages_Free', 'Hugepagesize') if key in meminfo}
+            self.set_data('meminfo', {**details, **hugepages})
+            if details:
+                self.print_and_capture("\n  [ПАМЯТЬ]")
+                for key, title in MEMINFO_FIELDS:
+                    if key in details:
+                        self.print_and_capture(f"    {title}: {self.format_size(details[key])}")
+            if hugepages.get('HugePages_Total'):
+                self.print_and_capture(f"    HugePages: свободно {hugepages['HugePages_Free']} из "
+                                       f"{hugepages['HugePages_Total']} по {self.format_size(hugepages.get('Hugepagesize', 0))}")
+            
+            rates = vmstat_rates(self.vmstat_sampler)
+            self.set_data('vmstat_rates', rates)
+            if rates is not None:
+                self.print_and_capture(f"\n  Ошибки страниц: {rates['pgfault']:.0f}/с, с чтением с диска {rates['pgmajfault']:.0f}/с")
+                self.print_and_capture(f"  Swap: ввод {rates['pswpin']:.0f}, вывод {rates['pswpout']:.0f} страниц/с")
+            
+            if not (pressure or details or rates):
+                self.set_data('available', False)
+        except Exception as e:
+            self.set_data('error', str(e))
+            self.print_and_capture(f"  Ошибка получения данных о давлении ресурсов: {str(e)}")
+    
+    def get_gpu_backend(self):
+        # бэкенд открывается один раз: NVML держит дескрипторы устройств на весь срок жизни сборщика
+        with self._gpu_lock:
+            if self._gpu_backend is None:
+                import gpu
+                self._gpu_backend = gpu.open_backend(on_error=note_exception) or False
+            return self._gpu_backend or None
+    
+    def close_gpu_backend(self):
+        # nvmlShutdown освобождает дескрипторы драйвера; при следующем обращении бэкенд откроется заново
+        with self._gpu_lock:
+            if self._gpu_backend:
+                self._gpu_backend.close()
+            self._gpu_backend = None
+    
+    def get_gpu_info(self):
+        gpu_list = []
+        self.set_data('gpus', gpu_list)
         self.print_and_capture(f"\n{' ВИДЕОКАРТА ':-^60}")
+        backend = self.get_gpu_backend()
+        if backend is None:
+            self.set_data('error', 'no GPU backend')
+            self.print_and_capture("  Не установлены ни pynvml, ни GPUtil, данные о видеокарте недоступны")
+            return
+        
+        self.set_data('backend', backend.name)
         try:
-            gpus = GPUtil.getGPUs()
-            if not gpus:
+            with profile_step(backend.name):
+                readings = backend.read()
+            if self.static_cache is not None:
+                self.static_cache.set('gpus', [
+                    {'name': reading.name, 'memory_total': reading.memory_total} for reading in readings
+                ])
+            if not readings:
                 self.print_and_capture("  Видеокарты не обнаружены")
-            else:
-                for i, gpu in enumerate(gpus, 1):
-                    self.print_and_capture(f"\n  Видеокарта #{i}: {gpu.name}")
-                    self.print_and_capture(f"    Память: {self.format_size(gpu.memoryTotal * 1024 * 1024)}")
-                    self.print_and_capture(f"    Используется: {self.format_size(gpu.memoryUsed * 1024 * 1024)}")
-                    self.print_and_capture(f"    Загрузка GPU: {gpu.load * 100:.1f}%")
-                    temp = gpu.temperature if gpu.temperature is not None else 'N/A'
-                    self.print_and_capture(f"    Температура: {temp}°C")
+            for reading in readings:
+                gpu_list.append(reading._asdict())
+                self.print_and_capture(f"\n  Видеокарта #{reading.index + 1}: {reading.name}")
+                if reading.memory_total is not None:
+                    self.print_and_capture(f"    Память: {self.format_size(reading.memory_total)}")
+                    self.print_and_capture(f"    Используется: {self.format_size(reading.memory_used)}")
+                if reading.load is not None:
+                    self.print_and_capture(f"    Загрузка GPU: {reading.load:.1f}%")
+                temp = reading.temperature if reading.temperature is not None else 'N/A'
+                self.print_and_capture(f"    Температура: {temp}°C")
+                if reading.power is not None:
+                    limit = f" из {reading.power_limit:.0f} Вт" if reading.power_limit else ""
+                    self.print_and_capture(f"    Мощность: {reading.power:.1f} Вт{limit}")
+                if reading.clock_graphics is not None:
+                    self.print_and_capture(f"    Частоты: ядро {reading.clock_graphics} MHz, память {reading.clock_memory} MHz")
                     
         except Exception as e:
+            self.set_data('error', str(e))
             self.print_and_capture(f"  Ошибка получения данных о видеокарте: {str(e)}")
+    
+    def get_sensor_info(self):
+        self.print_and_capture(f"\n{' ДАТЧИКИ ':-^60}")
+        try:
+            freqs = psutil.cpu_freq(percpu=True) or []
+            # на Windows и части macOS функций датчиков в psutil нет совсем
+            read_temperatures = getattr(psutil, 'sensors_temperatures', None)
+            read_fans = getattr(psutil, 'sensors_fans', None)
+            temperatures = read_temperatures() if read_temperatures else {}
+            fans = read_fans() if read_fans else {}
+            with profile_step('cpu_percent'):
+                cpu_load = self.cpu_sampler.sample()
+            
+            self.set_data('cpu_freq', [{'current': freq.current, 'max': freq.max or None} for freq in freqs])
+            if freqs:
+                per_core = ", ".join(f"{freq.current:.0f}" for freq in freqs)
+                self.print_and_capture(f"  Частота по ядрам, MHz: {per_core}")
+            
+            temperature_list = []
+            if temperatures:
+                self.print_and_capture(f"\n  [ТЕМПЕРАТУРЫ]")
+            for chip, entries in temperatures.items():
+                for entry in entries:
+                    temperature_list.append({
+                        'chip': chip,
+                        'label': entry.label or chip,
+                        'current': entry.current,
+                        'high': entry.high,
+                        'critical': entry.critical,
+                    })
+                    limits = ", ".join(
+                        f"{title} {value:.0f}°C" for title, value in (("порог", entry.high), ("критическая", entry.critical)) if value
+                    )
+                    self.print_and_capture(f"    {chip} / {entry.label or chip}: {entry.current:.1f}°C"
+                                           + (f" ({limits})" if limits else ""))
+            self.set_data('temperatures', temperature_list)
+            
+            fan_list = []
+            if fans:
+                self.print_and_capture(f"\n  [ВЕНТИЛЯТОРЫ]")
+            for chip, entries in fans.items():
+                for entry in entries:
+                    fan_list.append({'chip': chip, 'label': entry.label or chip, 'current': entry.current})
+                    self.print_and_capture(f"    {chip} / {entry.label or chip}: {entry.current} RPM")
+            self.set_data('fans', fan_list)
+            
+            if not (temperatures or fans):
+                self.print_and_capture("  Датчики температуры и вентиляторов недоступны")
+            
+            throttling = detect_throttling(freqs, cpu_load.per_cpu, temperatures)
+            counts = read_throttle_counts()
+            throttling['counts'] = counts
+            self.set_data('throttling', throttling)
+            if throttling['suspected']:
+                self.print_and_capture("\n  Троттлинг: ОБНАРУЖЕН")
+                if throttling['cores']:
+                    cores = ", ".join(str(core) for core in throttling['cores'])
+                    self.print_and_capture(f"    Ядра под нагрузкой ниже {THROTTLE_FREQ_RATIO:.0%} макс. частоты: {cores}")
+                if throttling['hot_sensors']:
+                    self.print_and_capture(f"    Выше порога температуры: {', '.join(throttling['hot_sensors'])}")
+            else:
+                self.print_and_capture("\n  Троттлинг: не обнаружен")
+            if counts is not None:
+                self.print_and_capture(f"    Счетчики троттлинга ядра: ядра {counts['core']}, корпус {counts['package']}")
         
-        self.get_disk_info_verbose()
-        
-        self.get_network_info()
-        
-        self.get_battery_info()
-        
-        if platform.system() == "Windows":
-            self.get_windows_specific_info()
+        except Exception as e:
+            self.set_data('error', str(e))
+            self.print_and_capture(f"  Ошибка получения данных датчиков: {str(e)}")
+    
+    @staticmethod
+    def _open_cgroup(window: float):
+        # первый снимок счетчиков cgroup - при создании сборщика, как у CpuSampler
+        if platform.system() != "Linux":
+            return None
+        import cgroup
+        try:
+            return cgroup.CgroupReader(os.path.join(SYSFS_ROOT, 'fs', 'cgroup'),
+                                       os.path.join(PROCFS_ROOT, 'self', 'cgroup'), window=window)
+        except (OSError, ValueError):
+            return None
+    
+    def get_container_info(self):
+        if self.cgroup is None:
+            self.set_data('available', False)
+            return
         
+        try:
+            stats = self.cgroup.sample(psutil.cpu_count(logical=True) or 1, psutil.virtual_memory().total)
+            self.set_data('available', True)
+            for key, value in stats.items():
+                self.set_data(key, value)
+            # в кратком отчете секция нужна только внутри ограниченного контейнера
+            if not stats['limited'] and not self.verbose:
+                return
+            
+            self.print_and_capture(f"\n{' КОНТЕЙНЕР (CGROUP) ':-^60}")
+            self.print_and_capture(f"  cgroup v{stats['version']}: {stats['path']}")
+            if not stats['limited']:
+                self.print_and_capture("  Ограничения CPU и памяти не заданы")
+            
+            cpu_limits = []
+            if stats['cpu_quota']:
+                cpu_limits.append(f"квота {stats['cpu_quota']}/{stats['cpu_period']} мкс")
+            if stats['cpuset']:
+                cpu_limits.append(f"cpuset {len(stats['cpuset'])} ядер")
+            self.print_and_capture(f"  Ядер: доступно {stats['effective_cpus']:g} из {stats['host_cpus']}"
+                                   + (f" ({', '.join(cpu_limits)})" if cpu_limits else ""))
+            self.print_and_capture(f"  Память: доступно {self.format_size(stats['effective_memory'])} "
+                                   f"из {self.format_size(stats['host_memory'])}")
+            if stats['memory_usage'] is not None:
+                self.print_and_capture(f"  Используется: {self.format_size(stats['memory_usage'])}, "
+                                       f"рабочий набор {self.format_size(stats['memory_working_set'])} "
+                                       f"({stats['memory_percent']:.1f}% доступного)")
+            if stats['cpu_percent'] is not None:
+                self.print_and_capture(f"  Загрузка CPU контейнера: {stats['cpu_percent']:.1f}% доступных ядер")
+            if stats['nr_periods']:
+                self.print_and_capture(f"  Троттлинг: {stats['nr_throttled']} из {stats['nr_periods']} периодов "
+                                       f"({stats['nr_throttled'] / stats['nr_periods'] * 100:.1f}%), "
+                                       f"{stats['throttled_time'] or 0:.1f} с")
+        except Exception as e:
+            self.set_data('error', str(e))
+            self.print_and_capture(f"  Ошибка чтения cgroup: {str(e)}")
+    
+    def get_uptime_info(self):
         self.print_and_capture(f"\n{' СИСТЕМА ':-^60}")
         try:
-            boot_time = datetime.fromtimestamp(psutil.boot_time())
+            boot_timestamp = psutil.boot_time()
+            boot_time = datetime.fromtimestamp(boot_timestamp)
             uptime = datetime.now() - boot_time
+            self.set_data('boot_time', boot_timestamp)
+            self.set_data('uptime', uptime.total_seconds())
             
             days = uptime.days
             hours, remainder = divmod(uptime.seconds, 3600)
@@ -262,93 +1722,170 @@ class SystemInfoCollector:
             self.print_and_capture(f"  Время работы: {uptime_str}")
             
         except Exception as e:
+            self.set_data('error', str(e))
             self.print_and_capture(f"  Ошибка получения времени работы: {str(e)}")
+    
+    def collect_verbose(self, reset: bool = False) -> Report:
+        report = Report('verbose', ' СИСТЕМНАЯ ИНФОРМАЦИЯ (ПОЛНОСТЬЮ) ', time.time())
+        probes = [
+            Probe('system', "ОСНОВНЫЕ ДАННЫЕ", self.get_os_info_verbose),
+            Probe('cpu', "ПРОЦЕССОР", self.get_cpu_info_verbose),
+            Probe('memory', "ОПЕРАТИВНАЯ ПАМЯТЬ", self.get_memory_info_verbose),
+            Probe('pressure', "ДАВЛЕНИЕ РЕСУРСОВ", self.get_pressure_info),
+            Probe('gpu', "ВИДЕОКАРТА", self.get_gpu_info),
+            Probe('sensors', "ДАТЧИКИ", self.get_sensor_info),
+            Probe('container', "КОНТЕЙНЕР", self.get_container_info),
+            Probe('disks', "НАКОПИТЕЛИ ИНФОРМАЦИИ", self.get_disk_info_verbose),
+            Probe('network', "СЕТЕВЫЕ ИНТЕРФЕЙСЫ", self.get_network_info),
+            Probe('battery', "АККУМУЛЯТОР", self.get_battery_info),
+        ]
+        if self.top_count > 0:
+            probes.append(Probe('processes', "ПРОЦЕССЫ", self.get_process_info))
+        if platform.system() == "Windows":
+            probes.append(Probe('windows', "WINDOWS ИНФОРМАЦИЯ", self.get_windows_specific_info))
+        probes.append(Probe('uptime', "СИСТЕМА", self.get_uptime_info))
         
-        self.print_and_capture("\n" + "="*60)
-        self.print_and_capture(f"{' КОНЕЦ ОТЧЕТА ':=^60}")
-        self.print_and_capture("="*60)
+        report.sections = self.run_probes(probes, report.profile)
+        if reset:
+            self.reset_samplers()
+        self.save_static_cache()
+        self.report = report
+        return report
+    
+    def get_verbose_info(self):
+        self.collect_verbose()
+        self.render()
     
 
     def get_disk_info_verbose(self):
         self.print_and_capture(f"\n{' НАКОПИТЕЛИ ИНФОРМАЦИИ ':-^60}")
         
         try:
-            partitions = psutil.disk_partitions(all=True)
-            local_disks = []
-            network_disks = []
+            with profile_step('disk_partitions'):
+                partitions = psutil.disk_partitions(all=True)
+            candidates = []
             optical_drives = []
-            removable_disks = []
-            other_devices = []
+            aliases = {}
+            is_windows = platform.system() == "Windows"
             
-            for part in partitions:
-                if part.fstype == '' or 'cdrom' in part.opts.lower():
+            for part, part_aliases in self.mount_filter.select(partitions):
+                if part_aliases:
+                    aliases[part.mountpoint] = part_aliases
+                
+                opts = part.opts.lower()
+                if part.fstype == '' or 'cdrom' in opts:
                     optical_drives.append((part.device, part.mountpoint))
                     continue
                 
-                if 'remote' in part.opts.lower() or part.fstype in ('cifs', 'nfs', 'smbfs'):
-                    try:
-                        usage = psutil.disk_usage(part.mountpoint)
-                        network_disks.append((part.device, part.mountpoint, part.fstype, usage, "Network"))
-                    except Exception:
-                        network_disks.append((part.device, part.mountpoint, part.fstype, None, "Network"))
+                if 'remote' in opts or part.fstype in NETWORK_FSTYPES:
+                    candidates.append((part, "Network"))
                     continue
                 
-                if platform.system() == "Windows":
+                if is_windows:
                     try:
                         import ctypes
                         drive_type = ctypes.windll.kernel32.GetDriveTypeW(part.mountpoint)
                         
                         if drive_type == 2:  # DRIVE_REMOVABLE
-                            try:
-                                usage = psutil.disk_usage(part.mountpoint)
-                                removable_disks.append((part.device, part.mountpoint, part.fstype, usage, "Removable"))
-                            except Exception:
-                                removable_disks.append((part.device, part.mountpoint, part.fstype, None, "Removable"))
+                            candidates.append((part, "Removable"))
                             continue
                         
                         elif drive_type == 4:  # DRIVE_REMOTE
-                            try:
-                                usage = psutil.disk_usage(part.mountpoint)
-                                network_disks.append((part.device, part.mountpoint, part.fstype, usage, "Network"))
-                            except Exception:
-                                network_disks.append((part.device, part.mountpoint, part.fstype, None, "Network"))
+                            candidates.append((part, "Network"))
                             continue
                         
                         elif drive_type == 5:  # DRIVE_CDROM
                             optical_drives.append((part.device, part.mountpoint))
                             continue
                             
-                    except Exception:
-                        pass
+                    except Exception as e:
+                        note_exception(e)
                 
-                skip_fs = {'tmpfs', 'devtmpfs', 'squashfs', 'overlay', 'efivarfs'}
-                if part.fstype in skip_fs:
+                candidates.append((part, "Local"))
+            
+            # все точки монтирования опрашиваются параллельно, зависшие не блокируют отчет
+            with profile_step('statvfs'):
+                probed = self.disk_prober.probe([part.mountpoint for part, _ in candidates])
+            disk_io = self.get_disk_io()
+            
+            local_disks = []
+            network_disks = []
+            removable_disks = []
+            other_devices = []
+            for part, disk_type in candidates:
+                result = probed[part.mountpoint]
+                if disk_type == "Local" and result.status != 'ok':
+                    if result.status == 'unreachable':
+                        error = f"Нет ответа за {result.latency:.1f} с"
+                    else:
+                        error = "Недоступен"
+                    other_devices.append((part.device, part.mountpoint, error))
                     continue
                 
-                try:
-                    usage = psutil.disk_usage(part.mountpoint)
-                    local_disks.append((part.device, part.mountpoint, part.fstype, usage, "Local"))
-                except Exception:
-                    other_devices.append((part.device, part.mountpoint, "Недоступен"))
+                entry = (part.device, part.mountpoint, part.fstype, result, disk_type)
+                if disk_type == "Network":
+                    network_disks.append(entry)
+                elif disk_type == "Removable":
+                    removable_disks.append(entry)
+                else:
+                    local_disks.append(entry)
+            
+            disk_list = []
+            for device, mountpoint, fstype, result, disk_type in local_disks + network_disks + removable_disks:
+                usage = result.usage
+                disk_list.append({
+                    'device': device,
+                    'mountpoint': mountpoint,
+                    'fstype': fstype,
+                    'type': disk_type.lower(),
+                    'total': usage.total if usage else None,
+                    'used': usage.used if usage else None,
+                    'free': usage.free if usage else None,
+                    'percent': usage.percent if usage else None,
+                    'available': usage is not None,
+                    'status': result.status,
+                    'latency': result.latency,
+                    'aliases': aliases.get(mountpoint, []),
+                    'io': disk_io(device),
+                })
+            self.set_data('disks', disk_list)
+            self.set_data('optical', [
+                {'device': device, 'mountpoint': mountpoint} for device, mountpoint in optical_drives
+            ])
+            self.set_data('other', [
+                {
+                    'device': part.device,
+                    'mountpoint': part.mountpoint,
+                    'status': probed[part.mountpoint].status,
+                    'latency': probed[part.mountpoint].latency,
+                }
+                for part, disk_type in candidates
+                if disk_type == "Local" and probed[part.mountpoint].status != 'ok'
+            ])
             
             def print_disk_section(disks, title):
                 if not disks:
                     return
                 
                 self.print_and_capture(f"\n  [{title}]")
-                for i, (device, mountpoint, fstype, usage, disk_type) in enumerate(disks, 1):
+                for i, (device, mountpoint, fstype, result, disk_type) in enumerate(disks, 1):
                     self.print_and_capture(f"\n    Диск #{i}:")
                     self.print_and_capture(f"      Устройство: {device}")
                     self.print_and_capture(f"      Точка монтирования: {mountpoint}")
                     self.print_and_capture(f"      Тип: {disk_type}")
                     self.print_and_capture(f"      Файловая система: {fstype}")
+                    if mountpoint in aliases:
+                        self.print_and_capture(f"      Другие точки монтирования: {len(aliases[mountpoint])}")
                     
-                    if usage:
+                    if usage := result.usage:
                         self.print_and_capture(f"      Общий размер: {self.format_size(usage.total)}")
                         self.print_and_capture(f"      Использовано: {self.format_size(usage.used)}")
                         self.print_and_capture(f"      Свободно: {self.format_size(usage.free)}")
                         self.print_and_capture(f"      Заполнено: {usage.percent:.1f}%")
+                        self.print_disk_io(disk_io(device), "      ")
                         
+                    elif result.status == 'unreachable':
+                        self.print_and_capture(f"      Статус: Недоступен (нет ответа за {result.latency:.1f} с)")
                     else:
                         self.print_and_capture(f"      Статус: Недоступен")
             
@@ -370,21 +1907,64 @@ class SystemInfoCollector:
                 self.print_and_capture("  Нет доступных дисков для анализа")
         
         except Exception as e:
+            self.set_data('error', str(e))
             self.print_and_capture(f"  Ошибка получения информации о дисках: {str(e)}")
     
+    def print_net_rates(self, rates: Dict[str, float], speed: int) -> Optional[float]:
+        self.print_and_capture(f"    Трафик: прием {self.format_size(rates['bytes_recv'])}/s, "
+                               f"передача {self.format_size(rates['bytes_sent'])}/s")
+        self.print_and_capture(f"    Пакеты: прием {rates['packets_recv']:.1f}/s, передача {rates['packets_sent']:.1f}/s")
+        if rates['errin'] or rates['errout'] or rates['dropin'] or rates['dropout']:
+            self.print_and_capture(f"    Ошибки: прием {rates['errin']:.1f}/s, передача {rates['errout']:.1f}/s; "
+                                   f"отброшено: прием {rates['dropin']:.1f}/s, передача {rates['dropout']:.1f}/s")
+        
+        if speed > 0:
+            # канал полнодуплексный, поэтому загрузка - по более нагруженному направлению
+            utilization = max(rates['bytes_recv'], rates['bytes_sent']) * 8 / (speed * 1_000_000) * 100
+            self.print_and_capture(f"    Загрузка канала: {utilization:.1f}%")
+            return utilization
+        return None
+    
     def get_network_info(self):
+        import socket
+        
+        interface_list = []
+        groups = {}
+        self.set_data('interfaces', interface_list)
         self.print_and_capture(f"\n{' СЕТЕВЫЕ ИНТЕРФЕЙСЫ ':-^60}")
         
         try:
             interfaces = psutil.net_if_addrs()
             stats = psutil.net_if_stats()
+            with profile_step('net_io'):
+                before, after, elapsed = self.net_sampler.sample()
+            aggregate = self.net_aggregate
             
             for interface_name, addresses in interfaces.items():
                 if interface_name not in stats:
                     continue
                     
                 stat = stats[interface_name]
-                if interface_name.startswith('Loopback'):
+                if is_loopback(interface_name, stat):
+                    continue
+                
+                rates = counter_rates(before.get(interface_name), after.get(interface_name), elapsed, NET_RATE_FIELDS)
+                
+                # виртуальные интерфейсы контейнеров (veth*, cali*) сводим в одну запись на префикс
+                if aggregate and interface_name.startswith(aggregate):
+                    prefix = next(prefix for prefix in aggregate if interface_name.startswith(prefix))
+                    group = groups.get(prefix)
+                    if group is None:
+                        group = groups[prefix] = {
+                            'prefix': prefix,
+                            'count': 0,
+                            'up': 0,
+                            'rates': dict.fromkeys(NET_RATE_FIELDS, 0.0),
+                        }
+                    group['count'] += 1
+                    group['up'] += 1 if stat.isup else 0
+                    for name, value in rates.items():
+                        group['rates'][name] += value
                     continue
                 
                 self.print_and_capture(f"\n  Интерфейс: {interface_name}")
@@ -414,14 +1994,68 @@ class SystemInfoCollector:
                 
                 if stat.speed > 0:
                     self.print_and_capture(f"    Скорость: {stat.speed} Mbps")
+                
+                utilization = self.print_net_rates(rates, stat.speed)
+                
+                interface_list.append({
+                    'name': interface_name,
+                    'isup': stat.isup,
+                    'mac': mac_address,
+                    'ipv4': ipv4_addrs,
+                    'ipv6': ipv6_addrs,
+                    'speed': stat.speed,
+                    'rates': rates,
+                    'utilization': utilization,
+                })
+            
+            for prefix, group in groups.items():
+                self.print_and_capture(f"\n  Интерфейсы {prefix}*: {group['count']} шт., активно {group['up']}")
+                self.print_and_capture(f"    Статус: {'Активен' if group['up'] else 'Неактивен'}")
+                self.print_and_capture(f"    Трафик: прием {self.format_size(group['rates']['bytes_recv'])}/s, "
+                                       f"передача {self.format_size(group['rates']['bytes_sent'])}/s")
+            if groups:
+                self.set_data('aggregated', list(groups.values()))
                     
         except Exception as e:
+            self.set_data('error', str(e))
             self.print_and_capture(f"  Ошибка получения сетевой информации: {str(e)}")
     
+    def get_process_info(self):
+        self.print_and_capture(f"\n{' ПРОЦЕССЫ ':-^60}")
+        try:
+            with profile_step('process_iter'):
+                rows = self.process_sampler.sample()
+            self.set_data('count', len(rows))
+            self.print_and_capture(f"  Всего процессов: {len(rows)}")
+            
+            views = [
+                ('cpu', "ПО ЗАГРУЗКЕ CPU", 'cpu_percent', lambda value: f"{value:.1f}%"),
+                ('rss', "ПО ПАМЯТИ (RSS)", 'rss', self.format_size),
+                ('io', "ПО ВВОДУ-ВЫВОДУ", 'io_rate', lambda value: f"{self.format_size(value)}/s"),
+                ('fds', "ПО ОТКРЫТЫМ ДЕСКРИПТОРАМ", 'fds', str),
+            ]
+            for key, title, field_name, format_value in views:
+                top = top_processes(rows, field_name, self.top_count)
+                self.set_data(f"top_{key}", top)
+                if not top:
+                    continue
+                
+                self.print_and_capture(f"\n  [{title}]")
+                for row in top:
+                    self.print_and_capture(f"    {row['pid']:>7}  {row['name'][:24]:<24}  {format_value(row[field_name])}")
+        
+        except Exception as e:
+            self.set_data('error', str(e))
+            self.print_and_capture(f"  Ошибка получения списка процессов: {str(e)}")
+    
     def get_battery_info(self):
         try:
             battery = psutil.sensors_battery()
+            self.set_data('present', battery is not None)
             if battery:
+                self.set_data('percent', battery.percent)
+                self.set_data('power_plugged', battery.power_plugged)
+                self.set_data('secsleft', battery.secsleft if battery.secsleft not in (psutil.POWER_TIME_UNLIMITED, -1) else None)
                 self.print_and_capture(f"\n{' АККУМУЛЯТОР ':-^60}")
                 self.print_and_capture(f"  Заряд: {battery.percent}%")
                 status = "Заряжается" if battery.power_plugged else "Разряжается"
@@ -432,8 +2066,8 @@ class SystemInfoCollector:
                         hours = battery.secsleft // 3600
                         minutes = (battery.secsleft % 3600) // 60
                         self.print_and_capture(f"  Осталось: {hours} ч {minutes} мин")
-        except Exception:
-            pass
+        except Exception as e:
+            note_exception(e)
     
     def get_windows_specific_info(self):
         if platform.system() != "Windows":
@@ -442,6 +2076,8 @@ class SystemInfoCollector:
         self.print_and_capture(f"\n{' WINDOWS ИНФОРМАЦИЯ ':-^60}")
         
         try:
+            import subprocess
+            
             result = subprocess.check_output(
                 "ver",
                 shell=True,
@@ -449,6 +2085,7 @@ class SystemInfoCollector:
                 stderr=subprocess.DEVNULL
             ).strip()
             if result:
+                self.set_data('ver', result)
                 self.print_and_capture(f"  Командная строка: {result}")
             
             try:
@@ -457,11 +2094,13 @@ class SystemInfoCollector:
                                     r"SOFTWARE\Microsoft\Windows NT\CurrentVersion")
                 build_number = winreg.QueryValueEx(key, "CurrentBuildNumber")[0]
                 display_version = winreg.QueryValueEx(key, "DisplayVersion")[0]
+                self.set_data('build', build_number)
+                self.set_data('display_version', display_version)
                 self.print_and_capture(f"  Сборка: {build_number}")
                 self.print_and_capture(f"  Версия отображения: {display_version}")
                 winreg.CloseKey(key)
-            except:
-                pass
+            except Exception as e:
+                note_exception(e)
                 
             try:
                 import ctypes
@@ -469,24 +2108,271 @@ class SystemInfoCollector:
                 self.print_and_capture(f"  Пользователь: {getpass.getuser()}")
                 
                 is_admin = ctypes.windll.shell32.IsUserAnAdmin() != 0
+                self.set_data('user', getpass.getuser())
+                self.set_data('is_admin', is_admin)
                 self.print_and_capture(f"  Администратор: {'Да' if is_admin else 'Нет'}")
-            except:
-                pass
+            except Exception as e:
+                note_exception(e)
                 
-        except Exception:
+        except Exception as e:
+            note_exception(e)
             self.print_and_capture(f"  Не удалось получить информацию Windows")
     
+    def _get_watch_mounts(self) -> List[str]:
+        # список точек монтирования определяем один раз, на каждом такте только disk_usage
+        if self._watch_mounts is None:
+            mounts = []
+            try:
+                for part, _ in self.mount_filter.select(psutil.disk_partitions(all=False)):
+                    if part.fstype and 'cdrom' not in part.opts.lower():
+                        mounts.append(part.mountpoint)
+            except Exception as e:
+                note_exception(e)
+            self._watch_mounts = mounts
+        return self._watch_mounts
+    
+    def _get_loopback_names(self) -> frozenset:
+        # как и точки монтирования: флаги интерфейсов читаются один раз, не на каждом такте
+        if self._loopback_names is None:
+            try:
+                stats = psutil.net_if_stats()
+            except Exception as e:
+                note_exception(e)
+                stats = {}
+            self._loopback_names = frozenset(name for name, stat in stats.items() if is_loopback(name, stat))
+        return self._loopback_names
+    
+    def _get_gpu_loads(self) -> List[float]:
+        if self._watch_gpus is False:
+            return []
+        
+        if self._watch_gpus is None:
+            known_gpus = self.static_cache.data.get('gpus') if self.static_cache is not None else None
+            backend = self.get_gpu_backend()
+            # через GPUtil каждый такт - запуск nvidia-smi, не тратим его, если видеокарт заведомо нет
+            self._watch_gpus = backend is not None and not (backend.name == 'gputil' and known_gpus == [])
+            if not self._watch_gpus:
+                return []
+        
+        now = time.monotonic()
+        if now < self._gpu_retry_at:
+            return []
+        try:
+            backend = self.get_gpu_backend()
+            loads = backend.loads() if backend is not None else []
+        except Exception as e:
+            note_exception(e)
+            loads = []
+        if loads:
+            self._gpu_failures = 0
+        else:
+            # драйвер мог быть перезагружен или занят: опрос откладывается с растущей паузой, а не выключается навсегда
+            self._gpu_failures += 1
+            self._gpu_retry_at = now + min(GPU_RETRY_MAX_DELAY, 2 ** self._gpu_failures)
+        return loads
+    
+    def collect_sample(self) -> Dict[str, object]:
+        now = time.time()
+        cpu = self.cpu_sampler.sample(reset=True)
+        mem = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        
+        disks = {}
+        for mountpoint, result in self.disk_prober.probe(self._get_watch_mounts()).items():
+            if result.usage is not None:
+                disks[mountpoint] = result.usage.percent
+        
+        rx_rate = tx_rate = 0.0
+        net_before, net_after, net_elapsed = self.net_sampler.sample(reset=True)
+        loopback = self._get_loopback_names()
+        for name, counters in net_after.items():
+            # трафик через lo - не сеть, он только завышает rx/tx и срабатывание оповещений
+            if name in loopback or is_loopback(name):
+                continue
+            rates = counter_rates(net_before.get(name), counters, net_elapsed, ('bytes_recv', 'bytes_sent'))
+            rx_rate += rates['bytes_recv']
+            tx_rate += rates['bytes_sent']
+        
+        sensors = self.sensor_poller.sample()
+        pressure = {
+            resource + ('' if kind == 'some' else '_full'): values['avg10']
+            for resource, kinds in self.procfs_poller.pressure().items()
+            for kind, values in kinds.items()
+            if 'avg10' in values and not (resource == 'cpu' and kind == 'full')
+        }
+        vmstat = vmstat_rates(self.vmstat_sampler, reset=True)
+        container = None
+        if self.cgroup is not None:
+            stats = self.cgroup.sample(psutil.cpu_count(logical=True) or 1, mem.total, reset=True)
+            if stats['limited']:
+                container = {
+                    'cpu_percent': stats['cpu_percent'],
+                    'memory_percent': stats['memory_percent'],
+                    'memory_working_set': stats['memory_working_set'],
+                    'throttled_percent': stats['throttled_percent'],
+                }
+        
+        return {
+            'timestamp': now,
+            'cpu_percent': cpu.percent,
+            'ram_percent': mem.percent,
+            'ram_used': mem.used,
+            'swap_percent': swap.percent,
+            'disks': disks,
+            'net_rx_rate': rx_rate,
+            'net_tx_rate': tx_rate,
+            'gpu_load': self._get_gpu_loads(),
+            'temperatures': sensors['temperatures'],
+            'fans': sensors['fans'],
+            'cpu_freq': sensors['cpu_freq'],
+            'container': container,
+            'pressure': pressure,
+            'page_fault_rate': vmstat['pgfault'] if vmstat else None,
+            'major_fault_rate': vmstat['pgmajfault'] if vmstat else None,
+            'swap_in_rate': vmstat['pswpin'] if vmstat else None,
+            'swap_out_rate': vmstat['pswpout'] if vmstat else None,
+            'top_processes': [
+                {'pid': row['pid'], 'name': row['name'], 'cpu_percent': row['cpu_percent']}
+                for row in top_processes(self.process_sampler.sample(), 'cpu_percent', self.top_count)
+            ] if self.watch_processes else [],
+        }
+    
+    def format_sample(self, sample: Dict[str, object]) -> str:
+        parts = [
+            datetime.fromtimestamp(sample['timestamp']).strftime('%Y-%m-%d %H:%M:%S'),
+            f"CPU {sample['cpu_percent']:5.1f}%",
+            f"RAM {sample['ram_percent']:5.1f}%",
+            f"SWAP {sample['swap_percent']:5.1f}%",
+        ]
+        if sample['disks']:
+            parts.append("DISK " + " ".join(f"{mount}:{percent:.1f}%" for mount, percent in sample['disks'].items()))
+        parts.append(f"NET rx {self.format_size(sample['net_rx_rate'])}/s tx {self.format_size(sample['net_tx_rate'])}/s")
+        if sample['gpu_load']:
+            parts.append("GPU " + " ".join(f"{load:.1f}%" for load in sample['gpu_load']))
+        if sample['temperatures']:
+            parts.append(f"TEMP max {max(sample['temperatures'].values()):.0f}°C")
+        if sample['cpu_freq']:
+            parts.append(f"FREQ {min(sample['cpu_freq']):.0f}-{max(sample['cpu_freq']):.0f} MHz")
+        if sample['fans']:
+            parts.append(f"FAN min {min(sample['fans'].values()):.0f} RPM")
+        if container := sample['container']:
+            part = "CGROUP"
+            if container['cpu_percent'] is not None:
+                part += f" cpu {container['cpu_percent']:.1f}%"
+            if container['memory_percent'] is not None:
+                part += f" mem {container['memory_percent']:.1f}%"
+            if container['throttled_percent']:
+                part += f" throttled {container['throttled_percent']:.1f}%"
+            parts.append(part)
+        if sample['pressure']:
+            # avg10 "some": доля времени, когда хотя бы одна задача ждала ресурс
+            parts.append("PSI " + " ".join(
+                f"{resource}:{sample['pressure'][resource]:.1f}%" for resource in PSI_RESOURCES if resource in sample['pressure']
+            ))
+        if sample['page_fault_rate'] is not None:
+            parts.append(f"PGFAULT {sample['page_fault_rate']:.0f}/s major {sample['major_fault_rate']:.0f}/s "
+                         f"SWAPIO in {sample['swap_in_rate']:.0f} out {sample['swap_out_rate']:.0f} pg/s")
+        if sample['top_processes']:
+            parts.append("TOP " + " ".join(
+                f"{row['name']}({row['pid']}):{row['cpu_percent']:.1f}%" for row in sample['top_processes']
+            ))
+        return " | ".join(parts)
+    
+    def watch(self, interval: float = 1.0, count: Optional[int] = None, output=None, store=None, alerts=None) -> float:
+        ticks = 0
+        cpu_spent = 0.0
+        # окно замера процессов не должно быть длиннее такта, иначе такты начнут пропускаться
+        self.process_sampler.window = min(self.process_sampler.window, interval)
+        next_tick = time.monotonic()
+        
+        try:
+            while count is None or ticks < count:
+                # учитываем и дочерние процессы (nvidia-smi), на Windows их поля равны 0
+                before = os.times()
+                sample = self.collect_sample()
+                if self.output_format == 'text':
+                    line = self.format_sample(sample)
+                else:
+                    # в режиме мониторинга json и ndjson - одна запись на строку
+                    line = json.dumps(sample, ensure_ascii=False)
+                if store is not None:
+                    store.append_sample(sample)
+                after = os.times()
+                cpu_spent += sum(after[:4]) - sum(before[:4])
+                ticks += 1
+                
+                print(line, flush=True)
+                if output is not None:
+                    output.write(line + '\n')
+                    output.flush()
+                
+                if alerts is not None:
+                    # после вывода такта, чтобы оповещение шло следом за строкой, которая его вызвала
+                    before = os.times()
+                    alerts.evaluate(sample)
+                    after = os.times()
+                    cpu_spent += sum(after[:4]) - sum(before[:4])
+                
+                if count is not None and ticks >= count:
+                    break
+                
+                next_tick += interval
+                delay = next_tick - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # не успели - пропускаем такты, а не наверстываем их пачкой
+                    next_tick = time.monotonic()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.sensor_poller.close()
+            self.procfs_poller.close()
+            self.close_gpu_backend()
+            if self.cgroup is not None:
+                self.cgroup.close()
+            self.save_static_cache()
+        
+        overhead = cpu_spent / ticks / interval * 100 if ticks and interval > 0 else 0.0
+        if ticks:
+            # итог не должен смешиваться с потоком записей json/ndjson
+            stream = sys.stdout if self.output_format == 'text' else sys.stderr
+            print(f"\nТактов: {ticks}, CPU сборщика: {cpu_spent / ticks * 1000:.2f} мс/такт "
+                  f"({overhead:.2f}% ядра при интервале {interval:g} с)", file=stream)
+            if overhead >= 1.0:
+                print("Внимание: накладные расходы сборщика превышают 1% ядра", file=stream)
+        return overhead
+    
+    def status_stream(self):
+        # сообщения о ходе работы не должны попадать в поток json/ndjson
+        return sys.stdout if self.output_format == 'text' else sys.stderr
+    
     def save_to_file(self, filename: str = "system_info.txt"):
         try:
             with open(filename, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(self.output_lines))
-            print(f"\nОтчет сохранен в файл: {filename}")
+                self.render(f)
+            print(f"\nОтчет сохранен в файл: {filename}", file=self.status_stream())
             return True
         except Exception as e:
-            print(f"\nОшибка при сохранении в файл: {str(e)}")
+            print(f"\nОшибка при сохранении в файл: {str(e)}", file=self.status_stream())
             return False
 
 
+def show_history(path: str, tier: str = '1s', last: Optional[float] = None, output_format: str = 'text'):
+    import history
+    
+    store = history.HistoryStore(path)
+    try:
+        start = time.time() - last if last is not None else None
+        for record in store.records(tier, start=start):
+            if output_format == 'text':
+                print(history.format_record(record, SystemInfoCollector.format_size))
+            else:
+                print(json.dumps(history.record_to_dict(record)))
+    finally:
+        store.close()
+
+
 def print_help():
     print("""
 
@@ -499,6 +2385,44 @@ def print_help():
   -o ФАЙЛ, --output ФАЙЛ
                         Сохранить отчет в указанный файл
   -q, --quiet           Только сохранить в файл, не выводить на экран
+  -f ФОРМАТ, --format ФОРМАТ
+                        Формат вывода: text, json, ndjson (по умолчанию: text)
+  -t СЕК, --timeout СЕК Тайм-аут сбора одной секции (по умолчанию: 10)
+  --cpu-window СЕК      Минимальное окно измерения загрузки CPU (по умолчанию: 0.05 для краткого
+                        отчета, 0.5 для полного); шаг загрузки ядра - примерно 0.01 / СЕК * 100%,
+                        то есть около 20% при 0.05 и 2% при 0.5
+  --disk-timeout СЕК    Тайм-аут опроса одной точки монтирования (по умолчанию: 2)
+  --fs-include СПИСОК   Показывать только эти файловые системы (через запятую)
+  --fs-exclude СПИСОК   Скрывать эти файловые системы
+                        (по умолчанию: tmpfs,devtmpfs,squashfs,overlay,efivarfs)
+  --mount-include МАСКИ Показывать только точки монтирования по маскам (/data/*,/)
+  --mount-exclude МАСКИ Скрывать точки монтирования по маскам (/var/lib/kubelet/*)
+  --device-exclude МАСКИ
+                        Скрывать устройства по маскам (/dev/loop*)
+  --no-dedupe           Не объединять bind-монтирования одной файловой системы
+  --top N               Число процессов в каждом рейтинге (по умолчанию: 5, 0 - не показывать);
+                        в режиме мониторинга добавляет топ процессов по CPU
+  --proc-window СЕК     Окно измерения загрузки CPU процессами (по умолчанию: 0.5)
+  --net-aggregate СПИСОК
+                        Префиксы интерфейсов, сводимых в одну запись (по умолчанию: veth,cali)
+  --no-cache            Не использовать кэш статических данных о железе
+  -w СЕК, --watch СЕК   Непрерывный мониторинг с заданным интервалом
+  --count N             Количество тактов в режиме мониторинга
+  --store ФАЙЛ          Сохранять такты мониторинга в файл истории
+  --history ФАЙЛ        Показать записи из файла истории
+  --tier УРОВЕНЬ        Уровень истории: 1s, 1m, 1h (по умолчанию: 1s)
+  --last СЕК            Показать историю только за последние СЕК секунд
+  --alerts ФАЙЛ         Проверять правила оповещений из файла JSON на каждом такте мониторинга
+  --serve [АДРЕС:]ПОРТ  Запустить экспортер метрик Prometheus (/metrics)
+  --max-age СЕК         Максимальный возраст снимка метрик (по умолчанию: 15)
+  --profile             Вывести в stderr время, CPU, запуски процессов и ошибки каждой секции
+  --profile-json ФАЙЛ   Сохранить профиль сбора в файл JSON (включает --profile)
+  --snapshot ФАЙЛ       Сохранить снимок системы (полный отчет в JSON) для --diff
+  --diff СТАРЫЙ НОВЫЙ   Показать изменения между двумя снимками
+                        (код выхода: 0 - нет изменений, 1 - есть, 2 - ошибка)
+  --tolerance СПИСОК    Допуски для чисел при --diff: ШАБЛОН=ЧИСЛО или ШАБЛОН=N%
+                        (disks.*.percent=0.5,memory.used=10%)
+  --ignore МАСКИ        Не сравнивать поля по маскам (network.interfaces.*.ipv6)
 
 ПРИМЕРЫ:
   python main.py                      # Краткий отчет (по умолчанию)
@@ -506,6 +2430,18 @@ def print_help():
   python main.py -o res.txt           # Краткий отчет с сохранением в файл
   python main.py -v -o full_res.txt   # Полный отчет с сохранением в файл
   python main.py -q                   # Тихий режим (автосохранение)
+  python main.py -w 1                 # Мониторинг раз в секунду (Ctrl+C для выхода)
+  python main.py -w 1 --store h.bin   # Мониторинг с записью истории
+  python main.py --history h.bin --tier 1m --last 3600
+                                      # Средние по минутам за последний час
+  python main.py -w 5 --alerts alerts.json
+                                      # Мониторинг с оповещениями
+  python main.py --serve 9100         # Экспортер для Prometheus
+  python main.py -v -f json -o r.json # Полный отчет в формате JSON
+  python main.py -v --profile         # Какая секция отчета собирается дольше всех
+  python main.py --snapshot before.json
+  python main.py --diff before.json after.json
+                                      # Что изменилось на машине после выкладки
 
 АВТОР: System Info Collector Team
 ЛИЦЕНЗИЯ: MIT
@@ -517,6 +2453,38 @@ def main():
     verbose = False
     output_file = None
     quiet = False
+    probe_timeout = 10.0
+    cpu_window = None
+    use_cache = True
+    watch_interval = None
+    watch_count = None
+    store_path = None
+    alerts_path = None
+    history_path = None
+    history_tier = '1s'
+    history_last = None
+    serve_address = None
+    max_age = 15.0
+    output_format = 'text'
+    disk_timeout = 2.0
+    filter_options = {}
+    net_aggregate = DEFAULT_NET_AGGREGATE
+    top_count = 5
+    process_window = 0.5
+    watch_processes = False
+    profile = False
+    profile_json = None
+    snapshot_path = None
+    diff_paths = None
+    diff_tolerances = ""
+    diff_ignore = []
+    list_options = {
+        '--fs-include': 'include_fs',
+        '--fs-exclude': 'exclude_fs',
+        '--mount-include': 'include_mounts',
+        '--mount-exclude': 'exclude_mounts',
+        '--device-exclude': 'exclude_devices',
+    }
     
     args = sys.argv[1:]
     
@@ -537,6 +2505,152 @@ def main():
                 sys.exit(1)
         elif arg in ('-q', '--quiet'):
             quiet = True
+        elif arg in ('-t', '--timeout'):
+            try:
+                probe_timeout = float(args[i + 1])
+                i += 1
+            except (IndexError, ValueError):
+                print("Ошибка: для параметра -t необходимо указать число секунд")
+                sys.exit(1)
+        elif arg in ('-w', '--watch'):
+            try:
+                watch_interval = float(args[i + 1])
+                i += 1
+            except (IndexError, ValueError):
+                print("Ошибка: для параметра -w необходимо указать интервал в секундах")
+                sys.exit(1)
+            if watch_interval <= 0:
+                print("Ошибка: интервал мониторинга должен быть больше нуля")
+                sys.exit(1)
+        elif arg == '--diff':
+            if i + 2 >= len(args):
+                print("Ошибка: для параметра --diff необходимо указать два файла снимков")
+                sys.exit(1)
+            diff_paths = (args[i + 1], args[i + 2])
+            i += 2
+        elif arg in ('--snapshot', '--tolerance', '--ignore'):
+            if i + 1 >= len(args):
+                print(f"Ошибка: для параметра {arg} необходимо указать значение")
+                sys.exit(1)
+            if arg == '--snapshot':
+                snapshot_path = args[i + 1]
+            elif arg == '--tolerance':
+                diff_tolerances += "," + args[i + 1]
+            else:
+                diff_ignore.extend(item.strip() for item in args[i + 1].split(',') if item.strip())
+            i += 1
+        elif arg in ('--store', '--history', '--tier', '--alerts'):
+            if i + 1 >= len(args):
+                print(f"Ошибка: для параметра {arg} необходимо указать значение")
+                sys.exit(1)
+            if arg == '--store':
+                store_path = args[i + 1]
+            elif arg == '--alerts':
+                alerts_path = args[i + 1]
+            elif arg == '--history':
+                history_path = args[i + 1]
+            elif args[i + 1] in ('1s', '1m', '1h'):
+                history_tier = args[i + 1]
+            else:
+                print("Ошибка: уровень истории должен быть 1s, 1m или 1h")
+                sys.exit(1)
+            i += 1
+        elif arg == '--serve':
+            if i + 1 >= len(args):
+                print("Ошибка: для параметра --serve необходимо указать порт")
+                sys.exit(1)
+            host, _, port = args[i + 1].rpartition(':')
+            if not port.isdigit():
+                print("Ошибка: неверный порт для параметра --serve")
+                sys.exit(1)
+            serve_address = (host or "0.0.0.0", int(port))
+            i += 1
+        elif arg == '--max-age':
+            try:
+                max_age = float(args[i + 1])
+                i += 1
+            except (IndexError, ValueError):
+                print("Ошибка: для параметра --max-age необходимо указать число секунд")
+                sys.exit(1)
+        elif arg == '--last':
+            try:
+                history_last = float(args[i + 1])
+                i += 1
+            except (IndexError, ValueError):
+                print("Ошибка: для параметра --last необходимо указать число секунд")
+                sys.exit(1)
+        elif arg == '--count':
+            try:
+                watch_count = int(args[i + 1])
+                i += 1
+            except (IndexError, ValueError):
+                print("Ошибка: для параметра --count необходимо указать число тактов")
+                sys.exit(1)
+        elif arg in ('-f', '--format'):
+            if i + 1 < len(args) and args[i + 1] in RENDERERS:
+                output_format = args[i + 1]
+                i += 1
+            else:
+                print(f"Ошибка: для параметра -f необходимо указать формат: {', '.join(RENDERERS)}")
+                sys.exit(1)
+        elif arg == '--no-cache':
+            use_cache = False
+        elif arg == '--profile':
+            profile = True
+        elif arg == '--profile-json':
+            if i + 1 < len(args):
+                profile_json = args[i + 1]
+                profile = True
+                i += 1
+            else:
+                print("Ошибка: для параметра --profile-json необходимо указать имя файла")
+                sys.exit(1)
+        elif arg in list_options:
+            if i + 1 < len(args):
+                values = [value.strip() for value in args[i + 1].split(',')]
+                filter_options[list_options[arg]] = [value for value in values if value]
+                i += 1
+            else:
+                print(f"Ошибка: для параметра {arg} необходимо указать список через запятую")
+                sys.exit(1)
+        elif arg == '--top':
+            try:
+                top_count = max(0, int(args[i + 1]))
+                watch_processes = top_count > 0
+                i += 1
+            except (IndexError, ValueError):
+                print("Ошибка: для параметра --top необходимо указать число процессов")
+                sys.exit(1)
+        elif arg == '--proc-window':
+            try:
+                process_window = float(args[i + 1])
+                i += 1
+            except (IndexError, ValueError):
+                print("Ошибка: для параметра --proc-window необходимо указать число секунд")
+                sys.exit(1)
+        elif arg == '--net-aggregate':
+            if i + 1 < len(args):
+                net_aggregate = tuple(prefix.strip() for prefix in args[i + 1].split(',') if prefix.strip())
+                i += 1
+            else:
+                print("Ошибка: для параметра --net-aggregate необходимо указать список префиксов")
+                sys.exit(1)
+        elif arg == '--no-dedupe':
+            filter_options['dedupe'] = False
+        elif arg == '--disk-timeout':
+            try:
+                disk_timeout = float(args[i + 1])
+                i += 1
+            except (IndexError, ValueError):
+                print("Ошибка: для параметра --disk-timeout необходимо указать число секунд")
+                sys.exit(1)
+        elif arg == '--cpu-window':
+            try:
+                cpu_window = float(args[i + 1])
+                i += 1
+            except (IndexError, ValueError):
+                print("Ошибка: для параметра --cpu-window необходимо указать число секунд")
+                sys.exit(1)
         else:
             print(f"Неизвестный параметр: {arg}")
             print_help()
@@ -544,17 +2658,121 @@ def main():
         
         i += 1
     
-    collector = SystemInfoCollector(verbose=verbose)
+    if history_path is not None:
+        try:
+            show_history(history_path, history_tier, history_last, output_format)
+        except (OSError, ValueError) as e:
+            print(f"Ошибка чтения истории: {str(e)}")
+            sys.exit(1)
+        return
+    
+    if diff_paths is not None:
+        import snapshot
+        try:
+            tolerances = snapshot.parse_tolerances(diff_tolerances)
+            result = snapshot.diff_snapshots(snapshot.load_snapshot(diff_paths[0]), snapshot.load_snapshot(diff_paths[1]),
+                                             tolerances, diff_ignore)
+        except (OSError, ValueError) as e:
+            print(f"Ошибка сравнения снимков: {str(e)}")
+            sys.exit(2)
+        snapshot.render_diff(result, sys.stdout, output_format)
+        # как у diff: 1 - есть изменения
+        sys.exit(1 if result['changes'] else 0)
+    
+    if alerts_path is not None and watch_interval is None:
+        print("Ошибка: оповещения работают только в режиме мониторинга (-w)")
+        sys.exit(1)
+    
+    if snapshot_path is not None:
+        # снимок - всегда полный отчет в JSON: по нему потом считается --diff
+        verbose = True
+    if serve_address is not None and not watch_processes:
+        # топ процессов в экспортер не входит, без явного --top не тратим на него время
+        top_count = 0
+    
+    collector = SystemInfoCollector(verbose=verbose, probe_timeout=probe_timeout,
+                                    cpu_window=cpu_window, use_cache=use_cache,
+                                    output_format=output_format, disk_timeout=disk_timeout,
+                                    mount_filter=MountFilter(**filter_options), net_aggregate=net_aggregate,
+                                    top_count=top_count, process_window=process_window,
+                                    watch_processes=watch_processes, profile=profile)
+    
+    if snapshot_path is not None:
+        collector.collect_verbose()
+        try:
+            with open(snapshot_path, 'w', encoding='utf-8') as f:
+                collector.render(f, 'json')
+        except OSError as e:
+            print(f"Ошибка при сохранении снимка: {str(e)}")
+            sys.exit(1)
+        print(f"Снимок сохранен в файл: {snapshot_path}")
+        return
+    
+    if serve_address is not None:
+        import exporter
+        
+        try:
+            exporter.serve(collector, serve_address[0], serve_address[1], max_age=max_age)
+        except OSError as e:
+            print(f"Ошибка запуска экспортера: {str(e)}")
+            sys.exit(1)
+        return
     
     if quiet:
         original_stdout = sys.stdout
         sys.stdout = open(os.devnull, 'w')
     
     try:
+        if watch_interval is not None:
+            filename = output_file or ("system_info.txt" if quiet else None)
+            output = open(filename, 'a', encoding='utf-8') if filename else None
+            store = None
+            alerts = None
+            if store_path is not None:
+                import history
+                store = history.HistoryStore(store_path)
+            if alerts_path is not None:
+                import alerts as alerting
+                try:
+                    alerts = alerting.load_engine(alerts_path, watch_interval, output_format)
+                except (OSError, ValueError) as e:
+                    print(f"Ошибка в файле правил оповещений: {str(e)}")
+                    sys.exit(1)
+            try:
+                collector.watch(watch_interval, count=watch_count, output=output, store=store, alerts=alerts)
+            finally:
+                if output is not None:
+                    output.close()
+                if store is not None:
+                    store.close()
+                if alerts is not None:
+                    alerts.close()
+                if quiet:
+                    sys.stdout.close()
+                    sys.stdout = original_stdout
+            return
+        
+        started = time.perf_counter()
+        times_before = os.times()
         if verbose:
-            collector.get_verbose_info()
+            collector.collect_verbose()
         else:
-            collector.get_basic_info()
+            collector.collect_basic()
+        # json/ndjson с -o пишется только в файл: stdout остается пустым, а не смесью отчета и сообщений
+        if not (output_file and output_format != 'text'):
+            collector.render()
+        
+        if profile:
+            total_wall = time.perf_counter() - started
+            times_after = os.times()
+            total_cpu = sum(times_after[:4]) - sum(times_before[:4])
+            # профиль идет в stderr, чтобы не портить json-отчет в stdout
+            render_profile(collector.report, sys.stderr, total_wall, total_cpu)
+            if profile_json:
+                try:
+                    save_profile(collector.report, profile_json, total_wall, total_cpu)
+                except OSError as e:
+                    print(f"Ошибка при сохранении профиля: {str(e)}", file=sys.stderr)
         
         if quiet:
             sys.stdout.close()
@@ -564,6 +2782,9 @@ def main():
             filename = output_file
         elif quiet:
             filename = "system_info.txt"
+        elif output_format != 'text':
+            # машиночитаемый вывод не смешиваем с интерактивным вопросом
+            return
         else:
             response = input("\nСохранить отчет в файл? (y/n/д/н): ").lower()
             if response in ('y', 'д', 'да', 'yes'):
@@ -576,10 +2797,10 @@ def main():
         
         if collector.save_to_file(filename):
             if not quiet:
-                print(f"Отчет успешно сохранен в файл: {filename}")
+                print(f"Отчет успешно сохранен в файл: {filename}", file=collector.status_stream())
         else:
             if not quiet:
-                print("Не удалось сохранить отчет в файл")
+                print("Не удалось сохранить отчет в файл", file=collector.status_stream())
     
     except KeyboardInterrupt:
         if not quiet:
@@ -0,0 +1,249 @@
+import fnmatch
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+
+# списки записей сравниваются как словари по ключу: O(n) вместо попарного сравнения
+LIST_KEYS = {
+    'disks.disks': ('mountpoint',),
+    'disks.optical': ('mountpoint',),
+    'disks.other': ('mountpoint',),
+    'network.interfaces': ('name',),
+    'network.aggregated': ('prefix',),
+    'gpu.gpus': ('index',),
+    'sensors.temperatures': ('chip', 'label'),
+    'sensors.fans': ('chip', 'label'),
+}
+
+# поля, которые меняются от запуска к запуску сами по себе
+DEFAULT_IGNORE = (
+    'processes',
+    'processes.*',
+    'uptime.uptime',
+    'cpu.percent',
+    'cpu.per_cpu',
+    'cpu.times.*',
+    'cpu.freq_current',
+    'pressure.pressure.*',
+    'pressure.vmstat_rates.*',
+    'pressure.meminfo.Dirty',
+    'pressure.meminfo.Writeback',
+    'sensors.cpu_freq',
+    'sensors.temperatures.*.current',
+    'sensors.fans.*.current',
+    'sensors.throttling.*',
+    'container.cpu_percent',
+    'container.nr_*',
+    'container.throttled_*',
+    'disks.*.latency',
+    'disks.*.io',
+    'disks.*.io.*',
+    'network.interfaces.*.rates.*',
+    'network.aggregated.*.rates.*',
+    'network.interfaces.*.utilization',
+    'gpu.gpus.*.load',
+    'gpu.gpus.*.temperature',
+    'gpu.gpus.*.power',
+    'gpu.gpus.*.clock_*',
+    'gpu.gpus.*.memory_used',
+)
+
+# допуски для чисел: число - абсолютный, "N%" - относительный; первый совпавший шаблон выигрывает,
+# без совпадения числа сравниваются точно
+DEFAULT_TOLERANCES = (
+    ('*percent', 1.0),
+    ('memory.*', '5%'),
+    ('container.memory_*', '5%'),
+    ('pressure.meminfo.*', '10%'),
+    ('disks.*.used', '1%'),
+    ('disks.*.free', '1%'),
+)
+
+Tolerance = Union[float, str]
+
+
+def parse_tolerances(text: str) -> List[Tuple[str, Tolerance]]:
+    # "disks.*.percent=0.5,memory.used=10%"
+    result = []
+    for item in text.split(','):
+        if not item.strip():
+            continue
+        pattern, sep, value = item.partition('=')
+        if not sep or not pattern.strip():
+            raise ValueError(f"допуск должен иметь вид ШАБЛОН=ЗНАЧЕНИЕ: {item}")
+        value = value.strip()
+        try:
+            float(value[:-1] if value.endswith('%') else value)
+        except ValueError:
+            raise ValueError(f"неверное значение допуска: {item}") from None
+        result.append((pattern.strip(), value if value.endswith('%') else float(value)))
+    return result
+
+
+def load_snapshot(path: str) -> Dict[str, object]:
+    with open(path, 'r', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    if not isinstance(snapshot, dict) or not isinstance(snapshot.get('sections'), dict):
+        raise ValueError(f"{path}: это не снимок сборщика (нет поля sections)")
+    return snapshot
+
+
+class SnapshotDiff:
+    def __init__(self, tolerances=(), ignore=()):
+        self.tolerances = list(tolerances) + list(DEFAULT_TOLERANCES)
+        self.ignore = tuple(ignore) + DEFAULT_IGNORE
+        # шаблоны проверяются один раз на обобщенный путь ("disks.disks.*.percent"),
+        # а не на каждую из тысяч точек монтирования
+        self._ignored: Dict[str, bool] = {}
+        self._tolerance: Dict[str, Optional[Tolerance]] = {}
+
+    def is_ignored(self, pattern_path: str) -> bool:
+        ignored = self._ignored.get(pattern_path)
+        if ignored is None:
+            ignored = any(fnmatch.fnmatchcase(pattern_path, mask) for mask in self.ignore)
+            self._ignored[pattern_path] = ignored
+        return ignored
+
+    def tolerance(self, pattern_path: str) -> Optional[Tolerance]:
+        if pattern_path not in self._tolerance:
+            self._tolerance[pattern_path] = next(
+                (value for mask, value in self.tolerances if fnmatch.fnmatchcase(pattern_path, mask)), None
+            )
+        return self._tolerance[pattern_path]
+
+    def within(self, pattern_path: str, old: float, new: float) -> bool:
+        tolerance = self.tolerance(pattern_path)
+        if tolerance is None:
+            return old == new
+        if isinstance(tolerance, str):
+            return abs(new - old) <= float(tolerance[:-1]) / 100 * max(abs(old), abs(new))
+        return abs(new - old) <= tolerance
+
+    def compare(self, old: Dict[str, object], new: Dict[str, object]) -> List[Dict[str, object]]:
+        changes = []
+        self._walk(old.get('sections', {}), new.get('sections', {}), '', '', changes)
+        return changes
+
+    @staticmethod
+    def _is_number(value) -> bool:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    def _walk(self, old, new, path: str, pattern: str, changes: list):
+        if isinstance(old, dict) and isinstance(new, dict):
+            missing = object()
+            for key, old_value in old.items():
+                new_value = new.get(key, missing)
+                # равные значения (и целые равные поддеревья) отсекаются сравнением на C до сборки путей
+                if old_value == new_value:
+                    continue
+                child_pattern = f"{pattern}.{key}" if pattern else str(key)
+                if self.is_ignored(child_pattern):
+                    continue
+                child = f"{path}.{key}" if path else str(key)
+                if new_value is missing:
+                    changes.append({'change': 'removed', 'path': child, 'old': old_value, 'new': None})
+                else:
+                    self._walk(old_value, new_value, child, child_pattern, changes)
+            if new.keys() != old.keys():
+                for key in new.keys() - old.keys():
+                    child_pattern = f"{pattern}.{key}" if pattern else str(key)
+                    if not self.is_ignored(child_pattern):
+                        child = f"{path}.{key}" if path else str(key)
+                        changes.append({'change': 'added', 'path': child, 'old': None, 'new': new[key]})
+            return
+
+        fields = LIST_KEYS.get(pattern)
+        if fields is not None and isinstance(old, list) and isinstance(new, list):
+            self._walk_keyed(old, new, fields, path, pattern, changes)
+            return
+
+        if self._is_number(old) and self._is_number(new):
+            if not self.within(pattern, old, new):
+                changes.append({'change': 'changed', 'path': path, 'old': old, 'new': new})
+        elif old != new:
+            changes.append({'change': 'changed', 'path': path, 'old': old, 'new': new})
+
+    def _walk_keyed(self, old: list, new: list, fields, path: str, pattern: str, changes: list):
+        def index(items: list) -> Dict[str, object]:
+            if len(fields) == 1:
+                name = fields[0]
+                keys = [(str(item.get(name)), item) for item in items if isinstance(item, dict)]
+            else:
+                keys = [
+                    ("/".join(str(item.get(name)) for name in fields), item)
+                    for item in items if isinstance(item, dict)
+                ]
+            result = dict(keys)
+            if len(result) == len(keys):
+                return result
+            # повторы ключа (coretemp/Core 0 у каждого сокета) различаются порядковым номером: "Core 0#2"
+            result = {}
+            seen: Dict[str, int] = {}
+            for key, item in keys:
+                ordinal = seen[key] = seen.get(key, 0) + 1
+                result[key if ordinal == 1 else f"{key}#{ordinal}"] = item
+            return result
+
+        old_items = index(old)
+        new_items = index(new)
+        item_pattern = f"{pattern}.*"
+        for key, item in old_items.items():
+            new_item = new_items.get(key)
+            if new_item is None:
+                changes.append({'change': 'removed', 'path': f"{path}[{key}]", 'old': item, 'new': None})
+            elif new_item != item:
+                self._walk(item, new_item, f"{path}[{key}]", item_pattern, changes)
+        for key, item in new_items.items():
+            if key not in old_items:
+                changes.append({'change': 'added', 'path': f"{path}[{key}]", 'old': None, 'new': item})
+
+
+def diff_snapshots(old: Dict[str, object], new: Dict[str, object], tolerances=(), ignore=()) -> Dict[str, object]:
+    return {
+        'old': old.get('timestamp'),
+        'new': new.get('timestamp'),
+        'changes': SnapshotDiff(tolerances, ignore).compare(old, new),
+    }
+
+
+def format_value(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.6g}"
+    if isinstance(value, dict):
+        # добавленная/удаленная запись: только короткие поля, без вложенных списков
+        return ", ".join(f"{key}={item}" for key, item in value.items() if not isinstance(item, (dict, list)))
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def render_diff(result: Dict[str, object], stream, output_format: str = 'text'):
+    if output_format == 'json':
+        json.dump(result, stream, ensure_ascii=False, indent=2, default=str)
+        stream.write("\n")
+        return
+    if output_format == 'ndjson':
+        for change in result['changes']:
+            stream.write(json.dumps(change, ensure_ascii=False, default=str) + "\n")
+        return
+
+    timestamps = [
+        datetime.fromtimestamp(value).strftime('%Y-%m-%d %H:%M:%S') if value else "?"
+        for value in (result['old'], result['new'])
+    ]
+    stream.write(f"Снимки: {timestamps[0]} -> {timestamps[1]}\n")
+    changes = result['changes']
+    if not changes:
+        stream.write("Изменений нет\n")
+        return
+    for change in sorted(changes, key=lambda item: item['path']):
+        if change['change'] == 'added':
+            stream.write(f"  + {change['path']}: {format_value(change['new'])}\n")
+        elif change['change'] == 'removed':
+            stream.write(f"  - {change['path']}: {format_value(change['old'])}\n")
+        else:
+            old, new = change['old'], change['new']
+            delta = ""
+            if SnapshotDiff._is_number(old) and SnapshotDiff._is_number(new):
+                delta = f" ({new - old:+.6g})"
+            stream.write(f"  ~ {change['path']}: {format_value(old)} -> {format_value(new)}{delta}\n")
+    stream.write(f"Изменений: {len(changes)}\n")
@@ -0,0 +1,54 @@
+import pytest
+
+import alerts
+
+
+def tick(timestamp, **fields):
+    return dict(fields, timestamp=timestamp)
+
+
+def test_disk_window_is_kept_per_mount():
+    engine = alerts.AlertEngine([alerts.Rule('disk_full', 'disk', '>', 90, duration=10, interval=5)], [])
+    # каждый диск был выше порога только один такт из двух - это не "10 секунд подряд"
+    assert engine.evaluate(tick(0, disks={'/a': 95, '/b': 10})) == []
+    assert engine.evaluate(tick(5, disks={'/a': 10, '/b': 95})) == []
+
+    events = engine.evaluate(tick(10, disks={'/a': 10, '/b': 96}))
+    assert [(event['key'], event['state']) for event in events] == [('/b', 'firing')]
+    # пропавшая точка монтирования закрывает оповещение и не держит окно
+    events = engine.evaluate(tick(15, disks={'/a': 10}))
+    assert [(event['key'], event['state'], event['value']) for event in events] == [('/b', 'resolved', None)]
+    assert set(engine.rules[0].windows) == {'/a'}
+
+
+def test_aggregate_keeps_single_window():
+    rule = alerts.Rule('disk_full', 'disk', '>', 90, duration=10, interval=5, aggregate='max')
+    engine = alerts.AlertEngine([rule], [])
+    engine.evaluate(tick(0, disks={'/a': 95, '/b': 10}))
+    events = engine.evaluate(tick(5, disks={'/a': 10, '/b': 95}))
+    assert [(event['key'], event['state']) for event in events] == [(None, 'firing')]
+
+
+def test_non_numeric_entries_are_skipped():
+    rule = alerts.Rule('hot', 'temperature', '>', 80)
+    assert rule.extract({'temperatures': {'a': None, 'b': 85, 'c': 'n/a', 'd': True}}) == {'b': 85.0}
+    rule = alerts.Rule('throttled', 'container', '>', 10, key='throttled_percent')
+    assert rule.extract({'container': {'throttled_percent': None}}) == {}
+
+
+def test_record_metrics_require_key():
+    with pytest.raises(ValueError):
+        alerts.Rule('cgroup', 'container', '>', 90)
+    with pytest.raises(ValueError):
+        alerts.Rule('psi', 'psi', '>', 10)
+
+
+def test_failing_rule_does_not_stop_evaluation(capsys):
+    class BrokenRule(alerts.Rule):
+        def extract(self, sample):
+            raise RuntimeError("boom")
+
+    engine = alerts.AlertEngine([BrokenRule('broken', 'cpu', '>', 0), alerts.Rule('cpu', 'cpu', '>', 50)], [])
+    events = engine.evaluate(tick(0, cpu_percent=99.0))
+    assert [event['rule'] for event in events] == ['cpu']
+    assert "boom" in capsys.readouterr().err
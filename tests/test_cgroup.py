@@ -0,0 +1,122 @@
+import os
+import time
+
+import pytest
+
+import cgroup
+import fake_backend
+
+GROUP = os.path.join('kubepods', 'pod-fake', 'container')
+
+
+def open_reader(tmp_path, version):
+    sysfs, procfs = str(tmp_path / 'sys'), str(tmp_path / 'proc')
+    fake_backend.build_cgroup(sysfs, procfs, fake_backend.FakeScale(cgroup=version))
+    root = os.path.join(sysfs, 'fs', 'cgroup')
+    reader = cgroup.CgroupReader(root, os.path.join(procfs, 'self', 'cgroup'), window=0.0)
+    return reader, root
+
+
+def write(path, content):
+    # перезапись того же файла: CgroupReader держит дескриптор и перечитывает его через pread
+    with open(path, 'w') as f:
+        f.write(content + '\n')
+
+
+def advance(reader, seconds=1.0):
+    # счетчики сняты prime(); окно отодвигается назад вместо сна
+    reader._started = time.monotonic() - seconds
+
+
+@pytest.mark.parametrize('version', [1, 2])
+def test_limits(tmp_path, version):
+    reader, _ = open_reader(tmp_path, version)
+    try:
+        assert reader.version == version
+        # у v1 корневой лимит "без ограничения" (почти 2^63) не учитывается
+        assert reader.memory_limit() == 16 * fake_backend.GIB
+        assert reader.cpu_quota() == (400000, 100000)
+        assert reader.cpuset() == list(range(8))
+        assert reader.memory_usage() == (10 * fake_backend.GIB, 8 * fake_backend.GIB)
+
+        stats = reader.sample(64, 64 * fake_backend.GIB)
+        assert stats['limited']
+        assert stats['effective_cpus'] == 4.0
+        assert stats['effective_memory'] == 16 * fake_backend.GIB
+        assert stats['memory_percent'] == 50.0
+    finally:
+        reader.close()
+
+
+def test_v2_parent_limit_wins(tmp_path):
+    reader, root = open_reader(tmp_path, 2)
+    try:
+        write(os.path.join(root, 'kubepods', 'memory.max'), str(12 * fake_backend.GIB))
+        write(os.path.join(root, 'kubepods', 'cpu.max'), '200000 100000')
+        assert reader.memory_limit() == 12 * fake_backend.GIB
+        assert reader.cpu_quota() == (200000, 100000)
+    finally:
+        reader.close()
+
+
+def test_v2_max_means_unlimited(tmp_path):
+    reader, root = open_reader(tmp_path, 2)
+    try:
+        directory = os.path.join(root, GROUP)
+        write(os.path.join(directory, 'memory.max'), 'max')
+        write(os.path.join(directory, 'cpu.max'), 'max 100000')
+        assert reader.memory_limit() is None
+        assert reader.cpu_quota() == (None, None)
+
+        stats = reader.sample(8, 64 * fake_backend.GIB)
+        # cpuset совпадает со всеми ядрами хоста - ограничений нет
+        assert not stats['limited']
+        assert stats['effective_cpus'] == 8.0
+        assert stats['effective_memory'] == 64 * fake_backend.GIB
+    finally:
+        reader.close()
+
+
+def test_v2_cpu_and_throttling(tmp_path):
+    reader, root = open_reader(tmp_path, 2)
+    try:
+        advance(reader)
+        # +2 с CPU за ~1 с на квоте в 4 ядра, 25 из 100 периодов с троттлингом
+        write(os.path.join(root, GROUP, 'cpu.stat'), 'usage_usec 125456789\nnr_periods 1100\n'
+                                                     'nr_throttled 275\nthrottled_usec 5000000')
+        stats = reader.sample(64, 64 * fake_backend.GIB, reset=True)
+        assert stats['cpu_percent'] == pytest.approx(50.0, rel=0.05)
+        assert stats['throttled_percent'] == 25.0
+        assert stats['nr_throttled'] == 275
+        assert stats['throttled_time'] == 5.0
+
+        # после reset окно начинается заново: без новых периодов доля троттлинга неизвестна
+        stats = reader.sample(64, 64 * fake_backend.GIB, reset=True)
+        assert stats['throttled_percent'] is None
+        assert stats['cpu_percent'] == 0.0
+    finally:
+        reader.close()
+
+
+def test_v1_cpu_and_throttling(tmp_path):
+    reader, root = open_reader(tmp_path, 1)
+    try:
+        cpu = os.path.join(root, 'cpu,cpuacct', GROUP)
+        advance(reader)
+        write(os.path.join(cpu, 'cpuacct.usage'), '125456789000')
+        write(os.path.join(cpu, 'cpu.stat'), 'nr_periods 1200\nnr_throttled 300\nthrottled_time 6000000000')
+        stats = reader.sample(64, 64 * fake_backend.GIB, reset=True)
+        assert stats['cpu_percent'] == pytest.approx(50.0, rel=0.05)
+        assert stats['throttled_percent'] == 25.0
+        assert stats['throttled_time'] == 6.0
+    finally:
+        reader.close()
+
+
+def test_v1_unlimited_quota(tmp_path):
+    reader, root = open_reader(tmp_path, 1)
+    try:
+        write(os.path.join(root, 'cpu,cpuacct', GROUP, 'cpu.cfs_quota_us'), '-1')
+        assert reader.cpu_quota() == (None, None)
+    finally:
+        reader.close()
@@ -0,0 +1,24 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, 'main.py')
+
+
+def run(*args):
+    return subprocess.run([sys.executable, MAIN, *args], capture_output=True, text=True, timeout=60, check=True)
+
+
+def test_json_stdout_is_parseable():
+    report = json.loads(run('-f', 'json', '--no-cache').stdout)
+    assert report['mode'] == 'brief'
+
+
+def test_json_with_output_file_keeps_stdout_clean(tmp_path):
+    path = tmp_path / 'report.json'
+    result = run('-f', 'json', '--no-cache', '-o', str(path))
+    assert result.stdout == ''
+    assert str(path) in result.stderr
+    assert json.loads(path.read_text(encoding='utf-8'))['mode'] == 'brief'
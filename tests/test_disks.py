@@ -0,0 +1,63 @@
+import threading
+import time
+from collections import Counter, namedtuple
+
+import main
+
+sdiskusage = namedtuple('sdiskusage', ('total', 'used', 'free', 'percent'))
+
+
+class HangingDiskUsage:
+    # statvfs на зависшем NFS: вызов для /hung не возвращается, пока тест его не отпустит
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = Counter()
+
+    def __call__(self, path):
+        self.calls[path] += 1
+        if path == '/hung':
+            self.release.wait(30)
+        return sdiskusage(100, 40, 60, 40.0)
+
+
+def test_hung_mount_is_reported_and_not_reprobed(monkeypatch):
+    disk_usage = HangingDiskUsage()
+    monkeypatch.setattr(main.psutil, 'disk_usage', disk_usage)
+    # один рабочий поток: остальные точки дожидаются замены зависшего
+    prober = main.DiskUsageProber(timeout=0.2, max_workers=1)
+    try:
+        started = time.monotonic()
+        results = prober.probe(['/hung', '/a', '/b'])
+        assert time.monotonic() - started < 1.0
+        assert results['/hung'].status == 'unreachable'
+        assert results['/hung'].latency >= 0.2
+        assert results['/a'].status == 'ok' and results['/a'].usage.percent == 40.0
+        assert results['/b'].status == 'ok'
+
+        started = time.monotonic()
+        results = prober.probe(['/hung', '/a'])
+        # зависшая точка пропускается сразу, второй поток на нее не запускается
+        assert time.monotonic() - started < 0.2
+        assert results['/hung'].status == 'unreachable'
+        assert results['/a'].status == 'ok'
+        assert disk_usage.calls['/hung'] == 1
+    finally:
+        disk_usage.release.set()
+
+    # прошлый вызов вернулся - точка снова опрашивается
+    deadline = time.monotonic() + 5
+    while '/hung' in prober._hung and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert prober.probe(['/hung'])['/hung'].status == 'ok'
+    assert disk_usage.calls['/hung'] == 2
+
+
+def test_probe_error_is_reported(monkeypatch):
+    def disk_usage(path):
+        raise PermissionError("denied")
+
+    monkeypatch.setattr(main.psutil, 'disk_usage', disk_usage)
+    result = main.DiskUsageProber(timeout=1.0).probe(['/secret', '/secret'])
+    assert list(result) == ['/secret']
+    assert result['/secret'].status == 'error'
+    assert result['/secret'].error == "denied"
@@ -0,0 +1,118 @@
+import threading
+from collections import namedtuple
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+import exporter
+import main
+
+
+scputimes = namedtuple('scputimes', ('user', 'nice', 'system', 'idle', 'iowait', 'guest', 'guest_nice'))
+
+
+class FakeCpuTimes:
+    # накопительные тики двух ядер; тест сам двигает их между обновлениями
+    def __init__(self):
+        self.cores = [[0.0] * len(scputimes._fields) for _ in range(2)]
+
+    def advance(self, core: int, field: str, seconds: float):
+        self.cores[core][scputimes._fields.index(field)] += seconds
+
+    def __call__(self, percpu: bool = False):
+        cores = [scputimes(*values) for values in self.cores]
+        if percpu:
+            return cores
+        return scputimes(*(sum(values) for values in zip(*self.cores)))
+
+
+def test_each_refresh_measures_since_the_previous_one(tmp_path, monkeypatch):
+    cpu_times = FakeCpuTimes()
+    monkeypatch.setattr(main.psutil, 'cpu_times', cpu_times)
+    collector = main.SystemInfoCollector(verbose=True, cache_path=str(tmp_path / "cache.json"),
+                                         top_count=0, cpu_window=0.0)
+    snapshot = exporter.SnapshotExporter(collector)
+
+    # первое ядро занято, второе простаивает
+    cpu_times.advance(0, 'user', 1.0)
+    cpu_times.advance(1, 'idle', 1.0)
+    snapshot.refresh()
+    body = snapshot.render()
+    assert "\nsic_cpu_usage_percent 50.0\n" in body
+    assert 'sic_cpu_core_usage_percent{cpu="0"} 100.0' in body
+    assert 'sic_cpu_core_usage_percent{cpu="1"} 0.0' in body
+
+    # затем оба простаивают: без сброса окна первое ядро показало бы 50% за обе секунды
+    cpu_times.advance(0, 'idle', 1.0)
+    cpu_times.advance(1, 'idle', 1.0)
+    snapshot.refresh()
+    body = snapshot.render()
+    assert "\nsic_cpu_usage_percent 0.0\n" in body
+    assert 'sic_cpu_core_usage_percent{cpu="0"} 0.0' in body
+
+
+def test_metrics_over_http():
+    collector = main.SystemInfoCollector(verbose=True, use_cache=False, top_count=0, cpu_window=0.1)
+    server, snapshot = exporter.make_server(collector, "127.0.0.1", 0, max_age=60)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(base + "/metrics", timeout=30) as response:
+            assert response.status == 200
+            assert response.headers["Content-Type"] == exporter.CONTENT_TYPE
+            body = response.read().decode("utf-8")
+        assert "\nsic_cpu_usage_percent " in body
+        assert "# TYPE sic_memory_bytes gauge" in body
+        assert "sic_refresh_success 1" in body
+        assert "sic_refresh_failures_total 0" in body
+
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(base + "/other", timeout=5)
+        assert error.value.code == 404
+    finally:
+        snapshot.stop()
+        server.shutdown()
+        server.server_close()
+
+
+def test_refresh_failure_is_logged_and_exposed(capsys):
+    class BrokenCollector:
+        calls = 0
+
+        def collect_verbose(self, reset=False):
+            BrokenCollector.calls += 1
+            raise RuntimeError("probe exploded")
+
+    snapshot = exporter.SnapshotExporter(BrokenCollector(), max_age=0.05)
+    snapshot._metrics = exporter.MetricsBuilder()
+    snapshot._ready.set()
+    snapshot.start()
+    time.sleep(0.3)
+    snapshot.stop()
+
+    assert "probe exploded" in capsys.readouterr().err
+    body = snapshot.render()
+    assert "sic_refresh_success 0" in body
+    assert f"sic_refresh_failures_total {snapshot.refresh_failures}" in body
+    assert snapshot.refresh_failures >= 2
+
+
+def test_cumulative_metrics_are_counters():
+    report = {'sections': {
+        'pressure': {'pressure': {'io': {'some': {'avg10': 1.5, 'total': 2_500_000}}},
+                     'vmstat_rates': {'pgmajfault': 3.0}},
+        'container': {'available': True, 'nr_throttled': 7, 'throttled_time': 0.5},
+        'sensors': {'throttling': {'counts': {'core': 3, 'package': 14}}},
+    }}
+    body = exporter.build_metrics(report, 0.1).render()
+    assert "# TYPE sic_pressure_stall_seconds_total counter" in body
+    assert 'sic_pressure_stall_seconds_total{resource="io",kind="some"} 2.5' in body
+    assert "# TYPE sic_container_cpu_throttled_periods_total counter" in body
+    assert "# TYPE sic_container_cpu_throttled_seconds_total counter" in body
+    assert 'sic_cpu_throttle_events_total{type="package"} 14.0' in body
+    assert "# TYPE sic_cpu_throttle_events_total counter" in body
+    # скорость - мгновенное значение
+    assert "# TYPE sic_pressure_percent gauge" in body
+    assert "# TYPE sic_vmstat_rate gauge" in body
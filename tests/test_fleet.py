@@ -0,0 +1,61 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+import fleet
+
+
+class SlowHostTransport(fleet.LocalTransport):
+    # хост "slow" зависает: вместо сборщика - процесс, который пишет свой pid и спит
+    def __init__(self, pid_path: str):
+        super().__init__()
+        self.pid_path = pid_path
+
+    def build(self, host: str):
+        if host == "slow":
+            script = f"import os, time; open({self.pid_path!r}, 'w').write(str(os.getpid())); time.sleep(60)"
+            return [sys.executable, "-c", script]
+        return super().build(host)
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def test_transport_is_abstract():
+    with pytest.raises(TypeError):
+        fleet.Transport()
+
+
+def test_slow_host_is_killed_and_reported_while_batch_completes(tmp_path):
+    pid_path = str(tmp_path / "slow.pid")
+    seen = []
+    started = time.monotonic()
+    results = asyncio.run(fleet.collect_fleet(
+        ["local-a", "slow", "local-b"], SlowHostTransport(pid_path), concurrency=3, timeout=5.0,
+        on_result=seen.append,
+    ))
+    elapsed = time.monotonic() - started
+
+    by_host = {result.host: result for result in results}
+    assert len(seen) == 3
+    assert by_host["local-a"].ok and by_host["local-b"].ok
+    assert by_host["local-a"].report["mode"] == "brief"
+    assert not by_host["slow"].ok
+    assert "тайм-аут" in by_host["slow"].error
+    assert elapsed < 15
+    with open(pid_path) as f:
+        assert not pid_alive(int(f.read()))
+
+    summary = fleet.FleetSummary()
+    for result in results:
+        summary.add(result)
+    assert summary.total == 3 and len(summary.failed) == 1
+    assert len(summary.values["ram"]) == 2
@@ -0,0 +1,100 @@
+import sys
+
+import pytest
+
+import fake_backend
+import gpu
+import main
+
+
+class BrokenNvml(fake_backend.FakeNvml):
+    # как при установленном pynvml, но без загруженного драйвера
+    def nvmlInit(self):
+        raise fake_backend.FakeNvmlError("driver not loaded")
+
+
+class FlakyBackend(gpu.GpuBackend):
+    name = "flaky"
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = 0
+
+    def read(self):
+        return []
+
+    def loads(self):
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        gpu.GpuBackend()
+
+
+def test_open_backend_prefers_nvml():
+    nvml = fake_backend.FakeNvml(2)
+    backend = gpu.open_backend(nvml=nvml, gputil=fake_backend.make_gputil(2))
+    assert backend.name == "nvml"
+    readings = backend.read()
+    assert [reading.name for reading in readings] == ["Fake GPU 0", "Fake GPU 1"]
+    assert readings[0].driver == "0.0.fake"
+    assert readings[0].memory_used == fake_backend.GIB
+    assert readings[0].power == 150.0
+    assert readings[0].power_limit == 300.0
+    # ограничение мощности не поддерживается - поле пустое, а не ошибка
+    assert readings[1].power_limit is None
+    assert len(backend.loads()) == 2
+    backend.close()
+    backend.close()
+    assert nvml.initialized == 0
+    assert backend.read() == []
+
+
+def test_open_backend_falls_back_to_gputil_without_pynvml(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'pynvml', None)
+    errors = []
+    backend = gpu.open_backend(gputil=fake_backend.make_gputil(1), on_error=errors.append)
+    assert backend.name == "gputil"
+    assert backend.read()[0].memory_total == 81920 * 1024 * 1024
+    # отсутствие pynvml - не ошибка
+    assert errors == []
+
+
+def test_open_backend_reports_nvml_failure():
+    errors = []
+    backend = gpu.open_backend(nvml=BrokenNvml(1), gputil=fake_backend.make_gputil(1), on_error=errors.append)
+    assert backend.name == "gputil"
+    assert [str(error) for error in errors] == ["driver not loaded"]
+
+
+def test_watch_gpu_polling_retries_after_empty_read():
+    collector = main.SystemInfoCollector(use_cache=False)
+    backend = FlakyBackend([[], RuntimeError("busy"), [42.0]])
+    collector._gpu_backend = backend
+    collector._watch_gpus = True
+
+    assert collector._get_gpu_loads() == []
+    # до конца паузы бэкенд не опрашивается
+    assert collector._get_gpu_loads() == []
+    assert backend.calls == 1
+
+    collector._gpu_retry_at = 0.0
+    assert collector._get_gpu_loads() == []
+    collector._gpu_retry_at = 0.0
+    assert collector._get_gpu_loads() == [42.0]
+    assert collector._gpu_failures == 0
+    assert backend.calls == 3
+
+
+def test_close_gpu_backend_shuts_nvml_down():
+    collector = main.SystemInfoCollector(use_cache=False)
+    nvml = fake_backend.FakeNvml(1)
+    collector._gpu_backend = gpu.NvmlBackend(nvml)
+    collector.close_gpu_backend()
+    assert nvml.initialized == 0
+    assert collector._gpu_backend is None
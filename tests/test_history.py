@@ -0,0 +1,130 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import history
+import main
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main.py')
+
+# начало часа, чтобы границы минут и часов были предсказуемы
+BASE = 1_700_000_000 - 1_700_000_000 % 3600
+SMALL = (
+    history.Tier('1s', 1, 5),
+    history.Tier('1m', 60, 4),
+    history.Tier('1h', 3600, 2),
+)
+
+
+def record(timestamp, cpu=0.0):
+    return (float(timestamp), float(cpu), 50.0, 0.0, 10.0, 100.0, 200.0)
+
+
+def open_store(path, tiers=SMALL):
+    return history.HistoryStore(str(path), tiers)
+
+
+def timestamps(store, tier='1s', start=None, end=None):
+    return [row[0] - BASE for row in store.records(tier, start=start, end=end)]
+
+
+def test_ring_overwrites_oldest(tmp_path):
+    store = open_store(tmp_path / 'h.bin')
+    try:
+        for offset in range(8):
+            store.append(record(BASE + offset))
+        assert timestamps(store) == [3, 4, 5, 6, 7]
+    finally:
+        store.close()
+
+
+def test_range_across_wrap(tmp_path):
+    store = open_store(tmp_path / 'h.bin')
+    try:
+        for offset in range(8):
+            store.append(record(BASE + offset))
+        # записи 5-7 уже легли в начало кольца: диапазон - два среза
+        assert len(store.slices('1s', start=BASE + 4, end=BASE + 7)) == 2
+        assert timestamps(store, start=BASE + 4, end=BASE + 7) == [4, 5, 6]
+        assert timestamps(store, start=BASE + 6) == [6, 7]
+        assert timestamps(store, end=BASE + 4) == [3]
+        assert timestamps(store, start=BASE + 100) == []
+    finally:
+        store.close()
+
+
+def test_rollup_averages(tmp_path):
+    store = open_store(tmp_path / 'h.bin')
+    try:
+        for offset in range(180):
+            store.append(record(BASE + offset, cpu=offset))
+        # закрываются только завершенные интервалы: третья минута и час еще копятся
+        assert [row[1] for row in store.records('1m')] == [29.5, 89.5]
+        assert list(store.records('1h')) == []
+
+        store.append(record(BASE + 3600, cpu=0))
+        minutes = list(store.records('1m'))
+        assert [row[0] - BASE for row in minutes] == [0, 60, 120]
+        assert [row[1] for row in minutes] == [29.5, 89.5, 149.5]
+        assert [(row[0] - BASE, row[1]) for row in store.records('1h')] == [(0, 89.5)]
+        assert list(store.records('1h'))[0][2:] == (50.0, 0.0, 10.0, 100.0, 200.0)
+    finally:
+        store.close()
+
+
+def test_reopen_restores_partial_minute(tmp_path):
+    path = tmp_path / 'h.bin'
+    tiers = (history.Tier('1s', 1, 100), history.Tier('1m', 60, 4), history.Tier('1h', 3600, 2))
+    store = open_store(path, tiers)
+    for offset in range(30):
+        store.append(record(BASE + offset, cpu=offset))
+    store.close()
+
+    # уровни берутся из заголовка файла, а не из аргумента
+    store = history.HistoryStore(str(path))
+    try:
+        assert store.tiers == tiers
+        for offset in range(30, 61):
+            store.append(record(BASE + offset, cpu=offset))
+        # без восстановления первая минута была бы средним только второй половины, 44.5
+        assert [row[1] for row in store.records('1m')] == [29.5]
+    finally:
+        store.close()
+
+
+def test_rejects_foreign_file(tmp_path):
+    path = tmp_path / 'h.bin'
+    path.write_bytes(b'not a history file' + bytes(200))
+    with pytest.raises(ValueError):
+        history.HistoryStore(str(path))
+
+
+def test_show_history_last(tmp_path, capsys):
+    path = tmp_path / 'h.bin'
+    now = time.time()
+    store = open_store(path)
+    for age in (100, 50, 2, 1):
+        store.append(record(now - age))
+    store.close()
+
+    main.show_history(str(path), '1s', last=10, output_format='json')
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [row['timestamp'] for row in rows] == [now - 2, now - 1]
+    assert rows[0]['net_tx'] == 200.0
+
+
+def test_history_cli(tmp_path):
+    path = tmp_path / 'h.bin'
+    store = open_store(path)
+    for offset in range(125):
+        store.append(record(BASE + offset, cpu=offset))
+    store.close()
+
+    result = subprocess.run([sys.executable, MAIN, '--history', str(path), '--tier', '1m', '-f', 'json'],
+                            capture_output=True, text=True, timeout=60, check=True)
+    rows = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [(row['timestamp'] - BASE, row['cpu']) for row in rows] == [(0, 29.5), (60, 89.5)]
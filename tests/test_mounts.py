@@ -0,0 +1,107 @@
+import os
+import platform
+from collections import namedtuple
+
+import pytest
+
+import main
+
+sdiskpart = namedtuple('sdiskpart', ('device', 'mountpoint', 'fstype', 'opts'))
+
+# корень и две его привязки (bind mount), отдельный /data, NFS и путь с пробелом (\040)
+MOUNTINFO = """\
+22 1 8:1 / / rw,relatime shared:1 - ext4 /dev/sda1 rw
+23 22 8:1 /srv /srv/bind rw,relatime shared:1 - ext4 /dev/sda1 rw
+24 22 8:1 /home /var/lib/kubelet/pods/x rw,relatime shared:1 - ext4 /dev/sda1 rw
+25 22 8:17 / /data rw,relatime shared:2 - xfs /dev/sdb1 rw
+26 22 0:52 / /mnt/nfs rw,relatime shared:3 - nfs4 server:/export rw
+27 22 8:33 / /mnt/my\\040disk rw,relatime shared:4 - ext4 /dev/sdc1 rw
+28 22 8:49 / /mnt/диск\\0402 rw,relatime shared:5 - ext4 /dev/sdd1 rw
+29 22 0:25 / /run rw,nosuid shared:6 - tmpfs tmpfs rw
+"""
+
+PARTITIONS = [
+    sdiskpart('/dev/sda1', '/', 'ext4', 'rw'),
+    sdiskpart('/dev/sda1', '/srv/bind', 'ext4', 'rw,bind'),
+    sdiskpart('/dev/sda1', '/var/lib/kubelet/pods/x', 'ext4', 'rw,bind'),
+    sdiskpart('/dev/sdb1', '/data', 'xfs', 'rw'),
+    sdiskpart('server:/export', '/mnt/nfs', 'nfs4', 'rw'),
+    sdiskpart('/dev/sdc1', '/mnt/my disk', 'ext4', 'rw'),
+    sdiskpart('tmpfs', '/run', 'tmpfs', 'rw'),
+]
+
+
+@pytest.fixture
+def mountinfo(tmp_path, monkeypatch):
+    procfs = tmp_path / 'proc'
+    (procfs / 'self').mkdir(parents=True)
+    (procfs / 'self' / 'mountinfo').write_text(MOUNTINFO, encoding='utf-8')
+    monkeypatch.setattr(main, 'PROCFS_ROOT', str(procfs))
+
+
+def mountpoints(selected):
+    return [part.mountpoint for part, _ in selected]
+
+
+def test_read_mount_devices_unescapes_paths(mountinfo):
+    devices = main.read_mount_devices()
+    assert devices['/srv/bind'] == devices['/'] == '8:1'
+    assert devices['/mnt/my disk'] == '8:33'
+    assert devices['/mnt/диск 2'] == '8:49'
+    assert '/mnt/my\\040disk' not in devices
+
+
+def test_read_mount_devices_without_procfs(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'PROCFS_ROOT', str(tmp_path))
+    assert main.read_mount_devices() == {}
+
+
+@pytest.mark.skipif(platform.system() != "Linux", reason="mountinfo есть только на Linux")
+def test_bind_mounts_collapse_by_device(mountinfo, monkeypatch):
+    def no_stat(path):
+        # номера устройств берутся из mountinfo: stat на NFS мог бы зависнуть
+        raise AssertionError(f"stat {path}")
+
+    monkeypatch.setattr(main.os, 'stat', no_stat)
+    selected = main.MountFilter().select(PARTITIONS)
+    # tmpfs отброшен фильтром по умолчанию, привязки корня стали псевдонимами
+    assert mountpoints(selected) == ['/', '/data', '/mnt/nfs', '/mnt/my disk']
+    assert selected[0][1] == ['/srv/bind', '/var/lib/kubelet/pods/x']
+    assert all(aliases == [] for _, aliases in selected[1:])
+
+    selected = main.MountFilter(dedupe=False).select(PARTITIONS)
+    assert mountpoints(selected) == ['/', '/srv/bind', '/var/lib/kubelet/pods/x', '/data', '/mnt/nfs', '/mnt/my disk']
+
+
+def test_network_fs_without_mountinfo_is_not_stat(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, 'PROCFS_ROOT', str(tmp_path))
+    stat_calls = []
+
+    def fake_stat(path):
+        stat_calls.append(path)
+        return os.stat_result((0,) * 2 + (1,) + (0,) * 7)
+
+    monkeypatch.setattr(main.os, 'stat', fake_stat)
+    selected = main.MountFilter().select([
+        sdiskpart('/dev/sda1', '/', 'ext4', 'rw'),
+        sdiskpart('server:/a', '/mnt/a', 'nfs', 'rw'),
+        sdiskpart('//srv/b', '/mnt/b', 'cifs', 'rw'),
+        sdiskpart('host:/c', '/mnt/c', 'fuse.whatever', 'rw,remote'),
+    ])
+    # сетевые ФС не дедуплицируются и не трогаются stat даже с одинаковым st_dev
+    assert mountpoints(selected) == ['/', '/mnt/a', '/mnt/b', '/mnt/c']
+    assert stat_calls == ['/']
+
+
+def test_fs_and_mount_globs():
+    select = lambda **options: mountpoints(main.MountFilter(dedupe=False, **options).select(PARTITIONS))
+
+    assert select(include_fs=['ext4']) == ['/', '/srv/bind', '/var/lib/kubelet/pods/x', '/mnt/my disk']
+    assert select(exclude_fs=['nfs', 'nfs4', 'tmpfs']) == [
+        '/', '/srv/bind', '/var/lib/kubelet/pods/x', '/data', '/mnt/my disk',
+    ]
+    # явный список исключений заменяет список по умолчанию
+    assert '/run' in select(exclude_fs=['nfs4'])
+    assert select(include_mounts=['/mnt/*', '/']) == ['/', '/mnt/nfs', '/mnt/my disk']
+    assert select(exclude_mounts=['/var/lib/kubelet/*', '/mnt/*']) == ['/', '/srv/bind', '/data']
+    assert select(exclude_devices=['/dev/sda*']) == ['/data', '/mnt/nfs', '/mnt/my disk']
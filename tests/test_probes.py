@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+import main
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_hung_probe_times_out_without_blocking_the_rest():
+    collector = main.SystemInfoCollector(probe_timeout=0.3, use_cache=False)
+    started = time.monotonic()
+    sections = collector.run_probes([
+        main.Probe('slow', "SLOW", lambda: time.sleep(2)),
+        main.Probe('fast', "FAST", lambda: collector.set_data('value', 1)),
+    ])
+    assert time.monotonic() - started < 1.0
+    assert sections[0].data == {'error': 'timeout', 'timeout': 0.3}
+    assert sections[1].data == {'value': 1}
+
+
+def test_hung_probe_does_not_delay_process_exit():
+    script = textwrap.dedent("""
+        import time, main
+        collector = main.SystemInfoCollector(probe_timeout=0.3, use_cache=False)
+        collector.run_probes([main.Probe('slow', "SLOW", lambda: time.sleep(5))])
+    """)
+    started = time.monotonic()
+    subprocess.run([sys.executable, '-c', script], cwd=ROOT, check=True, timeout=30)
+    assert time.monotonic() - started < 3.0
+
+
+def test_process_window_starts_with_the_collector():
+    collector = main.SystemInfoCollector(verbose=True, use_cache=False, process_window=0.3)
+    time.sleep(0.3)
+    started = time.monotonic()
+    rows = collector.process_sampler.sample()
+    # окно уже прошло, пока "работали остальные пробы" - второй проход без sleep
+    assert time.monotonic() - started < 0.25
+    assert any(row['pid'] == os.getpid() for row in rows)
@@ -0,0 +1,82 @@
+import os
+import platform
+import time
+
+import pytest
+
+import fake_backend
+import main
+
+
+def build(tmp_path):
+    procfs = str(tmp_path / 'proc')
+    fake_backend.build_procfs(procfs)
+    return procfs
+
+
+def read(procfs, name):
+    with open(os.path.join(procfs, name)) as f:
+        return f.read()
+
+
+def test_parse_pressure_some_and_full(tmp_path):
+    memory = main.parse_pressure(read(build(tmp_path), 'pressure/memory'))
+    assert memory == {
+        'some': {'avg10': 35.2, 'avg60': 20.75, 'avg300': 9.11, 'total': 45678901.0},
+        'full': {'avg10': 18.4, 'avg60': 10.02, 'avg300': 4.5, 'total': 23456789.0},
+    }
+    # посторонние строки и нечисловые значения пропускаются
+    assert main.parse_pressure("some avg10=x total=5\nbogus avg10=1.0\n") == {'some': {'total': 5.0}}
+
+
+def test_parse_meminfo_units(tmp_path):
+    meminfo = main.parse_meminfo(read(build(tmp_path), 'meminfo'))
+    assert meminfo['Dirty'] == 524288 * 1024
+    assert meminfo['MemTotal'] == 512 * fake_backend.GIB
+    assert meminfo['Hugepagesize'] == 2048 * 1024
+    # количество страниц - без пересчета в байты
+    assert meminfo['HugePages_Total'] == 1024
+    assert meminfo['HugePages_Free'] == 256
+
+
+def test_parse_vmstat_picks_counters(tmp_path):
+    assert main.parse_vmstat(read(build(tmp_path), 'vmstat')) == main.VmstatCounters(
+        pgfault=987654321, pgmajfault=123456, pswpin=1200345, pswpout=3400567,
+    )
+    assert main.parse_vmstat("pgfault x\n") == main.VmstatCounters()
+
+
+@pytest.mark.skipif(platform.system() != "Linux", reason="pread есть только на Linux")
+def test_poller_pressure_and_missing_files(tmp_path):
+    procfs = build(tmp_path)
+    os.remove(os.path.join(procfs, 'pressure', 'io'))
+    poller = main.ProcfsPoller(procfs)
+    try:
+        pressure = poller.pressure()
+        # ядро без одного из файлов PSI - остальные ресурсы все равно читаются
+        assert set(pressure) == {'cpu', 'memory'}
+        assert pressure['cpu']['some']['total'] == 912345678.0
+    finally:
+        poller.close()
+
+
+@pytest.mark.skipif(platform.system() != "Linux", reason="pread есть только на Linux")
+def test_vmstat_rates_across_rewrite(tmp_path):
+    procfs = build(tmp_path)
+    poller = main.ProcfsPoller(procfs)
+    try:
+        sampler = main.CounterSampler(lambda: {'vmstat': poller.vmstat()}, window=0.0)
+        # окно отодвигается назад вместо сна: за ~2 с прибавилось 2000 ошибок страниц и т.д.
+        sampler._started = time.monotonic() - 2.0
+        with open(os.path.join(procfs, 'vmstat'), 'w') as f:
+            f.write('pswpin 1200345\npswpout 3400967\npgfault 987656321\npgmajfault 123476\n')
+        rates = main.vmstat_rates(sampler, reset=True)
+        assert rates['pgfault'] == pytest.approx(1000.0, rel=0.05)
+        assert rates['pgmajfault'] == pytest.approx(10.0, rel=0.05)
+        assert rates['pswpout'] == pytest.approx(200.0, rel=0.05)
+        assert rates['pswpin'] == 0.0
+
+        # после сброса окна без новых событий скорости нулевые
+        assert main.vmstat_rates(sampler, reset=True) == {field: 0.0 for field in main.VmstatCounters._fields}
+    finally:
+        poller.close()
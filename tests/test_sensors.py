@@ -0,0 +1,108 @@
+import os
+import platform
+from collections import namedtuple
+
+import pytest
+
+import fake_backend
+import main
+
+pytestmark = pytest.mark.skipif(platform.system() != "Linux", reason="sysfs и pread есть только на Linux")
+
+scpufreq = namedtuple('scpufreq', ('current', 'min', 'max'))
+shwtemp = namedtuple('shwtemp', ('label', 'current', 'high', 'critical'))
+
+
+def build(tmp_path, cpus=4):
+    root = str(tmp_path / 'sys')
+    fake_backend.build_sysfs(root, fake_backend.FakeScale(cpus=cpus))
+    return root
+
+
+def write(root, path, content):
+    with open(os.path.join(root, path), 'w') as f:
+        f.write(content + '\n')
+
+
+def test_poller_reads_rewritten_file_through_held_descriptor(tmp_path):
+    root = build(tmp_path)
+    poller = main.SensorPoller(root)
+    try:
+        sample = poller.sample()
+        assert sample['temperatures']['coretemp/Core 0'] == 60.0
+        assert sample['temperatures']['coretemp/Package id 0'] == 92.0
+        assert sample['fans'] == {'nct6775/fan1': 1300, 'nct6775/fan2': 1400,
+                                  'nct6775/fan3': 1500, 'nct6775/fan4': 1600}
+        assert sample['cpu_freq'] == [3400.0] * 4
+        descriptors = [fd for _, fd in poller._temps]
+
+        write(root, 'class/hwmon/hwmon0/temp2_input', '71500')
+        write(root, 'devices/system/cpu/cpu1/cpufreq/scaling_cur_freq', '800000')
+        sample = poller.sample()
+        # файлы не открываются заново: то же значение дескриптора, новое содержимое через pread
+        assert [fd for _, fd in poller._temps] == descriptors
+        assert sample['temperatures']['coretemp/Core 0'] == 71.5
+        assert sample['cpu_freq'] == [3400.0, 800.0, 3400.0, 3400.0]
+    finally:
+        poller.close()
+
+
+def test_same_label_on_two_chips_stays_separate(tmp_path):
+    root = build(tmp_path)
+    # второй сокет: такой же coretemp со своим Core 0
+    os.makedirs(os.path.join(root, 'class', 'hwmon', 'hwmon2'))
+    write(root, 'class/hwmon/hwmon2/name', 'coretemp')
+    write(root, 'class/hwmon/hwmon2/temp2_label', 'Core 0')
+    write(root, 'class/hwmon/hwmon2/temp2_input', '81000')
+    poller = main.SensorPoller(root)
+    try:
+        temperatures = poller.sample()['temperatures']
+        assert temperatures['coretemp/Core 0'] == 60.0
+        assert temperatures['hwmon2:coretemp/Core 0'] == 81.0
+    finally:
+        poller.close()
+
+
+def test_unreadable_sensor_is_skipped(tmp_path):
+    root = build(tmp_path)
+    poller = main.SensorPoller(root)
+    try:
+        poller.sample()
+        write(root, 'class/hwmon/hwmon0/temp2_input', '')
+        assert 'coretemp/Core 0' not in poller.sample()['temperatures']
+    finally:
+        poller.close()
+
+
+def test_package_throttle_counted_once_per_package(tmp_path):
+    root = build(tmp_path, cpus=4)
+    # ядра 0-1 - пакет 0, ядра 2-3 - пакет 1; у каждого ядра package-счетчик 7
+    assert main.read_throttle_counts(root) == {'core': 0 + 1 + 2 + 0, 'package': 7 * 2}
+
+
+def test_throttle_counts_missing(tmp_path):
+    assert main.read_throttle_counts(str(tmp_path)) is None
+
+
+def test_detect_throttling_by_frequency():
+    freqs = [scpufreq(3400, 800, 3500), scpufreq(1200, 800, 3500), scpufreq(1200, 800, 3500), scpufreq(1200, 0, 0)]
+    # низкая частота у простаивающего ядра и у ядра без max - не троттлинг
+    result = main.detect_throttling(freqs, [90.0, 90.0, 10.0, 90.0], {})
+    assert result == {'cores': [1], 'hot_sensors': [], 'suspected': True}
+
+
+def test_detect_throttling_by_temperature():
+    temperatures = {
+        'coretemp': [shwtemp('Package id 0', 100.0, 100.0, 105.0), shwtemp('Core 0', 70.0, 100.0, 105.0)],
+        'acpitz': [shwtemp('', 90.0, None, None)],
+    }
+    freqs = [scpufreq(3400, 800, 3500)]
+    result = main.detect_throttling(freqs, [95.0], temperatures)
+    assert result == {'cores': [], 'hot_sensors': ['coretemp/Package id 0'], 'suspected': True}
+
+    freqs = [scpufreq(1000, 800, 3500)]
+    result = main.detect_throttling(freqs, [95.0], temperatures)
+    assert result['cores'] == [0] and result['hot_sensors'] == ['coretemp/Package id 0']
+
+    cool = {'coretemp': [shwtemp('Core 0', 70.0, 100.0, 105.0)]}
+    assert not main.detect_throttling([scpufreq(3400, 800, 3500)], [95.0], cool)['suspected']
@@ -0,0 +1,31 @@
+import bench_snapshot_diff
+import snapshot
+
+
+def sensors(*temperatures):
+    return {'sections': {'sensors': {'temperatures': [
+        {'chip': 'coretemp', 'label': 'Core 0', 'current': 50.0, 'high': high} for high in temperatures
+    ]}}}
+
+
+def test_duplicate_keys_are_compared_by_ordinal():
+    # на двухсокетной машине у каждого пакета свой coretemp/Core 0
+    changes = snapshot.diff_snapshots(sensors(80.0, 90.0), sensors(80.0, 95.0))['changes']
+    assert [(change['path'], change['old'], change['new']) for change in changes] == [
+        ('sensors.temperatures[coretemp/Core 0#2].high', 90.0, 95.0),
+    ]
+
+
+def test_duplicate_key_removed():
+    changes = snapshot.diff_snapshots(sensors(80.0, 90.0), sensors(80.0))['changes']
+    assert [(change['change'], change['path']) for change in changes] == [
+        ('removed', 'sensors.temperatures[coretemp/Core 0#2]'),
+    ]
+
+
+def test_noise_within_tolerance_is_ignored():
+    old, new = bench_snapshot_diff.make_snapshots(50, 50)
+    changes = snapshot.diff_snapshots(old, new)['changes']
+    assert [(change['path'], change['new']) for change in changes] == [
+        ('network.interfaces[veth0].isup', False),
+    ]
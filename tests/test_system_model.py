@@ -0,0 +1,93 @@
+import pytest
+
+import main
+
+X86_CPUINFO = """\
+processor\t: 0
+vendor_id\t: GenuineIntel
+cpu family\t: 6
+model\t\t: 85
+model name\t: Intel(R) Xeon(R) Gold 6248 CPU @ 2.50GHz
+flags\t\t: fpu vme de pse
+
+processor\t: 1
+vendor_id\t: GenuineIntel
+model name\t: Intel(R) Xeon(R) Gold 6248 CPU @ 2.50GHz
+flags\t\t: fpu vme de pse
+
+"""
+
+ARM_CPUINFO = """\
+processor\t: 0
+model name\t: ARMv7 Processor rev 3 (v7l)
+BogoMIPS\t: 108.00
+CPU implementer\t: 0x41
+
+processor\t: 1
+model name\t: ARMv7 Processor rev 3 (v7l)
+BogoMIPS\t: 108.00
+
+Hardware\t: BCM2711
+Revision\t: c03114
+Serial\t\t: 100000002a5b1c3d
+Model\t\t: Raspberry Pi 4 Model B Rev 1.4
+"""
+
+# старые ядра ARM: модели платы нет, только Hardware
+ARM_HARDWARE_ONLY = ARM_CPUINFO.rsplit("Model\t\t:", 1)[0]
+
+
+@pytest.fixture
+def roots(tmp_path, monkeypatch):
+    sysfs, procfs = tmp_path / 'sys', tmp_path / 'proc'
+    sysfs.mkdir()
+    procfs.mkdir()
+    monkeypatch.setattr(main, 'SYSFS_ROOT', str(sysfs))
+    monkeypatch.setattr(main, 'PROCFS_ROOT', str(procfs))
+    return sysfs, procfs
+
+
+def test_parse_cpuinfo_x86():
+    fields = main.parse_cpuinfo(X86_CPUINFO)
+    assert fields['model name'] == "Intel(R) Xeon(R) Gold 6248 CPU @ 2.50GHz"
+    assert fields['model'] == "85"
+    # блок второго процессора не читается
+    assert fields['processor'] == "0"
+    assert 'Model' not in fields and 'Hardware' not in fields
+
+
+def test_parse_cpuinfo_arm_trailer():
+    fields = main.parse_cpuinfo(ARM_CPUINFO)
+    assert fields['model name'] == "ARMv7 Processor rev 3 (v7l)"
+    assert fields['Hardware'] == "BCM2711"
+    assert fields['Model'] == "Raspberry Pi 4 Model B Rev 1.4"
+    assert 'Revision' not in fields
+
+
+@pytest.mark.parametrize('cpuinfo, expected', [
+    (X86_CPUINFO, "Intel(R) Xeon(R) Gold 6248 CPU @ 2.50GHz"),
+    (ARM_CPUINFO, "Raspberry Pi 4 Model B Rev 1.4"),
+    (ARM_HARDWARE_ONLY, "BCM2711"),
+    ("", None),
+])
+def test_probe_from_cpuinfo(roots, cpuinfo, expected):
+    _, procfs = roots
+    (procfs / 'cpuinfo').write_text(cpuinfo)
+    assert main.probe_system_model_linux() == expected
+
+
+def test_probe_prefers_dmi_and_device_tree(roots):
+    sysfs, procfs = roots
+    (procfs / 'cpuinfo').write_text(ARM_CPUINFO)
+    (procfs / 'device-tree').mkdir()
+    # в device-tree строка заканчивается нулевым байтом
+    (procfs / 'device-tree' / 'model').write_bytes(b"Raspberry Pi 4 Model B Rev 1.4 (dt)\x00")
+    assert main.probe_system_model_linux() == "Raspberry Pi 4 Model B Rev 1.4 (dt)"
+
+    (sysfs / 'class' / 'dmi' / 'id').mkdir(parents=True)
+    (sysfs / 'class' / 'dmi' / 'id' / 'product_name').write_text("PowerEdge R740\n")
+    assert main.probe_system_model_linux() == "PowerEdge R740"
+
+
+def test_probe_without_any_source(roots):
+    assert main.probe_system_model_linux() is None
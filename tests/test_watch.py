@@ -0,0 +1,37 @@
+from collections import namedtuple
+
+import main
+
+snetio = namedtuple('snetio', main.NET_RATE_FIELDS)
+
+
+class StaticSampler:
+    def __init__(self, before, after, elapsed=1.0):
+        self.result = (before, after, elapsed)
+
+    def sample(self, reset=False):
+        return self.result
+
+
+def counters(received, sent):
+    return snetio(received, sent, 0, 0, 0, 0, 0, 0)
+
+
+def test_watch_net_rates_exclude_loopback():
+    collector = main.SystemInfoCollector(use_cache=False)
+    collector._loopback_names = frozenset({'lo'})
+    collector.net_sampler = StaticSampler(
+        {'lo': counters(0, 0), 'eth0': counters(0, 0)},
+        {'lo': counters(10_000_000, 10_000_000), 'eth0': counters(1000, 500)},
+    )
+    sample = collector.collect_sample()
+    assert sample['net_rx_rate'] == 1000
+    assert sample['net_tx_rate'] == 500
+
+
+def test_is_loopback_uses_flags_and_names():
+    stat = namedtuple('snicstats', 'isup flags')(True, 'up,loopback,running')
+    assert main.is_loopback('weird0', stat)
+    assert main.is_loopback('lo')
+    assert main.is_loopback('Loopback Pseudo-Interface 1')
+    assert not main.is_loopback('eth0', namedtuple('snicstats', 'isup flags')(True, 'up,broadcast'))